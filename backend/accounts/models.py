@@ -84,6 +84,9 @@ class Volunteer(models.Model):
     gender = models.CharField(max_length=1, choices=GENDER_CHOICES, blank=True)
     wilaya = models.CharField(max_length=2, blank=True)
     commune = models.CharField(max_length=100, blank=True)
+    # Position de référence pour les missions « près de chez moi »
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     profile_picture = models.ImageField(upload_to="volunteers/", blank=True, null=True)
     motivation = models.TextField(blank=True)
 
@@ -92,6 +95,9 @@ class Volunteer(models.Model):
     average_rating = models.DecimalField(
         max_digits=3, decimal_places=2, default=0, verbose_name="Note moyenne"
     )
+    # Agrégat courant de average_rating (voir missions/ratings.py)
+    rating_sum = models.IntegerField(default=0, verbose_name="Somme des notes")
+    rating_count = models.IntegerField(default=0, verbose_name="Nombre de notes")
     badge_level = models.CharField(
         max_length=10, choices=BADGE_CHOICES, default="BRONZE", verbose_name="Badge"
     )
@@ -123,14 +129,18 @@ class Volunteer(models.Model):
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.badge_level}"
 
+    @staticmethod
+    def badge_for_hours(hours):
+        """Badge correspondant à un nombre d'heures"""
+        if hours >= 200:
+            return "GOLD"
+        if hours >= 50:
+            return "SILVER"
+        return "BRONZE"
+
     def update_badge(self):
         """Met à jour le badge en fonction des heures"""
-        if self.total_hours >= 200:
-            self.badge_level = "GOLD"
-        elif self.total_hours >= 50:
-            self.badge_level = "SILVER"
-        else:
-            self.badge_level = "BRONZE"
+        self.badge_level = self.badge_for_hours(self.total_hours)
         self.save()
 
 
@@ -192,6 +202,9 @@ class Organization(models.Model):
     average_rating = models.DecimalField(
         max_digits=3, decimal_places=2, default=0, verbose_name="Note moyenne"
     )
+    # Agrégat courant de average_rating (voir missions/ratings.py)
+    rating_sum = models.IntegerField(default=0, verbose_name="Somme des notes")
+    rating_count = models.IntegerField(default=0, verbose_name="Nombre de notes")
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -2,10 +2,14 @@
 Serializers pour l'API REST
 """
 
+import math
+from functools import partial
+
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
 from accounts.models import Organization, Volunteer
+from missions import reference
 from missions.models import Application, Mission, Participation, Review
 from odd.models import ODD
 from skills.models import Skill, VolunteerSkill
@@ -13,6 +17,133 @@ from skills.models import Skill, VolunteerSkill
 User = get_user_model()
 
 
+# ========== CHAMPS À LA DEMANDE (?fields= / ?expand=) ==========
+
+
+def parse_field_paths(value):
+    """
+    ``"id,mission.title,mission.odd"`` -> ``{"id": set(), "mission": {"title", "odd"}}``
+
+    Accepte une chaîne séparée par des virgules ou une liste de chemins pointés.
+    """
+    if isinstance(value, str):
+        value = value.split(",")
+    paths = {}
+    for path in value:
+        name, _, rest = path.strip().partition(".")
+        if not name:
+            continue
+        children = paths.setdefault(name, set())
+        children.add(rest)
+    return paths
+
+
+def _nested_paths(children):
+    """Sous-chemins transmis à un sérialiseur imbriqué (None : pas de restriction)"""
+    if not children or "" in children:
+        return None
+    return sorted(children)
+
+
+class SparseFieldsMixin:
+    """
+    Réponses à la carte pour les sérialiseurs de lecture
+
+    ``?fields=id,title,organization.name`` limite la réponse aux champs cités ;
+    ``?expand=organization,mission.odd`` remplace une représentation compacte par
+    la représentation complète déclarée dans ``expandable_fields``. Les chemins
+    pointés sont transmis aux sérialiseurs imbriqués, les noms inconnus sont
+    ignorés. Les paramètres ne sont lus que sur le sérialiseur racine d'une
+    requête GET ; en dehors d'une vue, passer ``fields=`` / ``expand=`` au
+    constructeur. Les champs sont calculés une fois par page, pas par objet.
+    """
+
+    expandable_fields = {}
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        self._sparse_fields = fields
+        self._sparse_expand = expand
+        super().__init__(*args, **kwargs)
+
+    def _is_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def _sparse_options(self):
+        fields, expand = self._sparse_fields, self._sparse_expand
+        request = self.context.get("request")
+        if (
+            fields is None
+            and expand is None
+            and request is not None
+            and request.method in ("GET", "HEAD")
+            and self._is_root()
+        ):
+            params = getattr(request, "query_params", request.GET)
+            fields, expand = params.get("fields"), params.get("expand")
+        return (
+            parse_field_paths(fields) if fields else None,
+            parse_field_paths(expand) if expand else {},
+        )
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested, expand = self._sparse_options()
+
+        for name, children in expand.items():
+            if name in self.expandable_fields and name in fields:
+                fields[name] = self.expandable_fields[name](read_only=True)
+            if name in fields:
+                configure_sparse_fields(fields[name], expand=_nested_paths(children))
+
+        if requested is not None:
+            fields = {name: field for name, field in fields.items() if name in requested}
+            for name, field in fields.items():
+                configure_sparse_fields(field, fields=_nested_paths(requested[name]))
+        return fields
+
+
+def configure_sparse_fields(field, fields=None, expand=None):
+    """Transmet des chemins ``fields``/``expand`` à un sérialiseur imbriqué"""
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    if isinstance(field, ReferenceField):
+        if fields is not None:
+            field.sparse_fields = tuple(fields)
+        return
+    if not isinstance(field, SparseFieldsMixin):
+        return
+    if fields is not None:
+        field._sparse_fields = fields
+    if expand is not None:
+        field._sparse_expand = expand
+
+
+class ReferenceField(serializers.Field):
+    """
+    ODD ou compétence lu dans les données de référence par son id
+
+    Remplace un sérialiseur imbriqué sur une clé étrangère vers un catalogue de
+    missions/reference.py : ni jointure ni requête, et la représentation de
+    ``serializer_class`` est calculée une fois par version du catalogue.
+    """
+
+    def __init__(self, catalogue, serializer_class, **kwargs):
+        self.catalogue = reference.CATALOGUES[catalogue]
+        self.serializer_class = serializer_class
+        self.sparse_fields = None
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def represent(self, pk, request=None):
+        return self.catalogue.representation(pk, self.serializer_class, self.sparse_fields, request)
+
+    def to_representation(self, value):
+        return self.represent(value, self.context.get("request"))
+
+
 # ========== AUTH SERIALIZERS ==========
 
 
@@ -92,12 +223,70 @@ class RegisterOrganizationSerializer(serializers.Serializer):
 # ========== VOLUNTEER SERIALIZERS ==========
 
 
-class VolunteerProfileSerializer(serializers.ModelSerializer):
+class VolunteerProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
 
     class Meta:
         model = Volunteer
         fields = "__all__"
+        # Agrégat courant tenu par missions/ratings.py
+        read_only_fields = ("rating_sum", "rating_count", "average_rating")
+
+
+class VolunteerDetailSerializer(VolunteerProfileSerializer):
+    """Profil complet vu par une organisation : sans la position enregistrée du bénévole"""
+
+    class Meta(VolunteerProfileSerializer.Meta):
+        fields = None
+        exclude = ("latitude", "longitude")
+
+
+class VolunteerSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Représentation compacte dans les listes (profil complet : ?expand=volunteer)"""
+
+    first_name = serializers.CharField(source="user.first_name", read_only=True)
+    last_name = serializers.CharField(source="user.last_name", read_only=True)
+
+    class Meta:
+        model = Volunteer
+        fields = (
+            "id",
+            "first_name",
+            "last_name",
+            "wilaya",
+            "profile_picture",
+            "badge_level",
+            "total_hours",
+            "completed_missions",
+            "average_rating",
+        )
+
+
+# Tranches de distance affichées aux organisations (km) : une distance exacte
+# permettrait de trianguler la position d'un bénévole en déplaçant un brouillon
+CANDIDATE_DISTANCE_BUCKETS_KM = (5, 10, 25, 50, 100)
+
+
+def distance_bucket(distance_km):
+    """Borne supérieure de la tranche (5, 10, 25, 50, 100, puis centaines de km)"""
+    for bound in CANDIDATE_DISTANCE_BUCKETS_KM:
+        if distance_km <= bound:
+            return bound
+    return math.ceil(distance_km / 100) * 100
+
+
+class CandidateVolunteerSerializer(VolunteerSummarySerializer):
+    """Bénévole proposé pour une mission (voir missions/matching.py)"""
+
+    match_score = serializers.FloatField(read_only=True)
+    distance_km = serializers.SerializerMethodField()
+
+    class Meta(VolunteerSummarySerializer.Meta):
+        fields = (*VolunteerSummarySerializer.Meta.fields, "match_score", "distance_km")
+
+    def get_distance_km(self, obj):
+        """Tranche de distance (« au plus N km ») jusqu'à la mission, None sans position"""
+        return distance_bucket(obj.distance_km) if obj.distance_km is not None else None
 
 
 # ========== ORGANIZATION SERIALIZERS ==========
@@ -109,9 +298,17 @@ class OrganizationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Organization
         fields = "__all__"
+        # Compteurs tenus par missions/org_stats.py et missions/ratings.py
+        read_only_fields = (
+            "total_missions",
+            "total_volunteers",
+            "rating_sum",
+            "rating_count",
+            "average_rating",
+        )
 
 
-class OrganizationPublicSerializer(serializers.ModelSerializer):
+class OrganizationPublicSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Version publique (sans infos sensibles)"""
 
     class Meta:
@@ -131,17 +328,25 @@ class OrganizationPublicSerializer(serializers.ModelSerializer):
         )
 
 
+class OrganizationSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Représentation compacte dans les listes (profil public : ?expand=organization)"""
+
+    class Meta:
+        model = Organization
+        fields = ("id", "name", "logo")
+
+
 # ========== SKILL SERIALIZERS ==========
 
 
-class SkillSerializer(serializers.ModelSerializer):
+class SkillSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Skill
         fields = "__all__"
 
 
-class VolunteerSkillSerializer(serializers.ModelSerializer):
-    skill = SkillSerializer(read_only=True)
+class VolunteerSkillSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    skill = ReferenceField("skill", SkillSerializer, source="skill_id")
     skill_id = serializers.IntegerField(write_only=True)
 
     class Meta:
@@ -152,22 +357,36 @@ class VolunteerSkillSerializer(serializers.ModelSerializer):
 # ========== ODD SERIALIZERS ==========
 
 
-class ODDSerializer(serializers.ModelSerializer):
+class ODDSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ODD
         fields = "__all__"
 
 
+class ODDSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Représentation compacte dans les listes (descriptions : ?expand=odd)"""
+
+    class Meta:
+        model = ODD
+        fields = ("id", "number", "title_fr", "color", "icon")
+
+
 # ========== MISSION SERIALIZERS ==========
 
 
-class MissionListSerializer(serializers.ModelSerializer):
+class MissionListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Pour la liste des missions"""
 
-    organization = OrganizationPublicSerializer(read_only=True)
-    odd = ODDSerializer(read_only=True)
+    organization = OrganizationSummarySerializer(read_only=True)
+    odd = ReferenceField("odd", ODDSummarySerializer, source="odd_id")
     remaining_places = serializers.IntegerField(source="get_remaining_places", read_only=True)
     fill_percentage = serializers.IntegerField(source="get_fill_percentage", read_only=True)
+    distance_km = serializers.SerializerMethodField()
+
+    expandable_fields = {
+        "organization": OrganizationPublicSerializer,
+        "odd": partial(ReferenceField, "odd", ODDSerializer, source="odd_id"),
+    }
 
     class Meta:
         model = Mission
@@ -188,14 +407,29 @@ class MissionListSerializer(serializers.ModelSerializer):
             "fill_percentage",
             "image",
             "status",
+            "distance_km",
         )
 
+    def get_distance_km(self, obj):
+        """Distance (km) quand la liste est filtrée par ?near="""
+        distance = getattr(obj, "distance_km", None)
+        return round(distance, 1) if distance is not None else None
 
-class MissionDetailSerializer(serializers.ModelSerializer):
+
+class RecommendedMissionSerializer(MissionListSerializer):
+    """Mission recommandée à un bénévole (voir missions/matching.py)"""
+
+    match_score = serializers.FloatField(read_only=True)
+
+    class Meta(MissionListSerializer.Meta):
+        fields = (*MissionListSerializer.Meta.fields, "match_score")
+
+
+class MissionDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Pour les détails d'une mission"""
 
     organization = OrganizationPublicSerializer(read_only=True)
-    odd = ODDSerializer(read_only=True)
+    odd = ReferenceField("odd", ODDSerializer, source="odd_id")
     remaining_places = serializers.IntegerField(source="get_remaining_places", read_only=True)
     fill_percentage = serializers.IntegerField(source="get_fill_percentage", read_only=True)
     is_full = serializers.BooleanField(read_only=True)
@@ -220,15 +454,27 @@ class MissionCreateSerializer(serializers.ModelSerializer):
 # ========== APPLICATION SERIALIZERS ==========
 
 
-class ApplicationSerializer(serializers.ModelSerializer):
+class ApplicationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     mission = MissionListSerializer(read_only=True)
-    volunteer = VolunteerProfileSerializer(read_only=True)
+    volunteer = VolunteerSummarySerializer(read_only=True)
+
+    expandable_fields = {"volunteer": VolunteerDetailSerializer}
 
     class Meta:
         model = Application
         fields = "__all__"
 
 
+class DashboardApplicationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Candidature vue par son propre bénévole : sans l'objet bénévole répété"""
+
+    mission = MissionListSerializer(read_only=True)
+
+    class Meta:
+        model = Application
+        exclude = ("volunteer",)
+
+
 class ApplicationCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
@@ -238,9 +484,11 @@ class ApplicationCreateSerializer(serializers.ModelSerializer):
 # ========== PARTICIPATION SERIALIZERS ==========
 
 
-class ParticipationSerializer(serializers.ModelSerializer):
+class ParticipationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     mission = MissionListSerializer(read_only=True)
-    volunteer = VolunteerProfileSerializer(read_only=True)
+    volunteer = VolunteerSummarySerializer(read_only=True)
+
+    expandable_fields = {"volunteer": VolunteerDetailSerializer}
 
     class Meta:
         model = Participation
@@ -251,7 +499,7 @@ class ParticipationSerializer(serializers.ModelSerializer):
 
 
 class ReviewSerializer(serializers.ModelSerializer):
-    volunteer = VolunteerProfileSerializer(read_only=True)
+    volunteer = VolunteerDetailSerializer(read_only=True)
 
     class Meta:
         model = Review
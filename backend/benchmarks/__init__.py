@@ -0,0 +1,3 @@
+"""
+Benchmarks HTTP de bout en bout (voir benchmarks/README.md)
+"""
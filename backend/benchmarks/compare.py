@@ -0,0 +1,44 @@
+"""
+Compare deux exécutions de ``benchmarks.run``
+
+    python -m benchmarks.compare results/avant.json results/apres.json --threshold 0.1
+
+Affiche l'écart relatif de chaque métrique (requêtes/s, p50, p95, p99) par
+scénario ; ``--fail-on-regression`` renvoie un code de sortie non nul si une
+métrique se dégrade au-delà du seuil (utilisable en CI).
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from .stats import compare
+
+
+def load(path):
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare deux résultats de benchmark")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    options = parser.parse_args(argv)
+
+    baseline, candidate = load(options.baseline), load(options.candidate)
+    print(f"{baseline['meta']['commit']} → {candidate['meta']['commit']}")
+    rows = compare(baseline, candidate, options.threshold)
+    regressions = 0
+    for scenario, metric, old, new, delta, regression in rows:
+        regressions += regression
+        flag = "  RÉGRESSION" if regression else ""
+        print(f"{scenario:<14} {metric:<16} {old:>10.2f} → {new:>10.2f}  {delta:+7.1%}{flag}")
+    if options.fail_on_regression and regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Taille et coût CPU d'une page de liste selon la représentation demandée
+
+    python -m benchmarks.payloads --repeat 200
+
+Pour chaque liste (missions, candidatures, participations), une page est lue
+une fois en base puis sérialisée et rendue en JSON ``--repeat`` fois : la
+mesure porte uniquement sur le sérialiseur et le rendu. ``complet`` correspond
+aux représentations imbriquées complètes (celles d'avant les versions compactes,
+toujours disponibles via ``?expand=``), ``défaut`` à la réponse sans paramètre
+et ``fields`` à un exemple de ``?fields=`` pour une carte de liste.
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+
+def list_cases():
+    from accounts.serializers import (
+        ApplicationSerializer,
+        MissionListSerializer,
+        ParticipationSerializer,
+    )
+    from missions.models import Application, Mission, Participation
+
+    related = ("volunteer__user", "mission__organization")
+    busiest_mission = Mission.objects.order_by("-application_count").values("pk")[:1]
+    return {
+        "missions": (
+            MissionListSerializer,
+            Mission.objects.filter(status="PUBLISHED")
+            .select_related("organization")
+            .order_by("-created_at"),
+            {
+                "complet": {"expand": "organization,odd"},
+                "défaut": {},
+                "fields": {"fields": "id,title,date,wilaya,remaining_places,organization.name"},
+            },
+        ),
+        "candidatures": (
+            ApplicationSerializer,
+            # Comme MissionApplicationsView : candidatures d'une mission
+            Application.objects.filter(mission_id=busiest_mission)
+            .select_related(*related)
+            .order_by("-applied_at", "-id"),
+            {
+                "complet": {"expand": "volunteer,mission.organization,mission.odd"},
+                "défaut": {},
+                "fields": {"fields": "id,status,applied_at,volunteer,mission.id,mission.title"},
+            },
+        ),
+        "participations": (
+            ParticipationSerializer,
+            Participation.objects.select_related(*related).order_by("-mission__date", "-id"),
+            {
+                "complet": {"expand": "volunteer,mission.organization,mission.odd"},
+                "défaut": {},
+                "fields": {"fields": "id,hours_completed,volunteer,mission.id,mission.title"},
+            },
+        ),
+    }
+
+
+def measure(serializer_class, rows, options, repeat):
+    """Octets de la page rendue et temps CPU moyen (ms) par page"""
+    from rest_framework.renderers import JSONRenderer
+
+    renderer = JSONRenderer()
+    body = renderer.render(serializer_class(rows, many=True, **options).data)
+    started = time.process_time()
+    for _ in range(repeat):
+        renderer.render(serializer_class(rows, many=True, **options).data)
+    cpu = (time.process_time() - started) / repeat
+    return {"bytes": len(body), "cpu_ms": round(cpu * 1000, 3)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Taille et coût CPU des pages de liste")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--page-size", type=int, help="Défaut : REST_FRAMEWORK['PAGE_SIZE']")
+    parser.add_argument("--output", help="Fichier JSON de résultats (optionnel)")
+    options = parser.parse_args(argv)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dzvolunteer.settings")
+    import django
+
+    django.setup()
+    from rest_framework.settings import api_settings
+
+    page_size = options.page_size or api_settings.PAGE_SIZE
+    results = {}
+    for name, (serializer_class, queryset, variants) in list_cases().items():
+        rows = list(queryset[:page_size])
+        if not rows:
+            print(f"{name:<15} aucune donnée (lancer manage.py generate_load_data)")
+            continue
+        results[name] = {
+            variant: measure(serializer_class, rows, kwargs, options.repeat)
+            for variant, kwargs in variants.items()
+        }
+        reference = results[name]["complet"]
+        for variant, result in results[name].items():
+            print(
+                f"{name:<15} {variant:<8} {result['bytes']:>8} octets "
+                f"({result['bytes'] / reference['bytes']:>4.0%})  "
+                f"{result['cpu_ms']:>7.2f} ms CPU ({result['cpu_ms'] / reference['cpu_ms']:>4.0%})"
+            )
+
+    if options.output:
+        Path(options.output).write_text(
+            json.dumps({"page_size": page_size, "lists": results}, indent=2, ensure_ascii=False)
+            + "\n",
+            encoding="utf-8",
+        )
+
+
+if __name__ == "__main__":
+    main()
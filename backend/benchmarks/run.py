@@ -0,0 +1,281 @@
+"""
+Lance les scénarios de charge contre un serveur local et enregistre les résultats
+
+    python manage.py generate_load_data --reset
+    gunicorn -c gunicorn.conf.py -w 4 dzvolunteer.asgi:application &
+    python -m benchmarks.run --concurrency 16 --duration 30
+
+Chaque scénario tourne ``--warmup`` secondes sans mesure puis ``--duration``
+secondes avec ``--concurrency`` clients (un thread et une connexion keep-alive
+chacun). Les résultats (p50/p95/p99, requêtes/s, par scénario et par étape)
+sont écrits dans ``benchmarks/results/<date>-<commit>.json`` ; voir
+``benchmarks.compare`` pour comparer deux exécutions.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import UTC, datetime
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+from .scenarios import SCENARIOS, discover_fixtures
+from .stats import summarize
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+class Session:
+    """Client HTTP d'un thread : connexion persistante, jetons JWT en cache, mesures"""
+
+    def __init__(self, base_url, recorder):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port
+        self.connection_class = (
+            http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        )
+        self.connection = None
+        self.recorder = recorder
+        self.tokens = {}
+
+    def _connect(self):
+        if self.connection is None:
+            self.connection = self.connection_class(self.host, self.port, timeout=30)
+        return self.connection
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def _send(self, method, path, body=None, token=None):
+        headers = {"Accept": "application/json"}
+        if body is not None:
+            body = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        connection = self._connect()
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException):
+            self.close()
+            raise
+        return response.status, payload
+
+    def request(self, step, method, path, params=None, body=None, token=None):
+        """
+        Exécute et chronomètre une requête ; renvoie le JSON décodé ou None
+
+        Seules les réponses 5xx et les erreurs réseau comptent comme erreurs :
+        une candidature refusée (400) ou une mission complète font partie du
+        scénario.
+        """
+        if path.startswith("http"):
+            parts = urlsplit(path)
+            path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        started = time.perf_counter()
+        try:
+            status, payload = self._send(method, path, body, token)
+        except (OSError, http.client.HTTPException):
+            self.recorder.record(step, time.perf_counter() - started, None)
+            return None
+        self.recorder.record(step, time.perf_counter() - started, status)
+        if status >= 400 or not payload:
+            return None
+        try:
+            return json.loads(payload)
+        except ValueError:
+            return None
+
+    def get(self, step, path, params=None, token=None):
+        return self.request(step, "GET", path, params=params, token=token)
+
+    def post(self, step, path, body, token=None):
+        return self.request(step, "POST", path, body=body, token=token)
+
+    def token_for(self, email, password):
+        """Jeton d'accès mis en cache par compte (la connexion n'est pas mesurée)"""
+        if email not in self.tokens:
+            status, payload = self._send(
+                "POST", "/api/auth/login/", {"email": email, "password": password}
+            )
+            if status != 200:
+                raise RuntimeError(f"Connexion impossible pour {email} ({status})")
+            self.tokens[email] = json.loads(payload)["tokens"]["access"]
+        return self.tokens[email]
+
+
+class Recorder:
+    """Latences par étape et par itération de scénario (thread-safe)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.enabled = False
+        self.steps = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.errors = Counter()
+        self.iterations = []
+        self.failed_iterations = 0
+
+    def record(self, step, duration, status):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.steps[step].append(duration)
+            self.statuses[step][str(status) if status else "error"] += 1
+            if status is None or status >= 500:
+                self.errors[step] += 1
+
+    def record_iteration(self, duration, failed):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.iterations.append(duration)
+            self.failed_iterations += failed
+
+
+def run_scenario(name, fixtures, options):
+    scenario = SCENARIOS[name]
+    recorder = Recorder()
+    stop = threading.Event()
+
+    def worker(index):
+        rng = random.Random(options.seed + index)
+        session = Session(options.base_url, recorder)
+        try:
+            while not stop.is_set():
+                started = time.perf_counter()
+                failed = False
+                try:
+                    scenario(session, fixtures, rng)
+                except (RuntimeError, OSError, http.client.HTTPException):
+                    failed = True
+                recorder.record_iteration(time.perf_counter() - started, failed)
+        finally:
+            session.close()
+
+    threads = [
+        threading.Thread(target=worker, args=(i,), daemon=True) for i in range(options.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(options.warmup)
+    recorder.enabled = True
+    started = time.perf_counter()
+    time.sleep(options.duration)
+    recorder.enabled = False
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    result = summarize(recorder.iterations, elapsed, errors=recorder.failed_iterations)
+    result["steps"] = {
+        step: summarize(
+            latencies, elapsed, errors=recorder.errors[step], statuses=recorder.statuses[step]
+        )
+        for step, latencies in sorted(recorder.steps.items())
+    }
+    return result
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "diff", "--quiet", "HEAD"], check=False).returncode
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(SCENARIOS),
+        help=f"Liste séparée par des virgules parmi : {', '.join(SCENARIOS)}",
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20, help="Secondes mesurées")
+    parser.add_argument("--warmup", type=float, default=5, help="Secondes non mesurées")
+    parser.add_argument("--password", default="loadtest123")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Fichier JSON (défaut : benchmarks/results/...)")
+    options = parser.parse_args(argv)
+    options.scenarios = [name.strip() for name in options.scenarios.split(",") if name.strip()]
+    unknown = set(options.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Scénarios inconnus : {', '.join(sorted(unknown))}")
+    return options
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dzvolunteer.settings")
+    fixtures = discover_fixtures(options.password)
+    if not fixtures.mission_ids or not fixtures.volunteer_emails:
+        sys.exit("Aucune donnée de charge : lancer d'abord manage.py generate_load_data")
+    if not fixtures.organizations and "organization" in options.scenarios:
+        options.scenarios.remove("organization")
+        print("Aucune candidature en attente : scénario 'organization' ignoré")
+
+    commit = git_commit()
+    started_at = datetime.now(UTC)
+    results = {
+        "meta": {
+            "commit": commit,
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "base_url": options.base_url,
+            "concurrency": options.concurrency,
+            "duration": options.duration,
+            "warmup": options.warmup,
+            "python": platform.python_version(),
+        },
+        "scenarios": {},
+    }
+    for name in options.scenarios:
+        print(f"→ {name} ({options.concurrency} clients, {options.duration:g}s)", flush=True)
+        result = run_scenario(name, fixtures, options)
+        results["scenarios"][name] = result
+        latency = result["latency_ms"]
+        print(
+            f"  {result['rps']:>8.1f} it/s  p50 {latency['p50']:.1f} ms  "
+            f"p95 {latency['p95']:.1f} ms  p99 {latency['p99']:.1f} ms  "
+            f"erreurs {result['errors']}"
+        )
+        for step, summary in result["steps"].items():
+            latency = summary["latency_ms"]
+            print(
+                f"    {step:<28} {summary['rps']:>8.1f} req/s  p50 {latency['p50']:.1f}  "
+                f"p95 {latency['p95']:.1f}  p99 {latency['p99']:.1f}  "
+                f"5xx {summary['errors']}"
+            )
+
+    output = (
+        Path(options.output)
+        if options.output
+        else (RESULTS_DIR / f"{started_at:%Y%m%d-%H%M%S}-{commit}.json")
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"Résultats : {output}")
+
+
+if __name__ == "__main__":
+    main()
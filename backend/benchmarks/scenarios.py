@@ -0,0 +1,160 @@
+"""
+Scénarios de charge : parcours du catalogue, connexion, candidature, organisation
+
+Chaque scénario est une fonction ``(session, fixtures, rng)`` qui enchaîne des
+requêtes nommées ; ``session`` chronomètre chaque étape. Les identifiants utiles
+(missions publiées, comptes, participations à valider) sont lus une fois en base
+par ``discover_fixtures`` : le serveur testé doit utiliser la même base, remplie
+par ``manage.py generate_load_data``.
+"""
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Fixtures:
+    password: str
+    mission_ids: list = field(default_factory=list)
+    wilayas: list = field(default_factory=list)
+    volunteer_emails: list = field(default_factory=list)
+    # email d'organisation -> {"pending": [mission_id], "validate": [(mission_id, [participation_id])]}
+    organizations: dict = field(default_factory=dict)
+
+
+def discover_fixtures(password, limit=2000):
+    """Identifiants de test lus via l'ORM (données générées par generate_load_data)"""
+    import django
+
+    django.setup()
+    from django.db.models import Count, Q
+    from django.utils import timezone
+
+    from accounts.models import Organization, Volunteer
+    from missions.management.commands.generate_load_data import EMAIL_DOMAIN
+    from missions.models import Mission, Participation
+
+    today = timezone.now().date()
+    fixtures = Fixtures(password=password)
+    published = Mission.objects.filter(status="PUBLISHED", date__gte=today)
+    fixtures.mission_ids = list(published.values_list("pk", flat=True)[:limit])
+    fixtures.wilayas = sorted(set(published.values_list("wilaya", flat=True)[:limit]))
+    fixtures.volunteer_emails = list(
+        Volunteer.objects.filter(user__email__endswith=f"@{EMAIL_DOMAIN}").values_list(
+            "user__email", flat=True
+        )[:limit]
+    )
+
+    organizations = (
+        Organization.objects.filter(user__email__endswith=f"@{EMAIL_DOMAIN}")
+        .annotate(
+            pending=Count(
+                "missions__applications", filter=Q(missions__applications__status="PENDING")
+            )
+        )
+        .filter(pending__gt=0)
+        .values_list("pk", "user__email")[:100]
+    )
+    for organization_id, email in organizations:
+        missions = Mission.objects.filter(organization_id=organization_id)
+        pending = list(
+            missions.filter(applications__status="PENDING")
+            .distinct()
+            .values_list("pk", flat=True)[:20]
+        )
+        validate = []
+        for mission_id in missions.filter(date__lt=today).values_list("pk", flat=True)[:5]:
+            participations = list(
+                Participation.objects.filter(mission_id=mission_id).values_list("pk", flat=True)
+            )
+            if participations:
+                validate.append((mission_id, participations))
+        fixtures.organizations[email] = {"pending": pending, "validate": validate}
+    return fixtures
+
+
+def catalogue_browsing(session, fixtures, rng):
+    """Visiteur anonyme : accueil, liste filtrée, page suivante, facettes, détail"""
+    session.get("home_stats", "/api/missions/home-stats/")
+    params = {"wilaya": rng.choice(fixtures.wilayas)} if fixtures.wilayas else {}
+    page = session.get("mission_list", "/api/missions/", params)
+    if page and page.get("next"):
+        session.get("mission_list_next", page["next"])
+    session.get("mission_facets", "/api/missions/facets/", params)
+    results = (page or {}).get("results") or []
+    mission_id = results[0]["id"] if results else rng.choice(fixtures.mission_ids)
+    session.get("mission_detail", f"/api/missions/{mission_id}/")
+
+
+def login(session, fixtures, rng):
+    """Connexion d'un bénévole"""
+    session.post(
+        "login",
+        "/api/auth/login/",
+        {"email": rng.choice(fixtures.volunteer_emails), "password": fixtures.password},
+    )
+
+
+def apply(session, fixtures, rng):
+    """Bénévole connecté : tableau de bord puis candidature à une mission"""
+    token = session.token_for(rng.choice(fixtures.volunteer_emails), fixtures.password)
+    session.get("volunteer_dashboard", "/api/missions/volunteer/dashboard/", token=token)
+    mission_id = rng.choice(fixtures.mission_ids)
+    session.post(
+        "apply",
+        f"/api/missions/volunteer/apply/{mission_id}/",
+        {"message": "Disponible"},
+        token=token,
+    )
+
+
+def organization_review(session, fixtures, rng):
+    """Organisation : candidatures en attente, réponse groupée, validation des heures"""
+    email = rng.choice(list(fixtures.organizations))
+    token = session.token_for(email, fixtures.password)
+    plan = fixtures.organizations[email]
+    session.get("organization_dashboard", "/api/missions/organization/dashboard/", token=token)
+
+    if plan["pending"]:
+        mission_id = rng.choice(plan["pending"])
+        page = session.get(
+            "mission_applications",
+            f"/api/missions/organization/mission/{mission_id}/applications/",
+            {"status": "PENDING"},
+            token=token,
+        )
+        pending = [a["id"] for a in (page or {}).get("results", [])][:5]
+        if pending:
+            session.post(
+                "bulk_respond_applications",
+                f"/api/missions/organization/mission/{mission_id}/applications/respond/",
+                {
+                    "decisions": [
+                        {"application_id": pk, "action": "accept" if i == 0 else "reject"}
+                        for i, pk in enumerate(pending)
+                    ]
+                },
+                token=token,
+            )
+
+    if plan["validate"]:
+        mission_id, participations = rng.choice(plan["validate"])
+        # Rejouer la validation est idempotent : le scénario peut boucler
+        session.post(
+            "validate_hours",
+            f"/api/missions/organization/mission/{mission_id}/validate-hours/",
+            {
+                "validations": [
+                    {"participation_id": pk, "was_present": True, "hours": 3, "rating": 5}
+                    for pk in participations
+                ]
+            },
+            token=token,
+        )
+
+
+SCENARIOS = {
+    "catalogue": catalogue_browsing,
+    "login": login,
+    "apply": apply,
+    "organization": organization_review,
+}
@@ -0,0 +1,79 @@
+"""
+Sérialiseurs DRF contre plan rapide (missions.fast_serializers), par page
+
+    python -m benchmarks.serialization --repeat 200
+
+Pour chaque liste et chaque variante (réponse par défaut, ``?fields=``,
+``?expand=``), mesure le temps d'une page complète : lecture en base, construction
+des lignes et rendu JSON. Côté DRF, le queryset ``select_related`` est évalué
+puis sérialisé ; côté rapide, ``values()`` puis le plan. Vérifie au passage que
+les deux corps JSON sont identiques.
+"""
+
+import argparse
+import os
+import time
+from functools import partial
+
+from .payloads import list_cases
+
+
+def _drf_page(renderer, serializer_class, page, options):
+    rows = list(page.all())
+    return renderer.render(serializer_class(rows, many=True, **options).data)
+
+
+def _fast_page(renderer, serializer_class, page, options):
+    from missions.fast_serializers import get_plan
+
+    plan = get_plan(serializer_class, options.get("fields"), options.get("expand"), ())
+    return renderer.render(plan.serialize(page.values(*plan.columns)))
+
+
+def _timed(function, repeat):
+    wall, cpu = time.perf_counter(), time.process_time()
+    for _ in range(repeat):
+        function()
+    return (
+        (time.perf_counter() - wall) / repeat * 1000,
+        (time.process_time() - cpu) / repeat * 1000,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sérialiseurs DRF contre plan rapide")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--page-size", type=int, help="Défaut : REST_FRAMEWORK['PAGE_SIZE']")
+    options = parser.parse_args(argv)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dzvolunteer.settings")
+    import django
+
+    django.setup()
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.settings import api_settings
+
+    renderer = JSONRenderer()
+    page_size = options.page_size or api_settings.PAGE_SIZE
+    for name, (serializer_class, queryset, variants) in list_cases().items():
+        page = queryset[:page_size]
+        for variant, kwargs in variants.items():
+            if variant == "complet":
+                variant = "expand"
+
+            drf = partial(_drf_page, renderer, serializer_class, page, kwargs)
+            fast = partial(_fast_page, renderer, serializer_class, page, kwargs)
+
+            if drf() != fast():
+                raise SystemExit(f"{name} {variant} : corps JSON différents")
+            drf_wall, drf_cpu = _timed(drf, options.repeat)
+            fast_wall, fast_cpu = _timed(fast, options.repeat)
+            print(
+                f"{name:<15} {variant:<7} DRF {drf_wall:>6.2f} ms ({drf_cpu:>6.2f} CPU)  "
+                f"rapide {fast_wall:>6.2f} ms ({fast_cpu:>6.2f} CPU)  "
+                f"x{drf_wall / fast_wall:.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Latence des lectures publiques en présence de clients lents (WSGI contre ASGI)
+
+    gunicorn dzvolunteer.wsgi -k sync -w 4 --bind 127.0.0.1:8000 &
+    python -m benchmarks.slow_clients --label wsgi
+
+    gunicorn -c gunicorn.conf.py -w 4 --bind 127.0.0.1:8000 dzvolunteer.asgi:application &
+    python -m benchmarks.slow_clients --label asgi
+
+``--slow-clients`` connexions envoient leur requête octet par octet pendant
+``--trickle`` secondes puis lisent la réponse par petits morceaux (réseau
+mobile dégradé), en boucle et en keep-alive. Pendant ce temps, ``--fast-clients``
+clients normaux enchaînent les lectures du parcours catalogue (accueil, liste,
+détail, ODD) et mesurent leur latence. Un worker WSGI synchrone reste bloqué
+sur chaque connexion lente ; un worker ASGI les attend toutes en parallèle.
+
+Le script ne lit la base qu'à travers l'API : il fonctionne contre n'importe
+quel serveur rempli par ``generate_load_data``.
+"""
+
+import argparse
+import json
+import platform
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from datetime import UTC, datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from .run import RESULTS_DIR, Recorder, Session, git_commit
+from .stats import summarize
+
+
+def discover_paths(session):
+    """Chemins lus par les clients : liste, détail de missions publiées, accueil, ODD"""
+    page = session.get("discover", "/api/missions/", {"page_size": 50})
+    if not page or not page["results"]:
+        raise SystemExit("Aucune mission publiée : lancer d'abord manage.py generate_load_data")
+    missions = [f"/api/missions/{mission['id']}/" for mission in page["results"]]
+    return {
+        "home_stats": ["/api/missions/home-stats/"],
+        "mission_list": ["/api/missions/", "/api/missions/?ordering=start_date"],
+        "mission_detail": missions,
+        "odd_list": ["/api/odd/"],
+    }
+
+
+class SlowClient:
+    """Connexion brute qui envoie et lit au compte-gouttes"""
+
+    def __init__(self, host, port, options):
+        self.address = (host, port)
+        self.host = f"{host}:{port}"
+        self.options = options
+        self.sock = None
+        self.buffer = b""
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+        self.buffer = b""
+
+    def _recv(self):
+        chunk = self.sock.recv(self.options.read_chunk)
+        if not chunk:
+            raise ConnectionError("connexion fermée par le serveur")
+        time.sleep(self.options.read_delay)
+        return chunk
+
+    def _read_response(self):
+        while b"\r\n\r\n" not in self.buffer:
+            self.buffer += self._recv()
+        head, self.buffer = self.buffer.split(b"\r\n\r\n", 1)
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split()[1])
+        headers = {
+            name.strip().lower(): value.strip()
+            for name, _, value in (line.partition(":") for line in lines[1:])
+        }
+        length = int(headers.get("content-length", 0))
+        while len(self.buffer) < length:
+            self.buffer += self._recv()
+        self.buffer = self.buffer[length:]
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status
+
+    def request(self, path):
+        if self.sock is None:
+            self.sock = socket.create_connection(self.address, timeout=self.options.timeout)
+        payload = (
+            f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            "Accept: application/json\r\nUser-Agent: benchmarks-slow-client\r\n\r\n"
+        ).encode()
+        pieces = max(self.options.trickle_pieces, 1)
+        size = -(-len(payload) // pieces)
+        for start in range(0, len(payload), size):
+            self.sock.sendall(payload[start : start + size])
+            time.sleep(self.options.trickle / pieces)
+        return self._read_response()
+
+
+def run(paths, options):
+    parts = urlsplit(options.base_url)
+    recorder = Recorder()
+    slow_statuses = Counter()
+    slow_lock = threading.Lock()
+    stop = threading.Event()
+    all_paths = [path for group in paths.values() for path in group]
+
+    def slow_worker(index):
+        rng = random.Random(options.seed + 1000 + index)
+        client = SlowClient(parts.hostname, parts.port, options)
+        # Arrivées étalées : les connexions lentes ne démarrent pas toutes ensemble
+        time.sleep(rng.uniform(0, options.trickle))
+        while not stop.is_set():
+            try:
+                status = client.request(rng.choice(all_paths))
+            except (OSError, ValueError, IndexError):
+                client.close()
+                status = "error"
+            if recorder.enabled:
+                with slow_lock:
+                    slow_statuses[str(status)] += 1
+        client.close()
+
+    def fast_worker(index):
+        rng = random.Random(options.seed + index)
+        session = Session(options.base_url, recorder)
+        try:
+            while not stop.is_set():
+                step = rng.choice(list(paths))
+                session.get(step, rng.choice(paths[step]))
+        finally:
+            session.close()
+
+    threads = [
+        threading.Thread(target=slow_worker, args=(i,), daemon=True)
+        for i in range(options.slow_clients)
+    ] + [
+        threading.Thread(target=fast_worker, args=(i,), daemon=True)
+        for i in range(options.fast_clients)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(options.warmup)
+    recorder.enabled = True
+    started = time.perf_counter()
+    time.sleep(options.duration)
+    recorder.enabled = False
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for thread in threads:
+        thread.join(options.timeout)
+
+    latencies = [value for values in recorder.steps.values() for value in values]
+    statuses = sum(recorder.statuses.values(), Counter())
+    result = summarize(latencies, elapsed, errors=sum(recorder.errors.values()), statuses=statuses)
+    result["steps"] = {
+        step: summarize(
+            values, elapsed, errors=recorder.errors[step], statuses=recorder.statuses[step]
+        )
+        for step, values in sorted(recorder.steps.items())
+    }
+    served = sum(count for status, count in slow_statuses.items() if status != "error")
+    result["slow_clients"] = {
+        "served": served,
+        "rps": round(served / elapsed, 2),
+        "statuses": dict(sorted(slow_statuses.items())),
+    }
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--label", default="server", help="Nom du serveur testé (wsgi, asgi)")
+    parser.add_argument("--slow-clients", type=int, default=64)
+    parser.add_argument("--fast-clients", type=int, default=8)
+    parser.add_argument(
+        "--trickle", type=float, default=2.0, help="Secondes pour envoyer une requête lente"
+    )
+    parser.add_argument("--trickle-pieces", type=int, default=10)
+    parser.add_argument("--read-chunk", type=int, default=1024, help="Octets lus par morceau")
+    parser.add_argument("--read-delay", type=float, default=0.05, help="Pause entre deux lectures")
+    parser.add_argument("--duration", type=float, default=20, help="Secondes mesurées")
+    parser.add_argument("--warmup", type=float, default=5, help="Secondes non mesurées")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Fichier JSON (défaut : benchmarks/results/...)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    discovery = Session(options.base_url, Recorder())
+    try:
+        paths = discover_paths(discovery)
+    finally:
+        discovery.close()
+
+    commit = git_commit()
+    started_at = datetime.now(UTC)
+    print(
+        f"→ {options.label} : {options.slow_clients} clients lents, "
+        f"{options.fast_clients} clients rapides, {options.duration:g}s",
+        flush=True,
+    )
+    result = run(paths, options)
+    latency = result["latency_ms"]
+    print(
+        f"  rapides {result['rps']:>8.1f} req/s  p50 {latency['p50']:.1f} ms  "
+        f"p95 {latency['p95']:.1f} ms  p99 {latency['p99']:.1f} ms  "
+        f"max {latency['max']:.1f} ms  erreurs {result['errors']}"
+    )
+    print(f"  lents   {result['slow_clients']['rps']:>8.1f} req/s  {result['slow_clients']}")
+
+    results = {
+        "meta": {
+            "commit": commit,
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "base_url": options.base_url,
+            "label": options.label,
+            "slow_clients": options.slow_clients,
+            "fast_clients": options.fast_clients,
+            "trickle": options.trickle,
+            "duration": options.duration,
+            "warmup": options.warmup,
+            "python": platform.python_version(),
+        },
+        # Même format que benchmarks.run : comparable avec benchmarks.compare
+        "scenarios": {"slow_clients": result},
+    }
+    output = (
+        Path(options.output)
+        if options.output
+        else (RESULTS_DIR / f"{started_at:%Y%m%d-%H%M%S}-{commit}-{options.label}.json")
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"Résultats : {output}")
+
+
+if __name__ == "__main__":
+    main()
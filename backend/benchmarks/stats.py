@@ -0,0 +1,69 @@
+"""
+Statistiques de latence et comparaison de deux résultats de benchmark
+"""
+
+import math
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values, p):
+    """Percentile par rang le plus proche sur une liste déjà triée"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(p / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies, elapsed, errors=0, statuses=None):
+    """Résumé d'une série de latences (secondes) mesurées pendant ``elapsed`` secondes"""
+    values = sorted(latencies)
+    summary = {
+        "requests": len(values),
+        "errors": errors,
+        "rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            **{f"p{p}": round(percentile(values, p) * 1000, 2) for p in PERCENTILES},
+            "mean": round(sum(values) / len(values) * 1000, 2) if values else 0.0,
+            "max": round(values[-1] * 1000, 2) if values else 0.0,
+        },
+    }
+    if statuses is not None:
+        summary["statuses"] = {str(code): count for code, count in sorted(statuses.items())}
+    return summary
+
+
+# Métriques comparées : (chemin, sens de l'amélioration)
+COMPARED = (
+    (("rps",), "higher"),
+    (("latency_ms", "p50"), "lower"),
+    (("latency_ms", "p95"), "lower"),
+    (("latency_ms", "p99"), "lower"),
+)
+
+
+def _get(summary, path):
+    for key in path:
+        summary = summary[key]
+    return summary
+
+
+def compare(baseline, candidate, threshold=0.10):
+    """
+    Compare deux fichiers de résultats scénario par scénario
+
+    Renvoie une liste de lignes ``(scénario, métrique, avant, après, écart, régression)``
+    où ``écart`` est relatif (0.12 = +12 %) et ``régression`` vaut True quand la
+    métrique se dégrade de plus de ``threshold``.
+    """
+    rows = []
+    for name, before in baseline["scenarios"].items():
+        after = candidate["scenarios"].get(name)
+        if after is None:
+            continue
+        for path, better in COMPARED:
+            old, new = _get(before, path), _get(after, path)
+            delta = (new - old) / old if old else 0.0
+            worse = -delta if better == "higher" else delta
+            rows.append((name, ".".join(path), old, new, delta, worse > threshold))
+    return rows
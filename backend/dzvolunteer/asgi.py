@@ -1,5 +1,9 @@
 """
 ASGI config for dzvolunteer project.
+
+Point d'entrée de production (voir gunicorn.conf.py) : les lectures publiques
+sont servies par les vues asynchrones de missions/async_views.py, sauf si
+``ASYNC_READ_VIEWS=False`` est défini dans l'environnement ou le ``.env``.
 """
 
 import os
@@ -7,5 +11,14 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dzvolunteer.settings")
+os.environ.setdefault("ASYNC_READ_VIEWS", "True")
 
 application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.DEBUG:
+    # Développement (docker-compose) : fichiers statiques servis comme par runserver
+    from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
+
+    application = ASGIStaticFilesHandler(application)
@@ -0,0 +1,236 @@
+"""
+Instrumentation des requêtes : temps base de données, authentification, rendu
+
+``InstrumentationMiddleware`` mesure pour chaque requête :
+
+- ``db`` : nombre et durée cumulée des requêtes SQL (``connection.execute_wrapper``) ;
+- ``auth`` : authentification JWT (``TimedJWTAuthentication``) ;
+- ``render`` : encodage JSON de la réponse (``TimedJSONRenderer``) ;
+- ``app`` : temps de la vue hors base et authentification (logique métier et
+  sérialiseurs DRF, dont l'évaluation est entremêlée avec les requêtes SQL) ;
+- ``total``.
+
+Les mesures sont renvoyées dans l'en-tête ``Server-Timing``, journalisées en
+une ligne JSON par requête et ajoutées aux histogrammes de ``/metrics``. Les
+requêtes lentes sont échantillonnées avec le texte SQL complet. Coût : deux
+appels à ``perf_counter`` par requête SQL et une ligne de log par requête.
+"""
+
+import json
+import logging
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .metrics import observe_request
+
+logger = logging.getLogger("dzvolunteer.requests")
+
+DEFAULTS = {
+    "ENABLED": True,
+    "SERVER_TIMING": True,
+    "SLOW_REQUEST_MS": 500,
+    "SLOW_SAMPLE_RATE": 1.0,
+    "MAX_SQL_SAMPLES": 100,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "INSTRUMENTATION", {})}
+
+
+@dataclass
+class RequestMetrics:
+    """Mesures d'une requête en cours (secondes)"""
+
+    started: float = field(default_factory=time.perf_counter)
+    query_count: int = 0
+    db_time: float = 0.0
+    auth_time: float = 0.0
+    auth_db_time: float = 0.0
+    render_time: float = 0.0
+    queries: list = field(default_factory=list)
+    max_sql_samples: int = DEFAULTS["MAX_SQL_SAMPLES"]
+
+    def record_query(self, sql, params, duration):
+        self.query_count += 1
+        self.db_time += duration
+        if len(self.queries) < self.max_sql_samples:
+            # Seul le nombre de paramètres est gardé : leurs valeurs (hachages de mots de
+            # passe, e-mails, téléphones) n'ont pas leur place dans les journaux
+            self.queries.append((sql, len(params or ()), duration))
+
+    def timings(self, total):
+        """Durées par phase en millisecondes"""
+        # Les requêtes SQL de l'authentification sont comptées dans db et dans auth
+        exclusive = self.db_time + self.auth_time - self.auth_db_time + self.render_time
+        app = max(total - exclusive, 0.0)
+        return {
+            "db": self.db_time * 1000,
+            "auth": self.auth_time * 1000,
+            "render": self.render_time * 1000,
+            "app": app * 1000,
+            "total": total * 1000,
+        }
+
+
+_current = ContextVar("request_metrics", default=None)
+
+
+def current_metrics():
+    """Mesures de la requête en cours, ou None hors requête instrumentée"""
+    return _current.get()
+
+
+class _QueryTimer:
+    """``execute_wrapper`` : chronomètre chaque requête SQL"""
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.metrics.record_query(sql, params, time.perf_counter() - started)
+
+
+def _install_timer(timer):
+    connection.execute_wrappers.append(timer)
+
+
+def _remove_timer(timer):
+    connection.execute_wrappers.remove(timer)
+
+
+class TimedJWTAuthentication(JWTAuthentication):
+    """Authentification JWT dont la durée est ajoutée aux mesures de la requête"""
+
+    def authenticate(self, request):
+        metrics = current_metrics()
+        if metrics is None:
+            return super().authenticate(request)
+        started, db_before = time.perf_counter(), metrics.db_time
+        try:
+            return super().authenticate(request)
+        finally:
+            metrics.auth_time += time.perf_counter() - started
+            metrics.auth_db_time += metrics.db_time - db_before
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """Rendu JSON dont la durée est ajoutée aux mesures de la requête"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        metrics = current_metrics()
+        if metrics is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        started = time.perf_counter()
+        try:
+            return super().render(data, accepted_media_type, renderer_context)
+        finally:
+            metrics.render_time += time.perf_counter() - started
+
+
+def server_timing(timings, query_count):
+    parts = []
+    for name, duration in timings.items():
+        desc = f';desc="SQL x{query_count}"' if name == "db" else ""
+        parts.append(f"{name};dur={duration:.1f}{desc}")
+    return ", ".join(parts)
+
+
+class InstrumentationMiddleware:
+    """
+    Mesure chaque requête ; à placer en tête de ``MIDDLEWARE``
+
+    Compatible WSGI et ASGI. Sous ASGI, l'ORM (asynchrone ou non) s'exécute dans
+    le thread synchrone propre à la requête : le chronomètre est installé sur la
+    connexion de ce thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = get_config()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.config["ENABLED"]:
+            return self.get_response(request)
+
+        metrics = RequestMetrics(max_sql_samples=self.config["MAX_SQL_SAMPLES"])
+        token = _current.set(metrics)
+        try:
+            with connection.execute_wrapper(_QueryTimer(metrics)):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not self.config["ENABLED"]:
+            return await self.get_response(request)
+
+        metrics = RequestMetrics(max_sql_samples=self.config["MAX_SQL_SAMPLES"])
+        timer = _QueryTimer(metrics)
+        token = _current.set(metrics)
+        await sync_to_async(_install_timer)(timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(_remove_timer)(timer)
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        total = time.perf_counter() - metrics.started
+        timings = metrics.timings(total)
+        if self.config["SERVER_TIMING"]:
+            response["Server-Timing"] = server_timing(timings, metrics.query_count)
+        self.log(request, response, metrics, timings)
+
+        match = getattr(request, "resolver_match", None)
+        observe_request(
+            match.namespace if match else "",
+            match.url_name if match else "",
+            request.method,
+            response.status_code,
+            total,
+            metrics.query_count,
+        )
+        return response
+
+    def log(self, request, response, metrics, timings):
+        match = getattr(request, "resolver_match", None)
+        entry = {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "queries": metrics.query_count,
+            **{f"{name}_ms": round(duration, 1) for name, duration in timings.items()},
+        }
+        slow = timings["total"] >= self.config["SLOW_REQUEST_MS"]
+        if slow and random.random() < self.config["SLOW_SAMPLE_RATE"]:
+            entry["slow"] = True
+            entry["sql"] = [
+                {"sql": sql, "param_count": param_count, "ms": round(duration * 1000, 1)}
+                for sql, param_count, duration in metrics.queries
+            ]
+            logger.warning(json.dumps(entry, ensure_ascii=False, default=str))
+        else:
+            logger.info(json.dumps(entry, ensure_ascii=False, default=str))
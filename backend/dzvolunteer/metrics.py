@@ -0,0 +1,221 @@
+"""
+Métriques au format texte Prometheus (endpoint ``/metrics``)
+
+Chaque worker accumule en mémoire les histogrammes de latence et de nombre de
+requêtes SQL par nom d'URL (alimentés par ``InstrumentationMiddleware``). Pour
+agréger plusieurs workers (gunicorn), chaque processus écrit périodiquement son
+état dans ``<METRICS["DIRECTORY"]>/worker-<pid>.json`` (écriture atomique) ; le
+worker qui répond au scrape additionne tous les fichiers. Les fichiers des
+workers arrêtés sont conservés : les compteurs restent monotones, comme en mode
+multiprocessus de prometheus_client. gunicorn.conf.py vide le répertoire au
+démarrage du serveur.
+
+Les jauges métier viennent d'un instantané en cache (voir missions/metrics.py).
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+DEFAULTS = {
+    "DIRECTORY": "",
+    "FLUSH_INTERVAL": 5,
+    "TOKEN": "",
+    "ALLOWED_IPS": ["127.0.0.1", "::1"],
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "METRICS", {})}
+
+
+class Registry:
+    """
+    Histogrammes et compteurs d'un processus
+
+    Format : ``{"histograms": {nom: {labels: [compteurs..., somme, total]}},
+    "counters": {nom: {labels: valeur}}}`` où ``labels`` est une chaîne
+    ``clé="valeur",...`` prête pour l'exposition.
+    """
+
+    def __init__(self, directory="", flush_interval=5):
+        self.directory = Path(directory) if directory else None
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+        self.last_flush = 0.0
+
+    def observe(self, name, labels, value, buckets):
+        with self.lock:
+            series = self.histograms.setdefault(name, {})
+            state = series.setdefault(labels, [0] * (len(buckets) + 2))
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def increment(self, name, labels, amount=1):
+        with self.lock:
+            series = self.counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0) + amount
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "histograms": {
+                    n: {k: list(v) for k, v in s.items()} for n, s in self.histograms.items()
+                },
+                "counters": {n: dict(s) for n, s in self.counters.items()},
+            }
+
+    def maybe_flush(self):
+        if self.directory and time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Écrit l'état du processus dans son fichier (remplacement atomique)"""
+        if not self.directory:
+            return
+        self.last_flush = time.monotonic()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"worker-{os.getpid()}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.snapshot()), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def collect(self):
+        """État agrégé de tous les workers (ou du seul processus courant)"""
+        if not self.directory:
+            return self.snapshot()
+        self.flush()
+        merged = {"histograms": {}, "counters": {}}
+        for path in sorted(self.directory.glob("worker-*.json")):
+            try:
+                state = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue  # fichier en cours de remplacement ou supprimé
+            for name, series in state["histograms"].items():
+                target = merged["histograms"].setdefault(name, {})
+                for labels, values in series.items():
+                    current = target.setdefault(labels, [0] * len(values))
+                    target[labels] = [a + b for a, b in zip(current, values, strict=True)]
+            for name, series in state["counters"].items():
+                target = merged["counters"].setdefault(name, {})
+                for labels, value in series.items():
+                    target[labels] = target.get(labels, 0) + value
+        return merged
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                config = get_config()
+                _registry = Registry(str(config["DIRECTORY"]), config["FLUSH_INTERVAL"])
+    return _registry
+
+
+def reset_registry():
+    """Oublie l'état du processus (tests, changement de configuration)"""
+    global _registry
+    _registry = None
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(**labels):
+    return ",".join(f'{key}="{_label(value)}"' for key, value in labels.items())
+
+
+def observe_request(namespace, url_name, method, status, duration, query_count):
+    """Enregistre une requête terminée (appelé par InstrumentationMiddleware)"""
+    registry = get_registry()
+    route = format_labels(namespace=namespace or "", url_name=url_name or "unmatched")
+    registry.observe(
+        "http_request_duration_seconds",
+        f'{route},method="{_label(method)}"',
+        duration,
+        LATENCY_BUCKETS,
+    )
+    registry.observe("http_request_db_queries", route, query_count, QUERY_BUCKETS)
+    registry.increment(
+        "http_requests_total", f'{route},method="{_label(method)}",status="{status}"'
+    )
+    registry.maybe_flush()
+
+
+HELP = {
+    "http_request_duration_seconds": ("histogram", "Durée des requêtes HTTP par nom d'URL"),
+    "http_request_db_queries": ("histogram", "Nombre de requêtes SQL par requête HTTP"),
+    "http_requests_total": ("counter", "Requêtes HTTP par nom d'URL et statut"),
+}
+
+BUCKETS = {
+    "http_request_duration_seconds": LATENCY_BUCKETS,
+    "http_request_db_queries": QUERY_BUCKETS,
+}
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(state, gauges):
+    """Exposition texte Prometheus 0.0.4"""
+    lines = []
+    for name, series in sorted(state["histograms"].items()):
+        kind, help_text = HELP.get(name, ("histogram", name))
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for labels, values in sorted(series.items()):
+            buckets = BUCKETS[name]
+            cumulative = values[: len(buckets)]
+            for bound, count in zip(buckets, cumulative, strict=True):
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {values[-1]}')
+            lines.append(f"{name}_sum{{{labels}}} {_number(values[-2])}")
+            lines.append(f"{name}_count{{{labels}}} {values[-1]}")
+    for name, series in sorted(state["counters"].items()):
+        kind, help_text = HELP.get(name, ("counter", name))
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for labels, value in sorted(series.items()):
+            lines.append(f"{name}{{{labels}}} {_number(value)}")
+    for name, (help_text, samples) in gauges.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        for labels, value in samples:
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{name}{suffix} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _authorized(request, config):
+    if config["TOKEN"]:
+        return request.headers.get("Authorization") == f"Bearer {config['TOKEN']}"
+    return request.META.get("REMOTE_ADDR") in config["ALLOWED_IPS"]
+
+
+def metrics_view(request):
+    """GET /metrics : jeton ``METRICS_TOKEN`` ou adresse autorisée"""
+    from missions.metrics import business_gauges
+
+    config = get_config()
+    if not _authorized(request, config):
+        raise Http404
+    body = render(get_registry().collect(), business_gauges())
+    return HttpResponse(body, content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -2,10 +2,11 @@
 Configuration Django pour DZ-Volunteer
 """
 
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
-from decouple import config
+from decouple import Csv, config
 
 # Build paths inside the project
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -35,6 +36,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # En premier : mesure la requête entière (voir dzvolunteer/instrumentation.py)
+    "dzvolunteer.instrumentation.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -122,8 +125,10 @@ CORS_ALLOW_ALL_ORIGINS = True
 
 # REST Framework
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+    "DEFAULT_AUTHENTICATION_CLASSES": ("dzvolunteer.instrumentation.TimedJWTAuthentication",),
+    "DEFAULT_RENDERER_CLASSES": (
+        "dzvolunteer.instrumentation.TimedJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_FILTER_BACKENDS": (
@@ -143,6 +148,87 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": True,
 }
 
+# Cache partagé entre workers (Redis, ``CACHE_URL=redis://host:6379/0``) : compteur
+# de vues, facettes, versions des données de référence, journaux des recommandations
+# et de l'éligibilité. Sans ``CACHE_URL``, cache mémoire propre au processus :
+# gunicorn démarre alors un seul worker (voir gunicorn.conf.py).
+CACHE_URL = config("CACHE_URL", default="")
+if CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+        }
+    }
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+# Compteur de vues des missions (écriture différée, voir missions/view_counter.py)
+VIEW_COUNTER = {
+    "BACKEND": config("VIEW_COUNTER_BACKEND", default="local"),  # "local" ou "cache"
+    "CACHE_ALIAS": "default",
+    "FLUSH_INTERVAL": config("VIEW_COUNTER_FLUSH_INTERVAL", default=30, cast=int),
+    "DEDUP_TTL": 30 * 60,
+    "FLUSH_THREAD": config("VIEW_COUNTER_FLUSH_THREAD", default=True, cast=bool),
+}
+
+# Instrumentation des requêtes (Server-Timing, logs JSON, échantillons SQL lents)
+INSTRUMENTATION = {
+    "ENABLED": config("INSTRUMENTATION_ENABLED", default=True, cast=bool),
+    "SERVER_TIMING": config("INSTRUMENTATION_SERVER_TIMING", default=True, cast=bool),
+    "SLOW_REQUEST_MS": config("SLOW_REQUEST_MS", default=500, cast=int),
+    "SLOW_SAMPLE_RATE": config("SLOW_REQUEST_SAMPLE_RATE", default=1.0, cast=float),
+    "MAX_SQL_SAMPLES": 100,
+}
+
+# Listes sérialisées depuis values() (voir missions/fast_serializers.py)
+FAST_SERIALIZATION = config("FAST_SERIALIZATION", default=True, cast=bool)
+
+# Vues asynchrones des lectures publiques (voir missions/async_views.py) ;
+# activées par défaut par dzvolunteer/asgi.py
+ASYNC_READ_VIEWS = config("ASYNC_READ_VIEWS", default=False, cast=bool)
+
+# Recommandations de missions (voir missions/matching.py)
+MATCHING = {
+    "CHECK_INTERVAL": config("MATCHING_CHECK_INTERVAL", default=5, cast=int),
+    "MAX_AGE": config("MATCHING_MAX_AGE", default=600, cast=int),
+    "LIMIT": 20,
+    "MAX_LIMIT": 50,
+}
+
+# Données de référence en mémoire : ODD et compétences (voir missions/reference.py)
+REFERENCE_DATA = {
+    "CHECK_INTERVAL": config("REFERENCE_DATA_CHECK_INTERVAL", default=5, cast=int),
+    "MAX_AGE": 300,
+    "RELOAD_INTERVAL": config("REFERENCE_DATA_RELOAD_INTERVAL", default=600, cast=int),
+}
+
+# Endpoint /metrics : agrégation multi-workers par fichiers dans METRICS_DIR (vidé par
+# gunicorn au démarrage, voir gunicorn.conf.py)
+METRICS = {
+    "DIRECTORY": config(
+        "METRICS_DIR", default=str(Path(tempfile.gettempdir()) / "dzvolunteer-metrics")
+    ),
+    "FLUSH_INTERVAL": config("METRICS_FLUSH_INTERVAL", default=5, cast=int),
+    "TOKEN": config("METRICS_TOKEN", default=""),
+    "ALLOWED_IPS": config("METRICS_ALLOWED_IPS", default="127.0.0.1,::1", cast=Csv()),
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "dzvolunteer.requests": {
+            "handlers": ["console"],
+            "level": config("REQUEST_LOG_LEVEL", default="INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 # Email Configuration (à configurer selon vos besoins)
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
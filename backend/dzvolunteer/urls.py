@@ -7,6 +7,8 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from .metrics import metrics_view
+
 urlpatterns = [
     # Admin Django
     path("admin/", admin.site.urls),
@@ -15,6 +17,8 @@ urlpatterns = [
     path("api/missions/", include("missions.urls")),
     path("api/skills/", include("skills.urls")),
     path("api/odd/", include("odd.urls")),
+    # Supervision (format Prometheus)
+    path("metrics", metrics_view, name="metrics"),
 ]
 
 # Servir les fichiers media en développement
@@ -0,0 +1,57 @@
+"""
+Configuration Gunicorn de production (ASGI)
+
+    gunicorn -c gunicorn.conf.py dzvolunteer.asgi:application
+
+Chaque worker est une boucle d'événements uvicorn : les connexions lentes
+(réseau mobile, keep-alive) n'immobilisent plus un worker comme en WSGI
+synchrone. Les valeurs se règlent par variables d'environnement.
+
+Plusieurs workers exigent un cache partagé (``CACHE_URL``, voir
+dzvolunteer/settings.py) : sans lui, chaque worker garde son propre cache mémoire
+et ne voit pas les invalidations des autres. Le nombre de workers vaut alors 1
+par défaut et un ``GUNICORN_WORKERS`` supérieur est refusé.
+
+Les workers écrivent leurs métriques dans ``METRICS_DIR`` (voir
+dzvolunteer/metrics.py) : le répertoire est vidé au démarrage du serveur, les
+fichiers d'un déploiement précédent ne s'additionnent pas aux nouveaux.
+"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from decouple import config
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+shared_cache = bool(config("CACHE_URL", default=""))
+workers = int(
+    os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1 if shared_cache else 1)
+)
+if workers > 1 and not shared_cache:
+    raise RuntimeError("GUNICORN_WORKERS > 1 exige un cache partagé : définir CACHE_URL")
+
+# Requête lente ou bloquée : le worker est redémarré après ce délai
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+# Recyclage périodique des workers (fuites mémoire), décalé entre workers
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 10000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 1000))
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+forwarded_allow_ips = os.environ.get("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+metrics_dir = config(
+    "METRICS_DIR", default=str(Path(tempfile.gettempdir()) / "dzvolunteer-metrics")
+)
+
+
+def on_starting(server):
+    """Processus maître, avant le lancement des workers"""
+    shutil.rmtree(metrics_dir, ignore_errors=True)
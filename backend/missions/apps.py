@@ -5,3 +5,6 @@ class MissionsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "missions"
     verbose_name = "Gestion des missions"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,147 @@
+"""
+Vues asynchrones des lectures publiques (mode ASGI)
+
+Servies à la place des vues DRF quand ``ASYNC_READ_VIEWS`` est actif (par défaut
+sous dzvolunteer/asgi.py) : catalogue des missions, détail d'une mission,
+statistiques de la page d'accueil, listes des ODD et des compétences. Chaque
+vue asynchrone s'appuie sur la vue DRF correspondante (authentification,
+permissions, négociation, filtres, sérialiseurs, en-têtes) et ne remplace que
+les entrées/sorties : ORM asynchrone (``aget``, ``async for``), cache
+asynchrone, données de référence en mémoire. Les réponses sont identiques à
+celles des vues DRF.
+
+Ce qui sort du chemin courant (méthode autre que GET, format autre que JSON,
+erreur de filtre ou d'authentification, objet introuvable, plan de
+sérialisation indisponible) est délégué à la vue DRF exécutée dans un thread.
+
+Sous Django 5.0, l'ORM asynchrone exécute les requêtes dans le thread
+synchrone propre à la requête : le gain porte sur les connexions lentes et les
+attentes réseau (un worker sert des centaines de connexions ouvertes), pas sur
+le débit SQL d'un worker.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from . import homepage, reference
+from .conditional import set_validators, validators
+
+
+class Fallback(Exception):
+    """Chemin non couvert : la vue DRF synchrone répond"""
+
+
+class AsyncReadView:
+    """
+    Adaptateur asynchrone d'une vue DRF de lecture
+
+    Les sous-classes implémentent ``get(view, request, **kwargs)`` avec ``view``
+    la vue DRF déjà initialisée (``request`` : requête DRF) et renvoient une
+    réponse non finalisée.
+    """
+
+    @classmethod
+    def as_view(cls, drf_view, **initkwargs):
+        sync_view = drf_view.as_view(**initkwargs)
+        fallback = sync_to_async(sync_view)
+        handler = cls()
+
+        async def view(request, *args, **kwargs):
+            if request.method != "GET":
+                return await fallback(request, *args, **kwargs)
+            try:
+                api_view = await handler.initialize(drf_view, initkwargs, request, args, kwargs)
+                response = await handler.get(api_view, api_view.request, *args, **kwargs)
+            except (Fallback, APIException, Http404):
+                return await fallback(request, *args, **kwargs)
+            response = api_view.finalize_response(api_view.request, response, *args, **kwargs)
+            if hasattr(response, "render"):
+                response.render()
+            return response
+
+        view.view_class = drf_view
+        view.csrf_exempt = True
+        return view
+
+    async def initialize(self, drf_view, initkwargs, request, args, kwargs):
+        """Équivalent de ``APIView.dispatch`` jusqu'à l'appel du handler"""
+        view = drf_view(**initkwargs)
+        view.setup(request, *args, **kwargs)
+        view.format_kwarg = None
+        view.request = view.initialize_request(request, *args, **kwargs)
+        view.headers = view.default_response_headers
+        if "HTTP_AUTHORIZATION" in request.META:
+            # Le jeton est vérifié et l'utilisateur lu en base : dans un thread
+            await sync_to_async(view.initial)(view.request, *args, **kwargs)
+        else:
+            view.initial(view.request, *args, **kwargs)
+        if not isinstance(view.request.accepted_renderer, JSONRenderer):
+            raise Fallback("API navigable")
+        return view
+
+    async def get(self, view, request, *args, **kwargs):
+        raise NotImplementedError
+
+
+class AsyncMissionListView(AsyncReadView):
+    """Catalogue des missions : plan rapide et pagination par clé asynchrone"""
+
+    async def get(self, view, request, *args, **kwargs):
+        # Les filtres peuvent lire la base (ODD du filtre, position du bénévole)
+        queryset = await sync_to_async(view.filter_queryset)(view.get_queryset())
+        plan = view.get_fast_plan(queryset)
+        if plan is None or not hasattr(view.paginator, "apaginate_queryset"):
+            raise Fallback("plan rapide indisponible")
+
+        rows = view.get_fast_rows(queryset, plan)
+        page = await view.paginator.apaginate_queryset(rows, request, view=view)
+        await reference.awarm()
+        return view.get_paginated_response(plan.serialize(page, request))
+
+
+class AsyncMissionDetailView(AsyncReadView):
+    """Détail d'une mission : ETag, compteur de vues et 304 comme la vue DRF"""
+
+    async def get(self, view, request, *args, **kwargs):
+        queryset = view.filter_queryset(view.get_queryset()).prefetch_related("required_skills")
+        try:
+            instance = await queryset.aget(pk=kwargs["pk"])
+        except queryset.model.DoesNotExist:
+            raise Http404 from None
+        view.check_object_permissions(request, instance)
+        # Le compteur peut vider son tampon en base
+        await sync_to_async(view.object_retrieved)(instance)
+        await reference.awarm()
+
+        etag, last_modified = validators(request, view.get_versions(instance), view.weak_etag)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = Response(view.get_serializer(instance).data)
+        return set_validators(response, etag, last_modified, view.cache_control)
+
+
+class AsyncHomePageStatsView(AsyncReadView):
+    """Instantané de la page d'accueil lu dans le cache asynchrone"""
+
+    async def get(self, view, request, *args, **kwargs):
+        return homepage.snapshot_response(request, await homepage.aget_snapshot())
+
+
+class AsyncReferenceListView(AsyncReadView):
+    """ODD et compétences : catalogue en mémoire, aucune requête SQL"""
+
+    async def get(self, view, request, *args, **kwargs):
+        await view.catalogue.aensure()
+        return view.get(request, *args, **kwargs)
+
+
+def read_view(drf_view, async_view, **initkwargs):
+    """Vue asynchrone si ``ASYNC_READ_VIEWS`` est actif, sinon la vue DRF"""
+    if getattr(settings, "ASYNC_READ_VIEWS", False):
+        return async_view.as_view(drf_view, **initkwargs)
+    return drf_view.as_view(**initkwargs)
@@ -0,0 +1,73 @@
+"""
+Requêtes conditionnelles (ETag / Last-Modified) pour les vues de détail
+
+Les validateurs sont calculés à partir des dates ``updated_at`` de l'objet et de
+ses relations sérialisées, lues avec l'objet lui-même : un ``If-None-Match`` ou
+un ``If-Modified-Since`` à jour reçoit un 304 avant toute sérialisation. Les
+compteurs mis à jour par ``update()`` (missions/services.py) avancent aussi
+``updated_at`` pour que ces dates restent fiables.
+"""
+
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+def fingerprint(request, *versions):
+    """Empreinte d'une représentation : URL complète, format négocié et versions"""
+    variant = "|".join(
+        [
+            request.build_absolute_uri(),
+            getattr(request, "accepted_media_type", ""),
+            *(str(version) for version in versions),
+        ]
+    )
+    return hashlib.md5(variant.encode(), usedforsecurity=False).hexdigest()[:16]
+
+
+def validators(request, versions, weak=False):
+    """(ETag, Last-Modified en secondes) d'une représentation"""
+    etag = f'"{fingerprint(request, *versions)}"'
+    if weak:
+        etag = f"W/{etag}"
+    return etag, int(max(version for version in versions if version).timestamp())
+
+
+def set_validators(response, etag, last_modified, cache_control):
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, **cache_control)
+    patch_vary_headers(response, ["Accept"])
+    return response
+
+
+class ConditionalRetrieveMixin:
+    """
+    ``retrieve()`` avec ETag et Last-Modified (à placer avant ``RetrieveAPIView``)
+
+    ``get_versions()`` renvoie les dates de l'objet et des relations présentes
+    dans la réponse ; ``object_retrieved()`` s'exécute pour chaque lecture, 304
+    compris. ``weak_etag`` : le corps peut différer entre deux réponses de même
+    version (compteur affiché, par exemple).
+    """
+
+    weak_etag = False
+    cache_control = {"public": True, "max_age": 60}
+
+    def get_versions(self, instance):
+        raise NotImplementedError
+
+    def object_retrieved(self, instance):
+        pass
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        self.object_retrieved(instance)
+
+        etag, last_modified = validators(request, self.get_versions(instance), self.weak_etag)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = Response(self.get_serializer(instance).data)
+        return set_validators(response, etag, last_modified, self.cache_control)
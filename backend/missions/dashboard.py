@@ -0,0 +1,58 @@
+"""
+Modèle de lecture du tableau de bord bénévole
+
+Deux requêtes quel que soit l'historique : un agrégat conditionnel pour les
+compteurs, puis une seule lecture des candidatures à afficher (les prochaines
+missions et les candidatures récentes partagent le même tri, on les sépare en
+Python).
+"""
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from accounts.serializers import DashboardApplicationSerializer
+
+from .models import Application
+
+UPCOMING_LIMIT = 3
+RECENT_LIMIT = 5
+ORDERING = ("-applied_at", "-id")
+
+
+def _is_upcoming(application, today):
+    return application.status == "ACCEPTED" and application.mission.date >= today
+
+
+def build_dashboard(volunteer):
+    today = timezone.now().date()
+    applications = Application.objects.filter(volunteer=volunteer)
+    upcoming = Q(status="ACCEPTED", mission__date__gte=today)
+
+    counters = applications.aggregate(
+        pending_applications=Count("pk", filter=Q(status="PENDING")),
+        accepted_missions=Count("pk", filter=upcoming),
+    )
+
+    # Les N premières de chaque liste selon le même tri : l'union des deux
+    # ensembles, triée, donne les deux listes par simple parcours
+    upcoming_ids = applications.filter(upcoming).order_by(*ORDERING).values("pk")[:UPCOMING_LIMIT]
+    recent_ids = applications.order_by(*ORDERING).values("pk")[:RECENT_LIMIT]
+    rows = list(
+        Application.objects.filter(Q(pk__in=upcoming_ids) | Q(pk__in=recent_ids))
+        .select_related("mission__organization")
+        .order_by(*ORDERING)
+    )
+
+    return {
+        "profile": {
+            "total_hours": volunteer.total_hours,
+            "badge_level": volunteer.badge_level,
+            "completed_missions": volunteer.completed_missions,
+            "average_rating": volunteer.average_rating,
+        },
+        "stats": counters,
+        "upcoming_missions": DashboardApplicationSerializer(
+            [row for row in rows if _is_upcoming(row, today)][:UPCOMING_LIMIT], many=True
+        ).data,
+        "recent_applications": DashboardApplicationSerializer(rows[:RECENT_LIMIT], many=True).data,
+    }
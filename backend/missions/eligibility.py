@@ -0,0 +1,120 @@
+"""
+Éligibilité d'un bénévole aux missions (compétences à vérification obligatoire)
+
+La candidature (``is_eligible``) est une autorisation : elle est vérifiée par
+une requête dans la transaction qui crée la candidature
+(``services.submit_application``), jamais depuis le cache.
+
+Le filtre ``?eligible=true`` du catalogue se contente d'ensembles de bits
+(bit n = compétence d'id n, comme dans missions/matching.py) gardés dans le
+cache partagé :
+
+- ``eligibility:volunteer:<id>`` : compétences validées du bénévole ;
+- ``eligibility:missions:<date>`` : {id de mission: compétences à vérification
+  obligatoire}, pour les seules missions ouvertes ce jour-là qui en exigent.
+
+Une mission est écartée si ``requises & ~validées != 0`` : un test bit à bit
+par mission, sans requête une fois le cache chaud. Les signaux
+(missions/signals.py) et les actions d'admin suppriment les entrées concernées
+tout de suite et à nouveau après le commit (une lecture concurrente a pu
+remettre l'ancienne valeur entre-temps) ; elles sont reconstruites à la
+lecture suivante, en une requête.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from skills.models import VolunteerSkill
+
+from .matching import open_missions, skill_bits
+from .models import MissionSkillRequirement
+
+CACHE_TIMEOUT = 60 * 60
+
+
+def volunteer_key(volunteer_id):
+    return f"eligibility:volunteer:{volunteer_id}"
+
+
+def missions_key(today):
+    return f"eligibility:missions:{today.isoformat()}"
+
+
+# ----- Chargement -----
+
+
+def load_validated(volunteer_id):
+    return skill_bits(
+        VolunteerSkill.objects.filter(volunteer_id=volunteer_id, status="VALIDATED").values_list(
+            "skill_id", flat=True
+        )
+    )
+
+
+def load_required(today):
+    required = {}
+    rows = MissionSkillRequirement.objects.filter(
+        verification_required=True, mission__in=open_missions(today).values("pk")
+    ).values_list("mission_id", "skill_id")
+    for mission_id, skill_id in rows:
+        required[mission_id] = required.get(mission_id, 0) | 1 << skill_id
+    return required
+
+
+def _get(volunteer_id):
+    """(compétences validées, compétences requises par mission ouverte) ; une lecture du cache"""
+    today = timezone.localdate()
+    key, required_key = volunteer_key(volunteer_id), missions_key(today)
+    found = cache.get_many([key, required_key])
+    validated, required = found.get(key), found.get(required_key)
+    if validated is None:
+        validated = load_validated(volunteer_id)
+        cache.set(key, validated, timeout=CACHE_TIMEOUT)
+    if required is None:
+        required = load_required(today)
+        cache.set(required_key, required, timeout=CACHE_TIMEOUT)
+    return validated, required
+
+
+# ----- Lecture -----
+
+
+def is_eligible(mission_id, volunteer_id):
+    """
+    Le bénévole a-t-il toutes les compétences vérifiées requises par la mission ?
+
+    Une requête, sans cache : à appeler dans la transaction de la candidature.
+    """
+    validated = VolunteerSkill.objects.filter(volunteer_id=volunteer_id, status="VALIDATED")
+    return (
+        not MissionSkillRequirement.objects.filter(
+            mission_id=mission_id, verification_required=True
+        )
+        .exclude(skill__in=validated.values("skill_id"))
+        .exists()
+    )
+
+
+def ineligible_missions(volunteer_id):
+    """Ids des missions ouvertes dont une compétence à vérification obligatoire manque"""
+    validated, required = _get(volunteer_id)
+    return [mission_id for mission_id, bits in required.items() if bits & ~validated]
+
+
+# ----- Invalidation -----
+
+
+def _delete(keys):
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def volunteer_changed(*volunteer_ids):
+    """Compétence d'un bénévole ajoutée, validée, refusée ou supprimée"""
+    _delete([volunteer_key(volunteer_id) for volunteer_id in volunteer_ids])
+
+
+def requirements_changed():
+    """Compétence requise d'une mission ajoutée, modifiée ou retirée"""
+    _delete([missions_key(timezone.localdate())])
@@ -0,0 +1,165 @@
+"""
+Comptages par facette du catalogue (wilaya, ODD, type, statut, cause, compétence)
+
+Chaque facette est calculée par une requête agrégée groupée sur les missions
+correspondant aux filtres courants, sans le filtre de la facette elle-même (pour
+qu'une barre latérale continue d'afficher les autres valeurs). Le résultat est
+mis en cache par signature de filtres normalisée ; la version du cache est
+incrémentée quand une mission est publiée ou change de statut (voir signals.py).
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from . import reference
+from .models import Mission, MissionSkillRequirement
+
+VERSION_KEY = "mission_facets:version"
+CACHE_TIMEOUT = 5 * 60
+
+# Facette -> paramètre de filtre du catalogue
+FACET_PARAMS = {
+    "wilaya": "wilaya",
+    "odd": "odd",
+    "mission_type": "mission_type",
+    "status": "status",
+    "cause": "causes",
+    "skill": "skills",
+}
+
+# Champs de Mission dont la modification change les comptages
+FACETED_FIELDS = {"status", "date", "wilaya", "odd", "mission_type", "causes", "published_at"}
+
+# Paramètres sans effet sur l'ensemble filtré
+IGNORED_PARAMS = {"cursor", "page_size", "ordering", "with_count"}
+
+
+def get_version():
+    return cache.get_or_set(VERSION_KEY, 1, timeout=None)
+
+
+def bump_version():
+    """Invalide tous les comptages en cache"""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, timeout=None)
+
+
+def filter_signature(request):
+    """Signature stable des filtres de la requête (ordre des paramètres indifférent)"""
+    params = sorted(
+        (key, sorted(request.query_params.getlist(key)))
+        for key in request.query_params
+        if key not in IGNORED_PARAMS
+    )
+    if request.query_params.get("near") == "me":
+        params.append(("user", [str(request.user.pk)]))
+    return hashlib.sha1(json.dumps(params).encode()).hexdigest()
+
+
+def _bucket(queryset, field, labels):
+    rows = (
+        Mission.objects.filter(pk__in=queryset.values("pk"))
+        .order_by()
+        .values(field)
+        .annotate(count=Count("pk"))
+    )
+    return sorted(
+        (
+            {
+                "value": row[field],
+                "label": labels.get(row[field], row[field]),
+                "count": row["count"],
+            }
+            for row in rows
+        ),
+        key=lambda item: -item["count"],
+    )
+
+
+def wilaya_facet(queryset):
+    return _bucket(queryset, "wilaya", dict(settings.WILAYAS))
+
+
+def mission_type_facet(queryset):
+    return _bucket(queryset, "mission_type", dict(Mission.TYPE_CHOICES))
+
+
+def status_facet(queryset):
+    return _bucket(queryset, "status", dict(Mission.STATUS_CHOICES))
+
+
+def odd_facet(queryset):
+    rows = _bucket(queryset, "odd", {})
+    for row in rows:
+        odd = reference.odds.get(row["value"])
+        if odd is not None:
+            row.update(number=odd.number, label=odd.title_fr, color=odd.color)
+    return rows
+
+
+def cause_facet(queryset):
+    """Causes stockées en liste JSON : un seul agrégat conditionnel pour toutes les valeurs"""
+    missions = Mission.objects.filter(pk__in=queryset.values("pk")).order_by()
+    counts = missions.aggregate(
+        **{
+            code: Count("pk", filter=Q(causes__icontains=f'"{code}"'))
+            for code, _ in Mission.CAUSE_CHOICES
+        }
+    )
+    return [
+        {"value": code, "label": label, "count": counts[code]}
+        for code, label in sorted(Mission.CAUSE_CHOICES, key=lambda choice: -counts[choice[0]])
+        if counts[code]
+    ]
+
+
+def skill_facet(queryset):
+    rows = (
+        MissionSkillRequirement.objects.filter(mission__in=queryset.values("pk"))
+        .order_by()
+        .values("skill_id", "skill__name")
+        .annotate(count=Count("mission", distinct=True))
+        .order_by("-count", "skill__name")
+    )
+    return [
+        {"value": row["skill_id"], "label": row["skill__name"], "count": row["count"]}
+        for row in rows
+    ]
+
+
+FACETS = {
+    "wilaya": wilaya_facet,
+    "odd": odd_facet,
+    "mission_type": mission_type_facet,
+    "status": status_facet,
+    "cause": cause_facet,
+    "skill": skill_facet,
+}
+
+
+def compute_facets(filtered_queryset_without):
+    """
+    Calcule toutes les facettes
+
+    ``filtered_queryset_without(param)`` renvoie le queryset du catalogue filtré
+    par tous les paramètres de la requête sauf ``param``.
+    """
+    return {
+        name: facet(filtered_queryset_without(FACET_PARAMS[name])) for name, facet in FACETS.items()
+    }
+
+
+def get_facets(request, filtered_queryset_without):
+    """Facettes en cache pour la signature de filtres de la requête"""
+    key = f"mission_facets:v{get_version()}:{filter_signature(request)}"
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(filtered_queryset_without)
+        cache.set(key, facets, CACHE_TIMEOUT)
+    return facets
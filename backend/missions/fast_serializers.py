@@ -0,0 +1,296 @@
+"""
+Sérialisation rapide des listes (missions, candidatures, participations)
+
+Un sérialiseur DRF instancie un modèle par ligne puis appelle ``get_attribute``
+et ``to_representation`` champ par champ, après avoir reconstruit ses champs
+par introspection du modèle à chaque requête. Ici, le sérialiseur est analysé
+une seule fois par combinaison (classe, ``fields``, ``expand``, annotations)
+pour produire un plan : les colonnes à lire avec ``values()`` et, pour chaque
+clé de sortie, un accesseur précalculé. Les lignes sont construites à partir
+des dictionnaires de ``values()``, sans instancier de modèle, et le JSON rendu
+est identique octet pour octet (voir tests/unit/test_fast_serializers.py).
+
+Un champ sans équivalent connu (relation multiple, méthode non déclarée
+ci-dessous...) rend le plan indisponible : la vue revient au sérialiseur DRF.
+"""
+
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from accounts.serializers import MissionListSerializer, ReferenceField
+
+from .models import Mission
+from .pagination import KeysetPagination
+
+logger = logging.getLogger(__name__)
+
+
+class Unsupported(Exception):
+    """Champ que le plan ne sait pas reproduire"""
+
+
+# Champs dont ``to_representation`` ne modifie pas une valeur issue de values()
+IDENTITY_FIELDS = {
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.EmailField,
+    serializers.IntegerField,
+    serializers.ReadOnlyField,
+    serializers.SlugField,
+    serializers.URLField,
+}
+
+# Champs dont ``to_representation`` s'applique tel quel à la valeur brute
+CONVERTED_FIELDS = {
+    serializers.DateField,
+    serializers.DateTimeField,
+    serializers.DecimalField,
+    serializers.FloatField,
+    serializers.TimeField,
+}
+
+# Méthodes de modèle utilisées comme source : (colonnes, calcul équivalent)
+MODEL_METHODS = {
+    (Mission, "get_remaining_places"): (
+        ("required_volunteers", "accepted_volunteers"),
+        lambda required, accepted: required - accepted,
+    ),
+    (Mission, "get_fill_percentage"): (
+        ("required_volunteers", "accepted_volunteers"),
+        lambda required, accepted: int((accepted / required) * 100) if required else 0,
+    ),
+}
+
+# SerializerMethodField : (annotation lue, calcul sur sa valeur)
+SERIALIZER_METHODS = {
+    (MissionListSerializer, "get_distance_km"): (
+        "distance_km",
+        lambda distance: round(distance, 1) if distance is not None else None,
+    ),
+}
+
+
+@dataclass(frozen=True)
+class Plan:
+    """Colonnes à lire et accesseurs ``(clé, fonction(ligne, requête))``"""
+
+    columns: tuple
+    accessors: tuple
+
+    def serialize(self, rows, request=None):
+        accessors = self.accessors
+        return [{key: accessor(row, request) for key, accessor in accessors} for row in rows]
+
+
+def _model_field(model, name):
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        raise Unsupported(f"{model.__name__}.{name}") from None
+    if not field.concrete or field.many_to_many:
+        raise Unsupported(f"{model.__name__}.{name}")
+    return field
+
+
+def _value_accessor(column, convert=None):
+    if convert is None:
+        return lambda row, request: row[column]
+
+    def accessor(row, request):
+        value = row[column]
+        return None if value is None else convert(value)
+
+    return accessor
+
+
+def _file_accessor(column, storage, use_url):
+    """Équivalent de ``FileField.to_representation`` sur le nom stocké"""
+
+    def accessor(row, request):
+        name = row[column]
+        if not name:
+            return None
+        if not use_url:
+            return name
+        url = storage.url(name)
+        return request.build_absolute_uri(url) if request is not None else url
+
+    return accessor
+
+
+def _reference_accessor(column, field):
+    """Représentation mise en cache par le catalogue de données de référence"""
+
+    def accessor(row, request):
+        pk = row[column]
+        return None if pk is None else field.represent(pk, request)
+
+    return accessor
+
+
+def _computed_accessor(columns, function, convert=None):
+    def accessor(row, request):
+        value = function(*[row[column] for column in columns])
+        return value if value is None or convert is None else convert(value)
+
+    return accessor
+
+
+def _nested_accessor(column, accessors):
+    def accessor(row, request):
+        if row[column] is None:
+            return None
+        return {key: nested(row, request) for key, nested in accessors}
+
+    return accessor
+
+
+def _converter(field):
+    """Conversion d'un champ simple (None : valeur renvoyée telle quelle)"""
+    kind = type(field)
+    if kind in IDENTITY_FIELDS:
+        return None
+    if kind in CONVERTED_FIELDS:
+        return field.to_representation
+    if kind is serializers.JSONField and not field.binary:
+        return None
+    if kind is serializers.PrimaryKeyRelatedField and field.pk_field is None:
+        return None
+    raise Unsupported(f"{kind.__name__} ({field.field_name})")
+
+
+def _compile(serializer, model, prefix, annotations):
+    columns, accessors = [], []
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        key = field.field_name
+
+        if isinstance(field, serializers.SerializerMethodField):
+            method = SERIALIZER_METHODS.get((type(serializer), field.method_name))
+            if method is None:
+                raise Unsupported(f"{type(serializer).__name__}.{field.method_name}")
+            annotation, function = method
+            if annotation in annotations:
+                columns.append(annotation)
+                accessors.append((key, _computed_accessor((annotation,), function)))
+            else:
+                accessors.append((key, lambda row, request, value=function(None): value))
+            continue
+
+        if field.source == "*":
+            raise Unsupported(key)
+        *path, last = field.source_attrs
+        current = model
+        for attr in path:
+            relation = _model_field(current, attr)
+            if not relation.is_relation:
+                raise Unsupported(key)
+            current = relation.related_model
+        base = prefix + "".join(f"{attr}__" for attr in path)
+
+        method = MODEL_METHODS.get((current, last))
+        if method is not None:
+            names, function = method
+            method_columns = tuple(base + name for name in names)
+            columns.extend(method_columns)
+            accessors.append((key, _computed_accessor(method_columns, function, _converter(field))))
+            continue
+
+        model_field = _model_field(current, last)
+        column = base + last
+        columns.append(column)
+
+        if isinstance(field, ReferenceField):
+            accessors.append((key, _reference_accessor(column, field)))
+        elif isinstance(field, serializers.BaseSerializer):
+            if isinstance(field, serializers.ListSerializer) or not model_field.is_relation:
+                raise Unsupported(key)
+            nested_columns, nested_accessors = _compile(
+                field, model_field.related_model, f"{column}__", frozenset()
+            )
+            columns.extend(nested_columns)
+            accessors.append((key, _nested_accessor(column, tuple(nested_accessors))))
+        elif isinstance(field, serializers.FileField):
+            use_url = getattr(field, "use_url", api_settings.UPLOADED_FILES_USE_URL)
+            accessors.append((key, _file_accessor(column, model_field.storage, use_url)))
+        else:
+            accessors.append((key, _value_accessor(column, _converter(field))))
+    return columns, accessors
+
+
+@lru_cache(maxsize=256)
+def get_plan(serializer_class, fields=None, expand=None, annotations=()):
+    """Plan mis en cache, ou None si un champ n'a pas d'équivalent rapide"""
+    serializer = serializer_class(fields=fields, expand=expand)
+    try:
+        columns, accessors = _compile(
+            serializer, serializer_class.Meta.model, "", frozenset(annotations)
+        )
+    except Unsupported as exc:
+        logger.debug("Sérialisation rapide indisponible pour %s : %s", serializer_class, exc)
+        return None
+    return Plan(tuple(dict.fromkeys(columns)), tuple(accessors))
+
+
+def serialize(serializer_class, queryset, request=None, fields=None, expand=None):
+    """Équivalent de ``serializer_class(queryset, many=True).data``"""
+    annotations = tuple(sorted(queryset.query.annotations))
+    plan = get_plan(serializer_class, fields, expand, annotations)
+    if plan is None:
+        context = {"request": request} if request is not None else {}
+        return serializer_class(
+            queryset, many=True, fields=fields, expand=expand, context=context
+        ).data
+    return plan.serialize(queryset.values(*plan.columns), request)
+
+
+class FastListMixin:
+    """
+    ``list()`` servi par le plan rapide (à placer avant ``ListAPIView``)
+
+    Activé par vue avec ``fast_serialization`` et globalement par le réglage
+    ``FAST_SERIALIZATION``. ``?fields=`` et ``?expand=`` font partie de la clé
+    du plan ; la pagination par clé lit ses colonnes de tri dans ``values()``.
+    """
+
+    fast_serialization = True
+
+    def get_fast_plan(self, queryset):
+        if not (self.fast_serialization and getattr(settings, "FAST_SERIALIZATION", True)):
+            return None
+        params = self.request.query_params
+        return get_plan(
+            self.get_serializer_class(),
+            params.get("fields") or None,
+            params.get("expand") or None,
+            tuple(sorted(queryset.query.annotations)),
+        )
+
+    def get_fast_rows(self, queryset, plan):
+        """``values()`` des colonnes du plan et des colonnes de tri de la pagination"""
+        columns = plan.columns
+        if isinstance(self.paginator, KeysetPagination):
+            ordering = self.paginator.get_ordering(queryset)
+            columns += tuple(field.lstrip("-") for field in ordering)
+        return queryset.values(*dict.fromkeys(columns))
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        plan = self.get_fast_plan(queryset)
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = self.get_fast_rows(queryset, plan)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.serialize(page, request))
+        return Response(plan.serialize(rows, request))
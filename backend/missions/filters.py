@@ -0,0 +1,178 @@
+"""
+Filtres DRF pour le catalogue des missions
+"""
+
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+
+from . import eligibility, geo, search
+
+
+class MissionSearchFilter(filters.BaseFilterBackend):
+    """
+    Recherche plein texte pondérée (voir missions.search)
+
+    Sans paramètre ``ordering`` explicite, les résultats sont triés par pertinence :
+    ce filtre doit donc être placé après ``OrderingFilter``.
+    """
+
+    search_param = api_settings.SEARCH_PARAM
+    ordering_param = api_settings.ORDERING_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+        order_by_rank = not request.query_params.get(self.ordering_param)
+        return search.search_missions(queryset, query, order_by_rank=order_by_rank)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Recherche plein texte (titre, descriptions, commune, organisation)",
+                "schema": {"type": "string"},
+            }
+        ]
+
+
+class MissionProximityFilter(filters.BaseFilterBackend):
+    """
+    Recherche par rayon : ``?near=lat,lng&radius_km=`` ou ``?near=me``
+
+    ``near=me`` utilise la position enregistrée du bénévole connecté. Sans
+    ``radius_km``, le rayon préféré du bénévole (``preferred_radius``) est utilisé.
+    Seules les cellules geohash couvrant le cercle sont lues, puis la distance
+    exacte est calculée sur ces lignes. Sans ``ordering`` ni ``search``, les
+    résultats sont triés du plus proche au plus éloigné.
+    """
+
+    near_param = "near"
+    radius_param = "radius_km"
+    default_radius_km = 50
+    max_radius_km = 500
+
+    def _volunteer(self, request):
+        user = request.user
+        if user.is_authenticated and user.user_type == "VOLUNTEER":
+            return getattr(user, "volunteer_profile", None)
+        return None
+
+    def get_origin(self, request):
+        near = request.query_params[self.near_param].strip()
+        if near == "me":
+            volunteer = self._volunteer(request)
+            if volunteer is None or volunteer.latitude is None or volunteer.longitude is None:
+                raise ValidationError(
+                    {self.near_param: "Position du bénévole inconnue : renseignez votre profil"}
+                )
+            return float(volunteer.latitude), float(volunteer.longitude)
+        try:
+            latitude, longitude = (float(part) for part in near.split(","))
+        except ValueError:
+            raise ValidationError({self.near_param: "Format attendu : lat,lng"}) from None
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValidationError({self.near_param: "Coordonnées hors limites"})
+        return latitude, longitude
+
+    def get_radius(self, request):
+        raw = request.query_params.get(self.radius_param)
+        if raw is None:
+            volunteer = self._volunteer(request)
+            return volunteer.preferred_radius if volunteer else self.default_radius_km
+        try:
+            radius = float(raw)
+        except ValueError:
+            raise ValidationError({self.radius_param: "Nombre attendu"}) from None
+        if not 0 < radius <= self.max_radius_km:
+            raise ValidationError(
+                {
+                    self.radius_param: f"Le rayon doit être compris entre 0 et {self.max_radius_km} km"
+                }
+            )
+        return radius
+
+    def filter_queryset(self, request, queryset, view):
+        if not request.query_params.get(self.near_param):
+            return queryset
+
+        latitude, longitude = self.get_origin(request)
+        radius = self.get_radius(request)
+
+        cells = geo.covering_cells(latitude, longitude, radius)
+        if cells:
+            queryset = queryset.filter(
+                reduce(or_, (Q(geohash__startswith=cell) for cell in sorted(cells)))
+            )
+        else:
+            queryset = queryset.exclude(geohash="")
+
+        queryset = queryset.annotate(
+            distance_km=geo.haversine_expression(latitude, longitude)
+        ).filter(distance_km__lte=radius)
+
+        if not (
+            request.query_params.get(api_settings.ORDERING_PARAM)
+            or request.query_params.get(api_settings.SEARCH_PARAM)
+        ):
+            queryset = queryset.order_by("distance_km", "pk")
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.near_param,
+                "required": False,
+                "in": "query",
+                "description": "Position « lat,lng » ou « me » (position du bénévole)",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.radius_param,
+                "required": False,
+                "in": "query",
+                "description": "Rayon en km (par défaut : rayon préféré du bénévole)",
+                "schema": {"type": "number"},
+            },
+        ]
+
+
+class MissionEligibilityFilter(filters.BaseFilterBackend):
+    """
+    ``?eligible=true`` : missions auxquelles le bénévole connecté peut postuler
+
+    Écarte les missions dont une compétence à vérification obligatoire n'est pas
+    validée pour ce bénévole (voir missions.eligibility).
+    """
+
+    eligible_param = "eligible"
+
+    def filter_queryset(self, request, queryset, view):
+        if request.query_params.get(self.eligible_param) != "true":
+            return queryset
+        user = request.user
+        volunteer = None
+        if user.is_authenticated and user.user_type == "VOLUNTEER":
+            volunteer = getattr(user, "volunteer_profile", None)
+        if volunteer is None:
+            raise ValidationError({self.eligible_param: "Réservé aux bénévoles connectés"})
+        ineligible = eligibility.ineligible_missions(volunteer.pk)
+        return queryset.exclude(pk__in=ineligible) if ineligible else queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.eligible_param,
+                "required": False,
+                "in": "query",
+                "description": "« true » : missions dont le bénévole a les compétences vérifiées",
+                "schema": {"type": "boolean"},
+            }
+        ]
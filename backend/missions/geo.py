@@ -0,0 +1,94 @@
+"""
+Outils géographiques : geohash et distance de haversine
+
+Chaque mission géolocalisée stocke son geohash (colonne indexée). Une recherche
+par rayon ne considère que les missions dont le geohash commence par l'une des
+cellules couvrant le cercle (cellule centrale + 8 voisines), puis calcule la
+distance exacte en SQL sur ces seules lignes. Aucun besoin de PostGIS.
+"""
+
+import math
+
+from django.db.models import F, FloatField
+from django.db.models.functions import ASin, Cast, Cos, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+GEOHASH_PRECISION = 8
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Encode une position en geohash"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    latitude, longitude = float(latitude), float(longitude)
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        value, bounds = (longitude, lng_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def cell_size_degrees(precision):
+    """Dimensions (lat, lng) en degrés d'une cellule geohash"""
+    total_bits = 5 * precision
+    lat_bits, lng_bits = total_bits // 2, total_bits - total_bits // 2
+    return 180.0 / 2**lat_bits, 360.0 / 2**lng_bits
+
+
+def precision_for_radius(latitude, radius_km):
+    """Précision la plus fine dont les cellules sont au moins aussi grandes que le rayon"""
+    cos_lat = max(math.cos(math.radians(latitude)), 0.01)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_deg, lng_deg = cell_size_degrees(precision)
+        if min(lat_deg * KM_PER_DEGREE, lng_deg * KM_PER_DEGREE * cos_lat) >= radius_km:
+            return precision
+    return 0
+
+
+def covering_cells(latitude, longitude, radius_km):
+    """Préfixes geohash (cellule + voisines) couvrant un cercle ; vide = toute la Terre"""
+    precision = precision_for_radius(latitude, radius_km)
+    if precision == 0:
+        return set()
+    lat_deg, lng_deg = cell_size_degrees(precision)
+    cells = set()
+    for d_lat in (-1, 0, 1):
+        for d_lng in (-1, 0, 1):
+            lat = min(max(latitude + d_lat * lat_deg, -89.999999), 89.999999)
+            lng = (longitude + d_lng * lng_deg + 180.0) % 360.0 - 180.0
+            cells.add(encode_geohash(lat, lng, precision))
+    return cells
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Distance orthodromique en km"""
+    lat1, lng1, lat2, lng2 = map(math.radians, map(float, (lat1, lng1, lat2, lng2)))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def haversine_expression(latitude, longitude, lat_field="latitude", lng_field="longitude"):
+    """Expression SQL de la distance (km) entre un point et les champs lat/lng d'un modèle"""
+    lat0, lng0 = math.radians(float(latitude)), math.radians(float(longitude))
+    lat = Radians(Cast(F(lat_field), FloatField()))
+    lng = Radians(Cast(F(lng_field), FloatField()))
+    a = Power(Sin((lat - lat0) / 2), 2) + math.cos(lat0) * Cos(lat) * Power(
+        Sin((lng - lng0) / 2), 2
+    )
+    return 2 * EARTH_RADIUS_KM * ASin(Sqrt(a), output_field=FloatField())
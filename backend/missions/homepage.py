@@ -0,0 +1,153 @@
+"""
+Instantané de la page d'accueil
+
+Les compteurs globaux (bénévoles, missions publiées, heures) sont stockés dans
+la ligne unique ``SiteStats`` et mis à jour par des ``UPDATE ... SET x = x + n``
+depuis les chemins d'écriture (voir signals.py et services.py). La réponse
+complète, dernières missions comprises, est sérialisée une seule fois en JSON et
+mise en cache avec son ETag ; toute écriture qui la modifie incrémente la
+version du cache.
+"""
+
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db.models import F, Sum
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.renderers import JSONRenderer
+
+from accounts.models import Volunteer
+from accounts.serializers import MissionListSerializer
+
+from . import fast_serializers
+from .models import Mission, SiteStats
+
+VERSION_KEY = "homepage:version"
+CACHE_TIMEOUT = 5 * 60
+LATEST_MISSIONS = 6
+
+COUNTERS = ("total_volunteers", "total_missions", "total_hours")
+
+
+def get_version():
+    return cache.get_or_set(VERSION_KEY, 1, timeout=None)
+
+
+def bump_version():
+    """Invalide l'instantané en cache"""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, timeout=None)
+
+
+def rebuild_stats():
+    """Recalcule entièrement les compteurs (initialisation ou correction de dérive)"""
+    stats, _ = SiteStats.objects.update_or_create(
+        pk=1,
+        defaults={
+            "total_volunteers": Volunteer.objects.count(),
+            "total_missions": Mission.objects.filter(status="PUBLISHED").count(),
+            "total_hours": Volunteer.objects.aggregate(total=Sum("total_hours"))["total"] or 0,
+        },
+    )
+    bump_version()
+    return stats
+
+
+def get_stats():
+    try:
+        return SiteStats.objects.get(pk=1)
+    except SiteStats.DoesNotExist:
+        return rebuild_stats()
+
+
+_state = threading.local()
+
+
+@contextmanager
+def deferred():
+    """Suspend les mises à jour incrémentales (écritures en masse) puis recalcule"""
+    _state.deferred = True
+    try:
+        yield
+    finally:
+        _state.deferred = False
+        rebuild_stats()
+
+
+def increment(**deltas):
+    """Applique des deltas aux compteurs, ex. ``increment(total_volunteers=1)``"""
+    if getattr(_state, "deferred", False):
+        return
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    updated = SiteStats.objects.filter(pk=1).update(
+        **{name: F(name) + delta for name, delta in deltas.items()}, updated_at=timezone.now()
+    )
+    if not updated:
+        # Première écriture : la ligne est construite à partir de l'état courant
+        rebuild_stats()
+        return
+    bump_version()
+
+
+def build_snapshot():
+    """Corps JSON de la page d'accueil, son ETag et sa date de génération"""
+    stats = get_stats()
+    latest_missions = Mission.objects.filter(
+        status="PUBLISHED", date__gte=timezone.now().date()
+    ).select_related("organization")[:LATEST_MISSIONS]
+
+    payload = {name: getattr(stats, name) for name in COUNTERS}
+    payload["latest_missions"] = fast_serializers.serialize(MissionListSerializer, latest_missions)
+    body = JSONRenderer().render(payload)
+    return {
+        "body": body,
+        "etag": f'"{hashlib.md5(body).hexdigest()}"',
+        "last_modified": int(time.time()),
+    }
+
+
+def _snapshot_key(version):
+    return f"homepage:v{version}:{timezone.now().date().isoformat()}"
+
+
+def get_snapshot():
+    """Instantané en cache ; la date fait partie de la clé (missions passées)"""
+    key = _snapshot_key(get_version())
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_snapshot()
+        cache.set(key, snapshot, CACHE_TIMEOUT)
+    return snapshot
+
+
+async def aget_snapshot():
+    """``get_snapshot`` pour les vues asynchrones : construit dans un thread si absent"""
+    version = await cache.aget_or_set(VERSION_KEY, 1, timeout=None)
+    snapshot = await cache.aget(_snapshot_key(version))
+    if snapshot is None:
+        snapshot = await sync_to_async(get_snapshot)()
+    return snapshot
+
+
+def snapshot_response(request, snapshot):
+    """Réponse (ou 304) avec ETag, Last-Modified et Cache-Control public"""
+    response = get_conditional_response(
+        request, etag=snapshot["etag"], last_modified=snapshot["last_modified"]
+    )
+    if response is None:
+        response = HttpResponse(snapshot["body"], content_type="application/json")
+    response["ETag"] = snapshot["etag"]
+    response["Last-Modified"] = http_date(snapshot["last_modified"])
+    patch_cache_control(response, public=True, max_age=60)
+    return response
@@ -0,0 +1,15 @@
+"""
+Écrit en base les vues de missions en attente dans le tampon
+"""
+
+from django.core.management.base import BaseCommand
+
+from missions.view_counter import get_view_counter
+
+
+class Command(BaseCommand):
+    help = "Écrit en base les vues de missions en attente (à planifier avec le backend 'cache')"
+
+    def handle(self, *args, **kwargs):
+        flushed = get_view_counter().flush()
+        self.stdout.write(self.style.SUCCESS(f"✅ {flushed} vues écrites en base"))
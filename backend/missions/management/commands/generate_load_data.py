@@ -0,0 +1,427 @@
+"""
+Génère un jeu de données volumineux et reproductible pour les tests de charge
+
+Exemple (≈ 1,2 million de lignes) :
+    python manage.py generate_load_data --volunteers 100000 --organizations 2000 \\
+        --missions-per-wilaya 345 --applications 1000000 --participations 150000 \\
+        --requirements 20000
+
+Toutes les lignes sont insérées par ``bulk_create`` en lots ; le même ``--seed``
+produit les mêmes données. Les comptes générés ont un email en ``@load.dz`` et
+le même mot de passe (``--password``) ; ``--reset`` les supprime d'abord, par
+``DELETE`` en lots sans signaux. Dans les deux cas, les compteurs, index et
+caches que les signaux auraient tenus sont recalculés une fois à la fin.
+"""
+
+import random
+import time
+from datetime import date, timedelta
+from datetime import time as clock
+from decimal import Decimal
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.admin.models import LogEntry
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from accounts.models import Organization, User, Volunteer
+from missions import eligibility, facets, homepage, matching, org_stats, ratings, search, services
+from missions.geo import encode_geohash
+from missions.models import (
+    Application,
+    Mission,
+    MissionSearchTerm,
+    MissionSkillRequirement,
+    Participation,
+    Report,
+    Review,
+)
+from odd.models import ODD
+from skills.models import Skill, VolunteerSkill
+
+EMAIL_DOMAIN = "load.dz"
+
+# Emprise approximative du nord de l'Algérie (coordonnées des missions)
+LATITUDES = (34.0, 36.9)
+LONGITUDES = (-1.8, 8.6)
+
+APPLICATION_STATUSES = (("PENDING", 40), ("ACCEPTED", 35), ("REJECTED", 20), ("CANCELLED", 5))
+MISSION_STATUSES = (("PUBLISHED", 70), ("COMPLETED", 15), ("DRAFT", 10), ("CANCELLED", 5))
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def unique_pairs(rng, count, left, right):
+    """``count`` couples (i, j) distincts tirés dans ``range(left) x range(right)``"""
+    for key in rng.sample(range(left * right), min(count, left * right)):
+        yield divmod(key, right)
+
+
+class Command(BaseCommand):
+    help = "Génère des données de charge (bénévoles, missions, candidatures...) par bulk_create"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--volunteers", type=int, default=1000)
+        parser.add_argument("--organizations", type=int, default=50)
+        parser.add_argument("--missions-per-wilaya", type=int, default=5)
+        parser.add_argument("--applications", type=int, default=10000)
+        parser.add_argument(
+            "--participations",
+            type=int,
+            default=2000,
+            help="Candidatures acceptées au plus, chacune avec sa participation",
+        )
+        parser.add_argument(
+            "--skills", type=int, default=2000, help="Compétences de bénévoles (VolunteerSkill)"
+        )
+        parser.add_argument(
+            "--requirements",
+            type=int,
+            default=500,
+            help="Compétences requises par les missions (MissionSkillRequirement)",
+        )
+        parser.add_argument("--reviews", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--password", default="loadtest123")
+        parser.add_argument(
+            "--reset", action="store_true", help=f"Supprime d'abord les comptes @{EMAIL_DOMAIN}"
+        )
+        parser.add_argument(
+            "--skip-search-index",
+            action="store_true",
+            help="Ne pas indexer les missions pour la recherche plein texte",
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.today = date.today()
+        started = time.perf_counter()
+
+        existing = User.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}")
+        if options["reset"]:
+            deleted = self.delete_generated(existing)
+            self.stdout.write(f"{deleted} lignes supprimées")
+        elif existing.exists():
+            raise CommandError(f"Des comptes @{EMAIL_DOMAIN} existent déjà : utiliser --reset")
+
+        if not ODD.objects.exists() or not Skill.objects.exists():
+            call_command("init_data", stdout=self.stdout)
+        self.odd_ids = list(ODD.objects.values_list("pk", flat=True))
+        self.skill_ids = list(Skill.objects.values_list("pk", flat=True))
+        self.password = make_password(options["password"])
+
+        volunteer_ids = self.create_volunteers(options["volunteers"])
+        organization_ids = self.create_organizations(options["organizations"])
+        missions = self.create_missions(organization_ids, options["missions_per_wilaya"])
+        self.create_skill_requirements(missions, options["requirements"])
+        accepted = self.create_applications(
+            missions, volunteer_ids, options["applications"], options["participations"]
+        )
+        participations = self.create_participations(missions, accepted)
+        self.create_volunteer_skills(volunteer_ids, options["skills"])
+        self.create_reviews(participations, missions, options["reviews"])
+
+        self.refresh_derived_data(missions, participations, options["skip_search_index"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"✅ Données de charge générées en {elapsed:.1f}s"))
+
+    # ----- Suppression -----
+
+    def delete_generated(self, users):
+        """
+        Supprime les comptes générés et tout ce qui en dépend par ``DELETE`` en
+        lots, enfants d'abord : ``QuerySet.delete()`` relirait chaque ligne pour
+        envoyer ses signaux (notes, statistiques, index), des heures au million
+        de lignes. Les données dérivées sont recalculées en fin de commande.
+        """
+        volunteers = Volunteer.objects.filter(user__in=users).values("pk")
+        organizations = Organization.objects.filter(user__in=users).values("pk")
+        missions = Mission.objects.filter(organization__in=organizations).values("pk")
+
+        VolunteerSkill.objects.filter(validated_by__in=users).update(validated_by=None)
+        Report.objects.filter(resolved_by__in=users).update(resolved_by=None)
+        steps = (
+            Review.objects.filter(
+                Q(volunteer__in=volunteers)
+                | Q(organization__in=organizations)
+                | Q(mission__in=missions)
+            ),
+            Report.objects.filter(
+                Q(reporter__in=users) | Q(reported_user__in=users) | Q(mission__in=missions)
+            ),
+            Participation.objects.filter(Q(volunteer__in=volunteers) | Q(mission__in=missions)),
+            Application.objects.filter(Q(volunteer__in=volunteers) | Q(mission__in=missions)),
+            VolunteerSkill.objects.filter(volunteer__in=volunteers),
+            MissionSkillRequirement.objects.filter(mission__in=missions),
+            MissionSearchTerm.objects.filter(mission__in=missions),
+            Mission.objects.filter(organization__in=organizations),
+            Volunteer.objects.filter(user__in=users),
+            Organization.objects.filter(user__in=users),
+            User.groups.through.objects.filter(user__in=users),
+            User.user_permissions.through.objects.filter(user__in=users),
+            LogEntry.objects.filter(user__in=users),
+            users,
+        )
+        return sum(self.delete_batches(queryset) for queryset in steps)
+
+    def delete_batches(self, queryset):
+        """``DELETE`` par lots de ``--batch-size`` ids, sans collecte ni signaux"""
+        model = queryset.model
+        total = 0
+        while ids := list(queryset.values_list("pk", flat=True)[: self.batch_size]):
+            total += model.objects.filter(pk__in=ids)._raw_delete(queryset.db)
+        return total
+
+    # ----- Insertion -----
+
+    def insert_batches(self, model, objects, label):
+        """bulk_create par lots ; produit chaque lot créé (avec pk) sans garder les précédents"""
+        started = time.perf_counter()
+        total = 0
+        for batch in chunked(objects, self.batch_size):
+            created = model.objects.bulk_create(batch, batch_size=self.batch_size)
+            total += len(created)
+            yield created
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"  {total:>9} {label} ({elapsed:.1f}s)")
+
+    def insert(self, model, objects, label):
+        """bulk_create par lots ; renvoie les objets créés (avec pk)"""
+        return [obj for batch in self.insert_batches(model, objects, label) for obj in batch]
+
+    def create_users(self, prefix, count, user_type):
+        users = (
+            User(
+                email=f"{prefix}{i}@{EMAIL_DOMAIN}",
+                password=self.password,
+                first_name=prefix.capitalize(),
+                last_name=str(i),
+                user_type=user_type,
+            )
+            for i in range(count)
+        )
+        return [user.pk for user in self.insert(User, users, f"utilisateurs ({prefix})")]
+
+    def create_volunteers(self, count):
+        user_ids = self.create_users("benevole", count, "VOLUNTEER")
+        wilayas = [code for code, _ in settings.WILAYAS]
+        volunteers = (
+            Volunteer(
+                user_id=user_id,
+                wilaya=self.rng.choice(wilayas),
+                date_of_birth=date(1970, 1, 1) + timedelta(days=self.rng.randrange(14000)),
+                gender=self.rng.choice("MF"),
+                preferred_radius=self.rng.choice((10, 25, 50, 100)),
+            )
+            for user_id in user_ids
+        )
+        return [v.pk for v in self.insert(Volunteer, volunteers, "bénévoles")]
+
+    def create_organizations(self, count):
+        user_ids = self.create_users("organisation", count, "ORGANIZATION")
+        wilayas = [code for code, _ in settings.WILAYAS]
+        organizations = (
+            Organization(
+                user_id=user_id,
+                name=f"Association de charge {i}",
+                organization_type=self.rng.choice(
+                    [code for code, _ in Organization.ORG_TYPE_CHOICES]
+                ),
+                email=f"contact{i}@{EMAIL_DOMAIN}",
+                phone="0555000000",
+                wilaya=self.rng.choice(wilayas),
+                address=f"{i} rue de la Charge",
+                representative_name=f"Responsable {i}",
+                representative_position="Président",
+                representative_email=f"responsable{i}@{EMAIL_DOMAIN}",
+                description="Association générée pour les tests de charge. " * 12,
+                is_verified=self.rng.random() < 0.8,
+            )
+            for i, user_id in enumerate(user_ids)
+        )
+        return [o.pk for o in self.insert(Organization, organizations, "organisations")]
+
+    def weighted(self, choices):
+        values, weights = zip(*choices, strict=True)
+        return self.rng.choices(values, weights)[0]
+
+    def create_missions(self, organization_ids, per_wilaya):
+        causes = [code for code, _ in Mission.CAUSE_CHOICES]
+
+        def missions():
+            for code, name in settings.WILAYAS:
+                for i in range(per_wilaya):
+                    latitude = Decimal(str(round(self.rng.uniform(*LATITUDES), 6)))
+                    longitude = Decimal(str(round(self.rng.uniform(*LONGITUDES), 6)))
+                    start = self.rng.randrange(7, 18)
+                    yield Mission(
+                        organization_id=self.rng.choice(organization_ids),
+                        title=f"Mission {name} {i}",
+                        short_description=f"Mission de bénévolat à {name}",
+                        full_description=f"Mission générée pour les tests de charge à {name}.",
+                        mission_type=self.rng.choice(("ONE_TIME", "RECURRING")),
+                        odd_id=self.rng.choice(self.odd_ids),
+                        causes=self.rng.sample(causes, self.rng.randint(1, 3)),
+                        date=self.today + timedelta(days=self.rng.randint(-60, 90)),
+                        start_time=clock(start),
+                        end_time=clock(start + self.rng.randint(2, 5)),
+                        wilaya=code,
+                        commune=name,
+                        full_address=f"Centre-ville, {name}",
+                        meeting_point="Devant la mairie",
+                        latitude=latitude,
+                        longitude=longitude,
+                        geohash=encode_geohash(latitude, longitude),
+                        required_volunteers=self.rng.randint(5, 50),
+                        status=self.weighted(MISSION_STATUSES),
+                    )
+
+        return self.insert(Mission, missions(), "missions")
+
+    def create_skill_requirements(self, missions, count):
+        """Compétences requises ; la moitié de celles à vérifier l'exigent vraiment"""
+        verified = set(
+            Skill.objects.filter(requires_verification=True).values_list("pk", flat=True)
+        )
+        requirements = (
+            MissionSkillRequirement(
+                mission_id=missions[m].pk,
+                skill_id=self.skill_ids[s],
+                verification_required=self.skill_ids[s] in verified and self.rng.random() < 0.5,
+            )
+            for m, s in unique_pairs(self.rng, count, len(missions), len(self.skill_ids))
+        )
+        self.insert(MissionSkillRequirement, requirements, "compétences requises")
+
+    def create_applications(self, missions, volunteer_ids, count, max_accepted):
+        """
+        Candidatures insérées en flux ; renvoie les seules acceptées, chacune
+        recevant une participation (au plus ``max_accepted``)
+        """
+        accepted_per_mission = [0] * len(missions)
+
+        def applications():
+            total_accepted = 0
+            for m, v in unique_pairs(self.rng, count, len(missions), len(volunteer_ids)):
+                status = self.weighted(APPLICATION_STATUSES)
+                if status == "ACCEPTED":
+                    # Jamais plus d'acceptés que de places ni que de participations
+                    full = accepted_per_mission[m] >= missions[m].required_volunteers
+                    if full or total_accepted >= max_accepted:
+                        status = "REJECTED"
+                    else:
+                        accepted_per_mission[m] += 1
+                        total_accepted += 1
+                yield Application(
+                    mission_id=missions[m].pk, volunteer_id=volunteer_ids[v], status=status
+                )
+
+        accepted = []
+        for batch in self.insert_batches(Application, applications(), "candidatures"):
+            accepted += [a for a in batch if a.status == "ACCEPTED"]
+        return accepted
+
+    def create_participations(self, missions, accepted):
+        past = {m.pk for m in missions if m.date < self.today}
+
+        def participations():
+            for application in accepted:
+                validated = application.mission_id in past and self.rng.random() < 0.8
+                present = validated and self.rng.random() < 0.9
+                yield Participation(
+                    mission_id=application.mission_id,
+                    volunteer_id=application.volunteer_id,
+                    application_id=application.pk,
+                    hours_validated=validated,
+                    was_present=present,
+                    hours_completed=Decimal(self.rng.randint(2, 6)) if present else 0,
+                    organization_rating=self.rng.randint(3, 5) if validated else None,
+                )
+
+        return self.insert(Participation, participations(), "participations")
+
+    def create_volunteer_skills(self, volunteer_ids, count):
+        verified = set(
+            Skill.objects.filter(requires_verification=True).values_list("pk", flat=True)
+        )
+        skills = (
+            VolunteerSkill(
+                volunteer_id=volunteer_ids[v],
+                skill_id=self.skill_ids[s],
+                status=(
+                    self.rng.choice(("PENDING", "VALIDATED"))
+                    if self.skill_ids[s] in verified
+                    else "VALIDATED"
+                ),
+            )
+            for v, s in unique_pairs(self.rng, count, len(volunteer_ids), len(self.skill_ids))
+        )
+        self.insert(VolunteerSkill, skills, "compétences de bénévoles")
+
+    def create_reviews(self, participations, missions, count):
+        organization_of = {m.pk: m.organization_id for m in missions}
+        sample = self.rng.sample(participations, min(count, len(participations)))
+        reviews = (
+            Review(
+                volunteer_id=p.volunteer_id,
+                organization_id=organization_of[p.mission_id],
+                mission_id=p.mission_id,
+                rating=self.rng.randint(1, 5),
+                comment="Avis généré pour les tests de charge",
+            )
+            for p in sample
+        )
+        self.insert(Review, reviews, "avis")
+
+    # ----- Données dérivées -----
+
+    def refresh_derived_data(self, missions, participations, skip_search_index):
+        """Compteurs et index que les signaux auraient maintenus"""
+        started = time.perf_counter()
+        mission_ids = [m.pk for m in missions]
+        for batch in chunked(mission_ids, self.batch_size):
+            counts = (
+                Application.objects.filter(mission=OuterRef("pk"))
+                .order_by()
+                .values("mission")
+                .annotate(total=Count("pk"))
+                .values("total")
+            )
+            # Places prises : participations effectivement créées
+            accepted = (
+                Participation.objects.filter(mission=OuterRef("pk"))
+                .order_by()
+                .values("mission")
+                .annotate(total=Count("pk"))
+                .values("total")
+            )
+            Mission.objects.filter(pk__in=batch).update(
+                application_count=Coalesce(Subquery(counts), 0),
+                accepted_volunteers=Coalesce(Subquery(accepted), 0),
+            )
+
+        validated = {p.volunteer_id for p in participations if p.hours_validated}
+        for batch in chunked(sorted(validated), self.batch_size):
+            services.recompute_volunteer_stats(batch)
+            ratings.volunteers.rebuild(batch)
+
+        if not skip_search_index:
+            search.rebuild_index(Mission.objects.filter(pk__in=mission_ids))
+        homepage.rebuild_stats()
+        org_stats.rebuild({m.organization_id for m in missions})
+        facets.bump_version()
+        eligibility.requirements_changed()
+        matching.missions.invalidate()
+        matching.volunteers.invalidate()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"  compteurs et index recalculés ({elapsed:.1f}s)")
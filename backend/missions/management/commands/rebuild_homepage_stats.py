@@ -0,0 +1,20 @@
+"""
+Recalcule les compteurs de la page d'accueil
+"""
+
+from django.core.management.base import BaseCommand
+
+from missions import homepage
+
+
+class Command(BaseCommand):
+    help = "Recalcule les compteurs de la page d'accueil (après import ou mise à jour en masse)"
+
+    def handle(self, *args, **kwargs):
+        stats = homepage.rebuild_stats()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ {stats.total_volunteers} bénévoles, {stats.total_missions} missions publiées, "
+                f"{stats.total_hours} heures"
+            )
+        )
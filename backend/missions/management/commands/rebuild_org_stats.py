@@ -0,0 +1,23 @@
+"""
+Recalcule les statistiques des organisations
+"""
+
+from django.core.management.base import BaseCommand
+
+from missions import org_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcule missions, bénévoles et note moyenne des organisations "
+        "(après import, modification depuis l'admin ou dérive)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--organization", type=int, action="append", help="Id d'organisation (répétable)"
+        )
+
+    def handle(self, *args, **options):
+        count = org_stats.rebuild(options["organization"])
+        self.stdout.write(self.style.SUCCESS(f"✅ {count} organisations recalculées"))
@@ -0,0 +1,19 @@
+"""
+Reconstruit l'index de recherche plein texte des missions
+"""
+
+from django.core.management.base import BaseCommand
+
+from missions.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Reconstruit l'index de recherche plein texte des missions"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        self.stdout.write("Reconstruction de l'index de recherche...")
+        count = rebuild_index(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✅ {count} missions indexées"))
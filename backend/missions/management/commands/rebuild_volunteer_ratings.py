@@ -0,0 +1,29 @@
+"""
+Recalcule la note moyenne des bénévoles
+"""
+
+from django.core.management.base import BaseCommand
+
+from accounts.models import Volunteer
+from missions import matching, ratings
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcule somme, nombre et moyenne des notes des bénévoles depuis leurs "
+        "participations validées (après import, modification depuis l'admin ou dérive)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--volunteer", type=int, action="append", help="Id de bénévole (répétable)"
+        )
+
+    def handle(self, *args, **options):
+        volunteer_ids = options["volunteer"]
+        count = ratings.volunteers.rebuild(volunteer_ids)
+        # UPDATE ensembliste, sans signal : la note fait partie de l'index de matching
+        if volunteer_ids is None:
+            volunteer_ids = Volunteer.objects.values_list("pk", flat=True)
+        matching.volunteers.changed(*volunteer_ids)
+        self.stdout.write(self.style.SUCCESS(f"✅ {count} bénévoles recalculés"))
@@ -0,0 +1,833 @@
+"""
+Moteur de recommandation bénévole -> missions, et mission -> bénévoles
+
+Chaque mission ouverte (publiée, publique, à venir) est encodée en une ligne de
+tableaux NumPy : compétences requises et compétences à vérification obligatoire
+(ensembles de bits indexés par id de compétence), causes (un bit par cause),
+créneau (jour x période), ODD et position. Un bénévole est encodé de la même
+façon (compétences déclarées et validées, centres d'intérêt, disponibilités,
+ODD des missions auxquelles il a déjà postulé, position et rayon) ; toutes les
+missions sont notées en une passe vectorisée, puis les meilleures sont lues en
+base pour vérifier les places restantes et les sérialiser.
+
+L'index est gardé en mémoire par worker et mis à jour par mission : les signaux
+(missions/signals.py) notent l'id modifié localement et, après le commit,
+l'ajoutent au journal partagé du cache (``matching:missions:seq`` +
+``matching:missions:change:<n>``). Les autres workers lisent le journal au plus
+toutes les ``CHECK_INTERVAL`` secondes et ne relisent que ces missions ; un
+journal incomplet (cache vidé, entrées expirées) ou trop long déclenche une
+reconstruction complète, comme le changement de jour ou un index plus vieux que
+``MAX_AGE`` secondes (filet de sécurité contre une entrée perdue).
+
+Le journal n'est vu par les autres workers que si le cache est partagé
+(``CACHE_URL``, voir dzvolunteer/settings.py) : sans lui, gunicorn.conf.py
+refuse de démarrer plus d'un worker.
+
+Les compteurs de places (``accepted_volunteers``) sont mis à jour par
+``update()`` sans signal : ils ne font pas partie de l'index et sont vérifiés
+à la lecture des missions retenues.
+
+Dans l'autre sens, les bénévoles actifs au profil public forment un second
+index (compétences déclarées et validées, centres d'intérêt, disponibilités,
+position et rayon, note moyenne, badge) tenu à jour de la même façon
+(``matching:volunteers:...``) : une organisation obtient les meilleurs profils
+pour une mission en une passe vectorisée et une sélection partielle.
+"""
+
+import dataclasses
+import datetime
+import math
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from accounts.models import Volunteer
+from skills.models import VolunteerSkill
+
+from .geo import EARTH_RADIUS_KM
+from .models import Application, Mission, MissionSkillRequirement
+
+DEFAULTS = {
+    "CHECK_INTERVAL": 5,  # secondes entre deux lectures du journal partagé
+    "MAX_CHANGES": 500,  # au-delà : reconstruction complète
+    "CHANGE_TIMEOUT": 60 * 60,  # durée de vie d'une entrée du journal
+    "MAX_AGE": 10 * 60,  # secondes : au-delà, reconstruction complète
+    "LIMIT": 20,
+    "MAX_LIMIT": 50,
+    "WEIGHTS": {
+        "skills": 3.0,
+        "causes": 2.0,
+        "availability": 1.5,
+        "distance": 3.0,
+        "odd": 1.0,
+    },
+    # Classement des bénévoles pour une mission (espace organisation)
+    "CANDIDATE_WEIGHTS": {
+        "skills": 3.0,
+        "distance": 3.0,
+        "availability": 2.0,
+        "rating": 1.5,
+        "badge": 1.0,
+        "causes": 1.0,
+    },
+}
+
+CAUSES = [code for code, _ in Mission.CAUSE_CHOICES]
+CAUSE_DTYPE = np.uint32  # un bit par cause
+assert len(CAUSES) <= np.iinfo(CAUSE_DTYPE).bits, "trop de causes pour CAUSE_DTYPE"
+DAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+PERIODS = ["morning", "afternoon", "evening"]
+PERIOD_BOUNDS = [(0, 12), (12, 18), (18, 24)]  # heures [début, fin)
+
+BADGES = [code for code, _ in Volunteer.BADGE_CHOICES]
+
+# Champs de Mission encodés dans l'index
+MATCHED_FIELDS = {
+    "status",
+    "is_public",
+    "date",
+    "start_time",
+    "end_time",
+    "causes",
+    "odd",
+    "wilaya",
+    "latitude",
+    "longitude",
+}
+
+
+def get_config():
+    config = {**DEFAULTS, **getattr(settings, "MATCHING", {})}
+    config["WEIGHTS"] = {**DEFAULTS["WEIGHTS"], **config["WEIGHTS"]}
+    config["CANDIDATE_WEIGHTS"] = {**DEFAULTS["CANDIDATE_WEIGHTS"], **config["CANDIDATE_WEIGHTS"]}
+    return config
+
+
+# ----- Encodage -----
+
+
+def skill_bits(skill_ids):
+    """Ensemble de compétences -> entier (bit n = compétence d'id n)"""
+    bits = 0
+    for skill_id in skill_ids:
+        bits |= 1 << skill_id
+    return bits
+
+
+def cause_bits(causes):
+    return sum(1 << CAUSES.index(cause) for cause in set(causes or ()) if cause in CAUSES)
+
+
+def availability_bits(availability):
+    """``{"monday": ["morning", "evening"], ...}`` -> 21 bits (jour x période)"""
+    bits = 0
+    if not isinstance(availability, dict):
+        return bits
+    for day, periods in availability.items():
+        if day not in DAYS or not isinstance(periods, list):
+            continue
+        for period in periods:
+            if period in PERIODS:
+                bits |= 1 << (DAYS.index(day) * len(PERIODS) + PERIODS.index(period))
+    return bits
+
+
+def slot_bits(date, start_time, end_time):
+    """Créneau d'une mission : jour de la semaine et périodes couvertes"""
+    start = start_time.hour + start_time.minute / 60
+    end = end_time.hour + end_time.minute / 60 if end_time > start_time else 24
+    day = date.weekday() * len(PERIODS)
+    return sum(
+        1 << (day + index)
+        for index, (low, high) in enumerate(PERIOD_BOUNDS)
+        if start < high and end > low
+    )
+
+
+def pack(bits, width):
+    """Entier -> ligne d'octets (petit-boutiste) de ``width`` octets"""
+    return np.frombuffer(bits.to_bytes(width, "little"), dtype=np.uint8)
+
+
+def pack_rows(values, width):
+    if not values:
+        return np.zeros((0, width), dtype=np.uint8)
+    data = b"".join(bits.to_bytes(width, "little") for bits in values)
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(values), width)
+
+
+def width_for(values):
+    return max((max(bits.bit_length() for bits in values) + 7) // 8 if values else 0, 1)
+
+
+def popcount(matrix):
+    """Nombre de bits à 1 par ligne"""
+    return np.bitwise_count(matrix).sum(axis=-1, dtype=np.int32)
+
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """Distances (km) d'un point à un tableau de points, en degrés ; NaN si inconnu"""
+    lat1, lng1 = math.radians(latitude), math.radians(longitude)
+    lat2, lng2 = np.radians(latitudes), np.radians(longitudes)
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _coordinate(value):
+    return float(value) if value is not None else math.nan
+
+
+def _wilaya(value):
+    return int(value) if value and value.isdigit() else 0
+
+
+# ----- Index -----
+
+
+class Features:
+    """
+    Colonnes alignées d'un index (une ligne par objet, ``ids`` en tête)
+
+    Les sous-classes sont des dataclasses ; ``bitsets`` nomme les colonnes
+    d'ensembles de compétences (matrices ``(n, largeur)`` d'octets).
+    """
+
+    bitsets = ()
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def width(self):
+        return getattr(self, self.bitsets[0]).shape[1]
+
+    def widen(self, width):
+        """Copie aux ensembles de compétences élargis à ``width`` octets"""
+        if width <= self.width:
+            return self
+        padding = ((0, 0), (0, width - self.width))
+        return dataclasses.replace(
+            self, **{name: np.pad(getattr(self, name), padding) for name in self.bitsets}
+        )
+
+    def replace(self, removed_ids, added):
+        """Nouvelles colonnes : lignes de ``removed_ids`` retirées, ``added`` ajoutées"""
+        width = max(self.width, added.width)
+        base, added = self.widen(width), added.widen(width)
+        keep = ~np.isin(base.ids, list(removed_ids))
+        return type(self)(
+            **{
+                name: np.concatenate([getattr(base, name)[keep], getattr(added, name)])
+                for name in (field.name for field in dataclasses.fields(self))
+            }
+        )
+
+
+@dataclasses.dataclass
+class _IndexState:
+    seq: int
+    day: datetime.date
+    features: Features
+    built_at: float  # time.monotonic() de la dernière reconstruction complète
+
+
+class FeatureIndex:
+    """
+    Index en mémoire mis à jour objet par objet via le journal partagé
+
+    Les sous-classes définissent ``name`` et ``load(today, ids=None, width=1)``
+    (tous les objets indexables, ou seulement ``ids``).
+    """
+
+    name = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.seq_key = f"matching:{cls.name}:seq"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = None
+        self._pending = set()
+        self._checked_at = 0.0
+
+    def load(self, today, ids=None, width=1):
+        raise NotImplementedError
+
+    # ----- Journal partagé -----
+
+    @classmethod
+    def change_key(cls, seq):
+        return f"matching:{cls.name}:change:{seq}"
+
+    def get_seq(self):
+        seq = cache.get(self.seq_key)
+        if seq is None:
+            cache.add(self.seq_key, 0, timeout=None)
+            seq = cache.get(self.seq_key, 0)
+        return seq
+
+    def changed(self, *ids):
+        """Après une écriture : relecture locale immédiate, entrée du journal au commit"""
+        self._pending.update(ids)
+        transaction.on_commit(lambda: self.publish(ids))
+
+    def publish(self, ids):
+        try:
+            seq = cache.incr(self.seq_key)
+        except ValueError:
+            cache.add(self.seq_key, 0, timeout=None)
+            seq = cache.incr(self.seq_key)
+        cache.set(self.change_key(seq), list(ids), timeout=get_config()["CHANGE_TIMEOUT"])
+
+    def reset(self):
+        """Reconstruction complète à la prochaine lecture (tests, commande)"""
+        self._state = None
+
+    def invalidate(self):
+        """
+        Reconstruction complète dans tous les workers (écritures en masse sans
+        signaux) : le numéro avance sans entrée de journal, qui paraît incomplet
+        """
+        try:
+            cache.incr(self.seq_key)
+        except ValueError:
+            cache.add(self.seq_key, 0, timeout=None)
+        self.reset()
+
+    # ----- État local -----
+
+    def _changes(self, state, seq):
+        """Ids modifiés depuis ``state.seq`` ou None si le journal est incomplet"""
+        if seq < state.seq or seq - state.seq > get_config()["MAX_CHANGES"]:
+            return None
+        keys = [self.change_key(n) for n in range(state.seq + 1, seq + 1)]
+        found = cache.get_many(keys) if keys else {}
+        if len(found) < len(keys):
+            return None
+        return {pk for ids in found.values() for pk in ids}
+
+    def _current(self):
+        state, now = self._state, time.monotonic()
+        config = get_config()
+        fresh = now - self._checked_at < config["CHECK_INTERVAL"]
+        today = timezone.now().date()
+        if state is not None and state.day == today and fresh and not self._pending:
+            return state
+        seq = self.get_seq()
+        with self._lock:
+            state = self._state
+            pending, self._pending = self._pending, set()
+            changes = None
+            if (
+                state is not None
+                and state.day == today
+                and now - state.built_at < config["MAX_AGE"]
+            ):
+                changes = self._changes(state, seq)
+            if changes is None:
+                state = _IndexState(seq, today, self.load(today), now)
+            elif changes or pending:
+                ids = changes | pending
+                added = self.load(today, ids, width=state.features.width)
+                state = _IndexState(seq, today, state.features.replace(ids, added), state.built_at)
+            else:
+                state = _IndexState(seq, today, state.features, state.built_at)
+            self._state = state
+        self._checked_at = now
+        return state
+
+    @property
+    def features(self):
+        return self._current().features
+
+    def warm(self):
+        """Construit l'index hors requête (démarrage du worker, tests)"""
+        self._current()
+
+
+# ----- Missions -----
+
+
+@dataclasses.dataclass
+class MissionFeatures(Features):
+    """Une ligne par mission ouverte"""
+
+    ids: np.ndarray
+    required: np.ndarray  # (n, largeur) uint8 : compétences requises
+    verified: np.ndarray  # (n, largeur) uint8 : dont vérification obligatoire
+    required_count: np.ndarray
+    causes: np.ndarray
+    cause_count: np.ndarray
+    slots: np.ndarray
+    odds: np.ndarray
+    wilayas: np.ndarray
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    dates: np.ndarray  # ordinal (date.toordinal())
+
+    bitsets = ("required", "verified")
+
+    @classmethod
+    def build(cls, missions, requirements, width=1):
+        """``missions`` : dicts de ``values()`` ; ``requirements`` : {id: [(skill, vérif.)]}"""
+        required = [skill_bits(s for s, _ in requirements.get(m["id"], ())) for m in missions]
+        verified = [skill_bits(s for s, v in requirements.get(m["id"], ()) if v) for m in missions]
+        width = max(width, width_for(required))
+        causes = np.array([cause_bits(m["causes"]) for m in missions], dtype=CAUSE_DTYPE)
+        required = pack_rows(required, width)
+        return cls(
+            ids=np.array([m["id"] for m in missions], dtype=np.int64),
+            required=required,
+            verified=pack_rows(verified, width),
+            required_count=popcount(required),
+            causes=causes,
+            cause_count=np.bitwise_count(causes).astype(np.int32),
+            slots=np.array(
+                [slot_bits(m["date"], m["start_time"], m["end_time"]) for m in missions],
+                dtype=np.uint32,
+            ),
+            odds=np.array([m["odd_id"] for m in missions], dtype=np.int64),
+            wilayas=np.array([_wilaya(m["wilaya"]) for m in missions], dtype=np.int16),
+            latitudes=np.array([_coordinate(m["latitude"]) for m in missions], dtype=np.float64),
+            longitudes=np.array([_coordinate(m["longitude"]) for m in missions], dtype=np.float64),
+            dates=np.array([m["date"].toordinal() for m in missions], dtype=np.int32),
+        )
+
+
+MISSION_COLUMNS = (
+    "id",
+    "causes",
+    "date",
+    "start_time",
+    "end_time",
+    "odd_id",
+    "wilaya",
+    "latitude",
+    "longitude",
+)
+
+
+def open_missions(today):
+    return Mission.objects.filter(status="PUBLISHED", is_public=True, date__gte=today)
+
+
+def load_features(today, mission_ids=None, width=1):
+    """Encode les missions ouvertes (toutes, ou seulement ``mission_ids``) ; 2 requêtes"""
+    queryset = open_missions(today)
+    if mission_ids is not None:
+        queryset = queryset.filter(pk__in=mission_ids)
+    missions = list(queryset.order_by("id").values(*MISSION_COLUMNS))
+
+    # Sous-requête plutôt qu'une liste de milliers d'ids pour l'index complet
+    rows = MissionSkillRequirement.objects.filter(mission__in=queryset.values("pk")).values_list(
+        "mission_id", "skill_id", "verification_required"
+    )
+    requirements = {}
+    for mission_id, skill_id, verification_required in rows:
+        requirements.setdefault(mission_id, []).append((skill_id, verification_required))
+    return MissionFeatures.build(missions, requirements, width)
+
+
+class MissionIndex(FeatureIndex):
+    """Caractéristiques des missions ouvertes, mises à jour mission par mission"""
+
+    name = "missions"
+
+    def load(self, today, ids=None, width=1):
+        return load_features(today, ids, width=width)
+
+
+missions = MissionIndex()
+
+
+# ----- Bénévoles -----
+
+
+@dataclasses.dataclass
+class VolunteerFeatures(Features):
+    """Une ligne par bénévole actif au profil public"""
+
+    ids: np.ndarray
+    skills: np.ndarray  # (n, largeur) uint8 : compétences déclarées (sauf refusées)
+    validated: np.ndarray  # (n, largeur) uint8 : compétences validées
+    causes: np.ndarray
+    slots: np.ndarray
+    wilayas: np.ndarray
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    radii: np.ndarray
+    ratings: np.ndarray
+    completed: np.ndarray
+    badges: np.ndarray  # rang dans Volunteer.BADGE_CHOICES
+
+    bitsets = ("skills", "validated")
+
+    @classmethod
+    def build(cls, volunteers, skills, width=1):
+        """``volunteers`` : dicts de ``values()`` ; ``skills`` : {id: [(skill, statut)]}"""
+        declared = [skill_bits(s for s, _ in skills.get(v["id"], ())) for v in volunteers]
+        validated = [
+            skill_bits(s for s, status in skills.get(v["id"], ()) if status == "VALIDATED")
+            for v in volunteers
+        ]
+        width = max(width, width_for(declared))
+        return cls(
+            ids=np.array([v["id"] for v in volunteers], dtype=np.int64),
+            skills=pack_rows(declared, width),
+            validated=pack_rows(validated, width),
+            causes=np.array([cause_bits(v["interests"]) for v in volunteers], dtype=CAUSE_DTYPE),
+            slots=np.array(
+                [availability_bits(v["availability"]) for v in volunteers], dtype=np.uint32
+            ),
+            wilayas=np.array([_wilaya(v["wilaya"]) for v in volunteers], dtype=np.int16),
+            latitudes=np.array([_coordinate(v["latitude"]) for v in volunteers], dtype=np.float64),
+            longitudes=np.array(
+                [_coordinate(v["longitude"]) for v in volunteers], dtype=np.float64
+            ),
+            radii=np.array(
+                [max(v["preferred_radius"] or 0, 1) for v in volunteers], dtype=np.float64
+            ),
+            ratings=np.array([float(v["average_rating"] or 0) for v in volunteers]),
+            completed=np.array([v["completed_missions"] for v in volunteers], dtype=np.int32),
+            badges=np.array(
+                [
+                    BADGES.index(v["badge_level"]) if v["badge_level"] in BADGES else 0
+                    for v in volunteers
+                ],
+                dtype=np.int8,
+            ),
+        )
+
+
+VOLUNTEER_COLUMNS = (
+    "id",
+    "interests",
+    "availability",
+    "wilaya",
+    "latitude",
+    "longitude",
+    "preferred_radius",
+    "average_rating",
+    "completed_missions",
+    "badge_level",
+)
+
+# Champs de Volunteer encodés dans l'index
+VOLUNTEER_FIELDS = set(VOLUNTEER_COLUMNS) - {"id"} | {"profile_visibility"}
+
+
+def listed_volunteers():
+    return Volunteer.objects.filter(user__is_active=True, profile_visibility="PUBLIC")
+
+
+def load_volunteer_features(volunteer_ids=None, width=1):
+    """Encode les bénévoles classables (tous, ou seulement ``volunteer_ids``) ; 2 requêtes"""
+    queryset = listed_volunteers()
+    if volunteer_ids is not None:
+        queryset = queryset.filter(pk__in=volunteer_ids)
+    volunteers = list(queryset.order_by("id").values(*VOLUNTEER_COLUMNS))
+
+    rows = (
+        VolunteerSkill.objects.filter(volunteer__in=queryset.values("pk"))
+        .exclude(status="REJECTED")
+        .values_list("volunteer_id", "skill_id", "status")
+    )
+    skills = {}
+    for volunteer_id, skill_id, skill_status in rows:
+        skills.setdefault(volunteer_id, []).append((skill_id, skill_status))
+    return VolunteerFeatures.build(volunteers, skills, width)
+
+
+class VolunteerIndex(FeatureIndex):
+    """Caractéristiques des bénévoles classables, mises à jour bénévole par bénévole"""
+
+    name = "volunteers"
+
+    def load(self, today, ids=None, width=1):
+        return load_volunteer_features(ids, width=width)
+
+
+volunteers = VolunteerIndex()
+
+
+# ----- Bénévole -----
+
+
+@dataclasses.dataclass
+class VolunteerProfile:
+    """Caractéristiques d'un bénévole dans le même encodage que les missions"""
+
+    skills: int  # compétences déclarées (tout statut sauf refusé)
+    validated: int  # compétences validées
+    causes: int
+    slots: int
+    odds: set
+    applied: set
+    wilaya: int
+    latitude: float
+    longitude: float
+    radius: float
+
+    @classmethod
+    def for_volunteer(cls, volunteer):
+        """Deux requêtes : compétences, candidatures (mission et ODD)"""
+        skills = list(volunteer.skills.exclude(status="REJECTED").values_list("skill_id", "status"))
+        applications = list(volunteer.applications.values_list("mission_id", "mission__odd_id"))
+        return cls(
+            skills=skill_bits(skill_id for skill_id, _ in skills),
+            validated=skill_bits(skill_id for skill_id, status in skills if status == "VALIDATED"),
+            causes=cause_bits(volunteer.interests),
+            slots=availability_bits(volunteer.availability),
+            odds={odd_id for _, odd_id in applications},
+            applied={mission_id for mission_id, _ in applications},
+            wilaya=_wilaya(volunteer.wilaya),
+            latitude=_coordinate(volunteer.latitude),
+            longitude=_coordinate(volunteer.longitude),
+            radius=float(max(volunteer.preferred_radius or 0, 1)),
+        )
+
+
+def score_missions(features, profile, today, weights=None):
+    """
+    Score (0 à 1) de chaque mission pour un bénévole, et distances en km
+
+    Les missions passées, déjà demandées ou dont une compétence à vérification
+    obligatoire n'est pas validée reçoivent ``-inf``. Une composante sans
+    information côté bénévole (aucun centre d'intérêt, aucune disponibilité)
+    vaut 0,5 pour toutes les missions.
+    """
+    weights = weights or get_config()["WEIGHTS"]
+    width = features.width
+    skills = pack(profile.skills & ((1 << width * 8) - 1), width)
+    validated = pack(profile.validated & ((1 << width * 8) - 1), width)
+
+    # Compétences : part des compétences requises déclarées
+    overlap = popcount(features.required & skills)
+    skill_score = np.where(
+        features.required_count > 0, overlap / np.maximum(features.required_count, 1), 0.5
+    )
+
+    # Causes : part des causes de la mission parmi les centres d'intérêt
+    if profile.causes:
+        shared = np.bitwise_count(features.causes & CAUSE_DTYPE(profile.causes))
+        cause_score = shared / np.maximum(features.cause_count, 1)
+    else:
+        cause_score = np.full(len(features), 0.5)
+
+    # Disponibilités : le créneau de la mission recoupe-t-il une disponibilité ?
+    if profile.slots:
+        availability_score = ((features.slots & np.uint32(profile.slots)) != 0).astype(float)
+    else:
+        availability_score = np.full(len(features), 0.5)
+
+    # Distance : décroissance linéaire jusqu'au rayon préféré ; sans position, la wilaya
+    same_wilaya = (features.wilayas == profile.wilaya) & (profile.wilaya > 0)
+    if math.isnan(profile.latitude) or math.isnan(profile.longitude):
+        distances = np.full(len(features), np.nan)
+        distance_score = same_wilaya.astype(float)
+    else:
+        distances = haversine_km(
+            profile.latitude, profile.longitude, features.latitudes, features.longitudes
+        )
+        distance_score = np.where(
+            np.isnan(distances),
+            same_wilaya.astype(float),
+            np.clip(1 - distances / profile.radius, 0, 1),
+        )
+
+    odd_score = np.isin(features.odds, list(profile.odds)).astype(float)
+
+    total = sum(weights.values()) or 1.0
+    scores = (
+        weights["skills"] * skill_score
+        + weights["causes"] * cause_score
+        + weights["availability"] * availability_score
+        + weights["distance"] * distance_score
+        + weights["odd"] * odd_score
+    ) / total
+
+    eligible = ~np.any(features.verified & ~validated, axis=1)
+    eligible &= features.dates >= today.toordinal()
+    if profile.applied:
+        eligible &= ~np.isin(features.ids, list(profile.applied))
+    return np.where(eligible, scores, -np.inf), distances
+
+
+def top_k(scores, k, tiebreak=None):
+    """Indices des ``k`` meilleurs scores finis, du meilleur au moins bon"""
+    candidates = np.flatnonzero(np.isfinite(scores))
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+    keys = (
+        (-scores[candidates],) if tiebreak is None else (tiebreak[candidates], -scores[candidates])
+    )
+    return candidates[np.lexsort(keys)]
+
+
+def recommend(volunteer, limit=None):
+    """
+    Missions recommandées pour un bénévole, de la mieux notée à la moins bien notée
+
+    Chaque mission porte ``match_score`` et ``distance_km`` (None sans position).
+    Les candidates sont relues en base (organisation, places restantes) ; celles
+    devenues complètes entre-temps sont écartées.
+    """
+    config = get_config()
+    limit = limit or config["LIMIT"]
+    today = timezone.now().date()
+    features = missions.features
+    profile = VolunteerProfile.for_volunteer(volunteer)
+
+    scores, distances = score_missions(features, profile, today, config["WEIGHTS"])
+    # Marge pour les missions complètes ; à score égal, la plus proche dans le temps
+    order = top_k(scores, limit * 2 + 10, tiebreak=features.dates)
+    candidates = {int(features.ids[i]): i for i in order}
+
+    by_id = {
+        mission.pk: mission
+        for mission in open_missions(today)
+        .filter(pk__in=list(candidates), accepted_volunteers__lt=F("required_volunteers"))
+        .select_related("organization")
+    }
+    results = []
+    for mission_id, index in candidates.items():
+        mission = by_id.get(mission_id)
+        if mission is None:
+            continue
+        mission.match_score = round(float(scores[index]), 3)
+        distance = float(distances[index])
+        mission.distance_km = None if math.isnan(distance) else distance
+        results.append(mission)
+        if len(results) == limit:
+            break
+    return results
+
+
+# ----- Bénévoles pour une mission -----
+
+
+def mission_profile(mission):
+    """Ligne d'index d'une mission quelconque (brouillon compris) ; 1 requête"""
+    requirements = {
+        mission.pk: list(
+            mission.skill_requirements.values_list("skill_id", "verification_required")
+        )
+    }
+    row = {column: getattr(mission, column) for column in MISSION_COLUMNS}
+    return MissionFeatures.build([row], requirements)
+
+
+def score_volunteers(features, mission, weights=None):
+    """
+    Score (0 à 1) de chaque bénévole pour une mission, et distances en km
+
+    ``mission`` est une ligne de :class:`MissionFeatures`. Les bénévoles auxquels
+    manque une compétence à vérification obligatoire validée reçoivent ``-inf``.
+    Une composante sans information (aucune compétence requise, aucune
+    disponibilité, bénévole sans mission terminée) vaut 0,5.
+    """
+    weights = weights or get_config()["CANDIDATE_WEIGHTS"]
+    width = max(features.width, mission.width)
+    features, mission = features.widen(width), mission.widen(width)
+    required, verified = mission.required[0], mission.verified[0]
+    required_count = int(mission.required_count[0])
+    slot, causes = int(mission.slots[0]), int(mission.causes[0])
+    latitude, longitude = float(mission.latitudes[0]), float(mission.longitudes[0])
+    wilaya = int(mission.wilayas[0])
+
+    # Compétences : part des compétences requises déclarées
+    if required_count:
+        skill_score = popcount(features.skills & required) / required_count
+    else:
+        skill_score = np.full(len(features), 0.5)
+
+    # Causes : part des causes de la mission parmi les centres d'intérêt
+    if causes:
+        shared = np.bitwise_count(features.causes & CAUSE_DTYPE(causes))
+        cause_score = np.where(features.causes > 0, shared / int(mission.cause_count[0]), 0.5)
+    else:
+        cause_score = np.full(len(features), 0.5)
+
+    # Disponibilités : le créneau de la mission recoupe-t-il une disponibilité ?
+    availability_score = np.where(
+        features.slots > 0, ((features.slots & np.uint32(slot)) != 0).astype(float), 0.5
+    )
+
+    # Distance : décroissance linéaire jusqu'au rayon préféré de chaque bénévole
+    same_wilaya = ((features.wilayas == wilaya) & (wilaya > 0)).astype(float)
+    if math.isnan(latitude) or math.isnan(longitude):
+        distances = np.full(len(features), np.nan)
+        distance_score = same_wilaya
+    else:
+        distances = haversine_km(latitude, longitude, features.latitudes, features.longitudes)
+        distance_score = np.where(
+            np.isnan(distances), same_wilaya, np.clip(1 - distances / features.radii, 0, 1)
+        )
+
+    # Réputation : note moyenne (si au moins une mission terminée) et badge
+    rating_score = np.where(features.completed > 0, features.ratings / 5, 0.5)
+    badge_score = features.badges / max(len(BADGES) - 1, 1)
+
+    total = sum(weights.values()) or 1.0
+    scores = (
+        weights["skills"] * skill_score
+        + weights["causes"] * cause_score
+        + weights["availability"] * availability_score
+        + weights["distance"] * distance_score
+        + weights["rating"] * rating_score
+        + weights["badge"] * badge_score
+    ) / total
+
+    eligible = ~np.any(verified & ~features.validated, axis=1)
+    return np.where(eligible, scores, -np.inf), distances
+
+
+def rank_volunteers(mission, limit=None):
+    """
+    Bénévoles les mieux adaptés à une mission, du mieux noté au moins bien noté
+
+    Les bénévoles ayant déjà postulé sont écartés. Chaque bénévole porte
+    ``match_score`` et ``distance_km`` (None sans position) ; les retenus sont
+    relus en base, ceux devenus privés ou inactifs entre-temps sont écartés.
+    """
+    config = get_config()
+    limit = limit or config["LIMIT"]
+    features = volunteers.features
+    profile = mission_profile(mission)
+
+    scores, distances = score_volunteers(features, profile, config["CANDIDATE_WEIGHTS"])
+    applied = list(
+        Application.objects.filter(mission=mission).values_list("volunteer_id", flat=True)
+    )
+    if applied:
+        scores[np.isin(features.ids, applied)] = -np.inf
+    # À score égal, le bénévole le plus expérimenté
+    order = top_k(scores, limit + 10, tiebreak=-features.completed)
+    candidates = {int(features.ids[i]): i for i in order}
+
+    by_id = {
+        volunteer.pk: volunteer
+        for volunteer in listed_volunteers().filter(pk__in=list(candidates)).select_related("user")
+    }
+    results = []
+    for volunteer_id, index in candidates.items():
+        volunteer = by_id.get(volunteer_id)
+        if volunteer is None:
+            continue
+        volunteer.match_score = round(float(scores[index]), 3)
+        distance = float(distances[index])
+        volunteer.distance_km = None if math.isnan(distance) else distance
+        results.append(volunteer)
+        if len(results) == limit:
+            break
+    return results
@@ -0,0 +1,70 @@
+"""
+Jauges métier exposées par /metrics
+
+Calculées par quelques requêtes groupées puis servies depuis le cache pendant
+``GAUGE_TTL`` secondes : un scrape ne déclenche pas de ``COUNT(*)`` à chaque fois.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from dzvolunteer.metrics import format_labels
+from skills.models import VolunteerSkill
+
+from .models import Application, Mission, Report
+
+CACHE_KEY = "metrics:business_gauges"
+GAUGE_TTL = 60
+
+OPEN_REPORT_STATUSES = ("PENDING", "REVIEWED")
+
+
+def compute_snapshot():
+    by_status = dict(Mission.objects.order_by().values_list("status").annotate(count=Count("pk")))
+    return {
+        "computed_at": time.time(),
+        "pending_applications": Application.objects.filter(status="PENDING").count(),
+        "pending_skill_validations": VolunteerSkill.objects.filter(status="PENDING").count(),
+        "open_reports": Report.objects.filter(status__in=OPEN_REPORT_STATUSES).count(),
+        "missions_by_status": {code: by_status.get(code, 0) for code, _ in Mission.STATUS_CHOICES},
+    }
+
+
+def get_snapshot():
+    snapshot = cache.get(CACHE_KEY)
+    if snapshot is None:
+        snapshot = compute_snapshot()
+        cache.set(CACHE_KEY, snapshot, GAUGE_TTL)
+    return snapshot
+
+
+def business_gauges():
+    """Jauges au format ``{nom: (aide, [(labels, valeur), ...])}``"""
+    snapshot = get_snapshot()
+    return {
+        "dzvolunteer_pending_applications": (
+            "Candidatures en attente de réponse",
+            [("", snapshot["pending_applications"])],
+        ),
+        "dzvolunteer_pending_skill_validations": (
+            "Compétences en attente de validation admin",
+            [("", snapshot["pending_skill_validations"])],
+        ),
+        "dzvolunteer_open_reports": (
+            "Signalements non traités",
+            [("", snapshot["open_reports"])],
+        ),
+        "dzvolunteer_missions": (
+            "Missions par statut",
+            [
+                (format_labels(status=code), count)
+                for code, count in snapshot["missions_by_status"].items()
+            ],
+        ),
+        "dzvolunteer_business_snapshot_age_seconds": (
+            "Âge de l'instantané des jauges métier",
+            [("", round(time.time() - snapshot["computed_at"], 3))],
+        ),
+    }
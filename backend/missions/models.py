@@ -9,6 +9,8 @@ from accounts.models import Organization, Volunteer
 from odd.models import ODD
 from skills.models import Skill
 
+from .geo import encode_geohash
+
 
 class Mission(models.Model):
     """
@@ -71,6 +73,8 @@ class Mission(models.Model):
     meeting_point = models.TextField(verbose_name="Point de rencontre")
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    # Index spatial (geohash de latitude/longitude, voir missions.geo)
+    geohash = models.CharField(max_length=12, blank=True, db_index=True, editable=False)
 
     # Accessibilité
     accessible_by_car = models.BooleanField(default=False, verbose_name="Accessible en voiture")
@@ -138,11 +142,30 @@ class Mission(models.Model):
         indexes = [
             models.Index(fields=["status", "date"]),
             models.Index(fields=["wilaya", "status"]),
+            # Pagination par clé du catalogue (tri par défaut + départage)
+            models.Index(fields=["status", "-created_at", "-id"]),
         ]
 
     def __str__(self):
         return f"{self.title} - {self.organization.name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Statut chargé : permet de détecter une publication dans post_save
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = encode_geohash(self.latitude, self.longitude)
+        else:
+            self.geohash = ""
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geohash"}
+        super().save(*args, **kwargs)
+
     def get_remaining_places(self):
         return self.required_volunteers - self.accepted_volunteers
 
@@ -178,6 +201,24 @@ class MissionSkillRequirement(models.Model):
         return f"{self.mission.title} - {self.skill.name} {req}"
 
 
+class MissionSearchTerm(models.Model):
+    """
+    Entrée de l'index inversé de recherche : terme normalisé -> mission (voir missions.search)
+    """
+
+    mission = models.ForeignKey(Mission, on_delete=models.CASCADE, related_name="search_terms")
+    term = models.CharField(max_length=50, db_index=True, verbose_name="Terme")
+    weight = models.PositiveSmallIntegerField(default=1, verbose_name="Poids")
+
+    class Meta:
+        verbose_name = "Terme de recherche"
+        verbose_name_plural = "Termes de recherche"
+        unique_together = ["term", "mission"]
+
+    def __str__(self):
+        return f"{self.term} -> {self.mission_id} ({self.weight})"
+
+
 class Application(models.Model):
     """
     Candidature d'un bénévole pour une mission
@@ -213,6 +254,9 @@ class Application(models.Model):
         ordering = ["-applied_at"]
         indexes = [
             models.Index(fields=["status", "applied_at"]),
+            # Pagination par clé des listes de candidatures
+            models.Index(fields=["volunteer", "-applied_at", "-id"]),
+            models.Index(fields=["mission", "-applied_at", "-id"]),
         ]
 
     def __str__(self):
@@ -269,6 +313,16 @@ class Participation(models.Model):
         unique_together = ["mission", "volunteer"]
         ordering = ["-created_at"]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Note comptée à la lecture : permet de mettre à jour la moyenne du bénévole dans post_save
+        if instance.__dict__.get("hours_validated"):
+            instance._loaded_rating = instance.__dict__.get("organization_rating")
+        else:
+            instance._loaded_rating = None
+        return instance
+
     def __str__(self):
         return f"{self.volunteer.user.get_full_name()} - {self.mission.title}"
 
@@ -300,6 +354,13 @@ class Review(models.Model):
         verbose_name_plural = "Avis"
         ordering = ["-created_at"]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Note chargée : permet de mettre à jour la moyenne de l'organisation dans post_save
+        instance._loaded_rating = instance.__dict__.get("rating")
+        return instance
+
     def __str__(self):
         return f"{self.volunteer.user.get_full_name()} - {self.organization.name} ({self.rating}★)"
 
@@ -363,3 +424,24 @@ class Report(models.Model):
 
     def __str__(self):
         return f"Signalement {self.report_type} - {self.status}"
+
+
+class SiteStats(models.Model):
+    """
+    Compteurs globaux de la page d'accueil (ligne unique, pk=1)
+
+    Maintenus de façon incrémentale par les chemins d'écriture (inscription,
+    publication, validation des heures) ; voir missions/homepage.py.
+    """
+
+    total_volunteers = models.PositiveIntegerField(default=0)
+    total_missions = models.PositiveIntegerField(default=0, verbose_name="Missions publiées")
+    total_hours = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Statistiques du site"
+        verbose_name_plural = "Statistiques du site"
+
+    def __str__(self):
+        return f"{self.total_volunteers} bénévoles, {self.total_missions} missions"
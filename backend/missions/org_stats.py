@@ -0,0 +1,184 @@
+"""
+Statistiques matérialisées des organisations
+
+``Organization.total_missions``, ``total_volunteers`` et ``average_rating`` sont
+mis à jour par des ``UPDATE ... SET x = x + n`` depuis les événements qui les
+modifient, comme les compteurs de la page d'accueil (voir homepage.py) :
+
+- ``total_missions`` : missions publiées, en cours ou passées (hors brouillons
+  et missions annulées) ; création, changement de statut, suppression
+  (signals.py) ;
+- ``total_volunteers`` : bénévoles distincts engagés sur les missions de
+  l'organisation, c'est-à-dire ayant une participation qui n'est pas une
+  absence validée ; acceptation, refus après acceptation, validation des
+  heures (services.py), autres suppressions de participations (signals.py) ;
+- ``average_rating`` : moyenne des notes des avis (``Review``), tenue par
+  l'agrégat courant ``rating_sum`` / ``rating_count`` de missions/ratings.py.
+
+Chaque mise à jour touche aussi ``updated_at`` : l'ETag du profil public et du
+détail des missions suit les statistiques. ``rebuild()`` (commande
+``rebuild_org_stats``) recalcule tout par requêtes ensemblistes après un
+import, une modification depuis l'admin ou une dérive.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from accounts.models import Organization
+
+from . import ratings
+from .models import Mission, Participation
+
+# Statuts comptés dans total_missions
+COUNTED_STATUSES = {"PUBLISHED", "ONGOING", "COMPLETED", "ARCHIVED"}
+
+# Participation qui compte dans total_volunteers : tout sauf une absence validée
+ENGAGED = ~Q(hours_validated=True, was_present=False)
+
+
+def increment(organization_id, **deltas):
+    """``UPDATE ... SET champ = champ + delta`` (deltas nuls ignorés)"""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    Organization.objects.filter(pk=organization_id).update(
+        **{field: F(field) + delta for field, delta in deltas.items()}, updated_at=timezone.now()
+    )
+
+
+# ----- Missions -----
+
+
+def mission_status_changed(organization_id, old_status, new_status):
+    """``old_status`` : None à la création ; ``new_status`` : None à la suppression"""
+    delta = (new_status in COUNTED_STATUSES) - (old_status in COUNTED_STATUSES)
+    increment(organization_id, total_missions=delta)
+
+
+# ----- Bénévoles -----
+
+
+class VolunteerTracker:
+    """
+    Participations à l'organisation des bénévoles touchés par une écriture
+
+    Lues une fois avant l'écriture ; le code appelant décrit ensuite ses
+    modifications (``created``, ``deleted``, ``validated``) et ``total_volunteers``
+    est ajusté de la différence entre bénévoles engagés avant et après, sans
+    relire la base.
+    """
+
+    def __init__(self, organization_id, volunteer_ids):
+        self.organization_id = organization_id
+        self.rows = {}
+        if volunteer_ids:
+            participations = (
+                Participation.objects.filter(
+                    mission__organization_id=organization_id, volunteer_id__in=volunteer_ids
+                )
+                .order_by()
+                .values_list(
+                    "pk", "volunteer_id", "application_id", "hours_validated", "was_present"
+                )
+            )
+            for pk, volunteer_id, application_id, hours_validated, was_present in participations:
+                self.rows[pk] = (volunteer_id, application_id, was_present or not hours_validated)
+        self.before = self.engaged()
+
+    def engaged(self):
+        return {volunteer_id for volunteer_id, _, engaged in self.rows.values() if engaged}
+
+    def created(self, volunteer_id):
+        """Nouvelle participation (acceptation)"""
+        self.rows[("new", len(self.rows))] = (volunteer_id, None, True)
+
+    def deleted(self, application_ids):
+        """Participations supprimées avec leur candidature (refus après acceptation)"""
+        application_ids = set(application_ids)
+        self.rows = {pk: row for pk, row in self.rows.items() if row[1] not in application_ids}
+
+    def validated(self, participations):
+        """Heures validées : une absence ne compte plus"""
+        for participation in participations:
+            volunteer_id, application_id, _ = self.rows[participation.pk]
+            self.rows[participation.pk] = (volunteer_id, application_id, participation.was_present)
+
+    def apply(self):
+        delta = len(self.engaged()) - len(self.before)
+        increment(self.organization_id, total_volunteers=delta)
+
+
+# Suppressions de participations déjà décrites au tracker du bloc en cours
+_tracking = ContextVar("org_stats_tracking", default=False)
+
+
+@contextmanager
+def tracking_volunteers(organization_id, volunteer_ids):
+    """``VolunteerTracker`` appliqué à la sortie du bloc (une requête, plus l'UPDATE)"""
+    tracker = VolunteerTracker(organization_id, set(volunteer_ids))
+    token = _tracking.set(True)
+    try:
+        yield tracker
+    finally:
+        _tracking.reset(token)
+    tracker.apply()
+
+
+def participation_deleted(participation):
+    """
+    Participation supprimée hors d'un ``tracking_volunteers`` (admin, suppression
+    en cascade d'une mission) : le bénévole n'est plus compté s'il n'a plus
+    d'autre participation engagée auprès de l'organisation
+    """
+    if _tracking.get() or not (participation.was_present or not participation.hours_validated):
+        return
+    # En cascade, la mission est supprimée après ses participations
+    organization_id = (
+        Mission.objects.filter(pk=participation.mission_id)
+        .values_list("organization_id", flat=True)
+        .first()
+    )
+    if organization_id is None:
+        return
+    engaged = Participation.objects.filter(
+        ENGAGED, volunteer_id=participation.volunteer_id, mission__organization_id=organization_id
+    )
+    if not engaged.exists():
+        increment(organization_id, total_volunteers=-1)
+
+
+# ----- Reconstruction -----
+
+
+def rebuild(organization_ids=None):
+    """
+    Recalcule les trois statistiques : un UPDATE à sous-requêtes corrélées pour
+    les compteurs, puis la reconstruction de l'agrégat des notes
+    """
+    missions = (
+        Mission.objects.filter(organization=OuterRef("pk"), status__in=COUNTED_STATUSES)
+        .order_by()
+        .values("organization")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    volunteers = (
+        Participation.objects.filter(ENGAGED, mission__organization=OuterRef("pk"))
+        .order_by()
+        .values("mission__organization")
+        .annotate(total=Count("volunteer", distinct=True))
+        .values("total")
+    )
+
+    queryset = Organization.objects.all()
+    if organization_ids is not None:
+        queryset = queryset.filter(pk__in=organization_ids)
+    queryset.update(
+        total_missions=Coalesce(Subquery(missions), 0),
+        total_volunteers=Coalesce(Subquery(volunteers), 0),
+    )
+    return ratings.organizations.rebuild(organization_ids)
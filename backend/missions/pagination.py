@@ -0,0 +1,228 @@
+"""
+Pagination par clé (keyset / curseur) pour les listes à défilement infini
+
+Le curseur encode les valeurs des colonnes de tri de la dernière ligne servie
+(avec ``id`` comme départage). La page suivante est lue avec une condition
+``(col1, id) > (v1, v)`` qui exploite les index, sans ``COUNT(*)`` ni ``OFFSET``
+croissant. Un total approximatif peut être demandé avec ``?with_count=true``.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def approximate_count(queryset, cap=10_000):
+    """
+    Nombre approximatif de lignes d'un queryset
+
+    Sur PostgreSQL, l'estimation du planificateur (EXPLAIN) ; ailleurs, un
+    comptage exact plafonné à ``cap``.
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    return queryset[:cap].count()
+
+
+def _encode_value(value):
+    if isinstance(value, datetime | date | time):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pagination « page suivante » sur l'ordre du queryset (+ ``id`` en départage)
+
+    L'ordre est celui produit par les filtres de la vue (``OrderingFilter``,
+    tri par pertinence ou par distance) ; les colonnes de tri doivent être non nulles.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 50
+    cursor_query_param = "cursor"
+    count_query_param = "with_count"
+    invalid_cursor_message = "Curseur invalide"
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    @staticmethod
+    def get_ordering(queryset):
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        if not all(isinstance(field, str) for field in ordering):
+            raise TypeError("KeysetPagination ne supporte que des tris par nom de champ")
+        if not any(field.lstrip("-") in ("pk", "id") for field in ordering):
+            descending = ordering[0].startswith("-") if ordering else False
+            ordering.append("-pk" if descending else "pk")
+        return ordering
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (binascii.Error, ValueError):
+            raise NotFound(self.invalid_cursor_message) from None
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    @staticmethod
+    def get_field(queryset, name):
+        """Champ (ou annotation) de tri ``name``, en suivant les relations ``a__b``"""
+        annotation = queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        opts = queryset.model._meta
+        parts = name.split("__")
+        for part in parts[:-1]:
+            opts = opts.get_field(part).related_model._meta
+        return opts.pk if parts[-1] == "pk" else opts.get_field(parts[-1])
+
+    def parse_cursor(self, queryset, values):
+        """Valeurs du curseur converties au type des colonnes de tri (non nulles)"""
+        parsed = []
+        for field, value in zip(self.ordering, values, strict=True):
+            try:
+                value = self.get_field(queryset, field.lstrip("-")).to_python(value)
+            except (ValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message) from None
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+            parsed.append(value)
+        return parsed
+
+    def encode_cursor(self, instance):
+        values = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            if isinstance(instance, dict):
+                # Ligne issue de values() (voir missions.fast_serializers)
+                value = instance[name]
+            else:
+                value = instance
+                for attr in name.split("__"):
+                    value = getattr(value, attr)
+            values.append(_encode_value(value))
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def keyset_condition(self, values):
+        """(f1, f2, ...) strictement après (v1, v2, ...) selon le sens de chaque colonne"""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, values, strict=True):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def _window(self, queryset, request):
+        """Queryset de la page demandée, plus une ligne pour savoir s'il y a une suite"""
+        self.request = request
+        self.ordering = self.get_ordering(queryset)
+        self.page_size_value = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        values = self.decode_cursor(request)
+        if values is not None:
+            queryset = queryset.filter(self.keyset_condition(self.parse_cursor(queryset, values)))
+        return queryset[: self.page_size_value + 1]
+
+    def _wants_count(self, request):
+        return request.query_params.get(self.count_query_param) == "true"
+
+    def _set_page(self, rows):
+        self.has_next = len(rows) > self.page_size_value
+        self.page = rows[: self.page_size_value]
+        return self.page
+
+    def paginate_queryset(self, queryset, request, view=None):
+        window = self._window(queryset, request)
+        self.count = approximate_count(queryset) if self._wants_count(request) else None
+        return self._set_page(list(window))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` pour les vues asynchrones (ORM asynchrone)"""
+        window = self._window(queryset, request)
+        self.count = None
+        if self._wants_count(request):
+            self.count = await sync_to_async(approximate_count)(queryset)
+        return self._set_page([row async for row in window])
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.count_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        payload = {"next": self.get_next_link(), "results": data}
+        if self.count is not None:
+            payload["approximate_count"] = self.count
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "approximate_count": {"type": "integer", "nullable": True},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Curseur de la page suivante",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Taille de page (max {self.max_page_size})",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "true pour obtenir un total approximatif",
+                "schema": {"type": "boolean"},
+            },
+        ]
@@ -0,0 +1,122 @@
+"""
+Notes moyennes maintenues par agrégats courants
+
+``Volunteer`` et ``Organization`` stockent, à côté de ``average_rating``, la
+somme (``rating_sum``) et le nombre (``rating_count``) des notes comptées :
+
+- bénévoles : ``Participation.organization_rating`` des participations aux
+  heures validées ;
+- organisations : ``Review.rating``.
+
+Une note posée, modifiée ou retirée devient un ``UPDATE ... SET rating_sum =
+rating_sum + ds, rating_count = rating_count + dn, average_rating = (rating_sum
++ ds) / (rating_count + dn)`` : coût constant, sans relire les notes ni dériver
+comme une moyenne mise à jour par pondération. ``rebuild()`` recalcule les trois
+champs depuis la source (commandes ``rebuild_org_stats`` et
+``rebuild_volunteer_ratings``) après un import, une suppression en masse ou une
+modification hors des chemins suivis.
+"""
+
+from collections import defaultdict
+
+from django.db.models import Count, DecimalField, F, FloatField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, Greatest
+from django.utils import timezone
+
+from accounts.models import Organization, Volunteer
+
+from .models import Participation, Review
+
+RATING_FIELD = DecimalField(max_digits=3, decimal_places=2)
+
+
+def average(total, count):
+    """Moyenne arrondie au centième ; 0 sans note (la somme est alors nulle)"""
+    return Cast(Cast(total, FloatField()) / Greatest(count, 1), RATING_FIELD)
+
+
+class RunningRating:
+    """
+    Agrégat courant des notes d'un modèle
+
+    ``source`` : modèle portant les notes, ``key`` : clé étrangère vers le modèle
+    noté, ``field`` : champ de la note, ``counted`` : notes prises en compte.
+    """
+
+    def __init__(self, model, source, key, field, counted=Q()):
+        self.model = model
+        self.source = source
+        self.key = key
+        self.field = field
+        self.counted = counted
+
+    def increments(self, delta_sum, delta_count):
+        total = F("rating_sum") + delta_sum
+        count = F("rating_count") + delta_count
+        return {"rating_sum": total, "rating_count": count, "average_rating": average(total, count)}
+
+    def apply(self, changes):
+        """
+        ``changes`` : (id, ancienne note, nouvelle note), None pour une note non
+        comptée. Un UPDATE par écart (somme, nombre) distinct, soit au plus
+        quelques-uns quel que soit le nombre de lignes.
+        """
+        deltas = defaultdict(lambda: [0, 0])
+        for pk, old_rating, new_rating in changes:
+            delta = deltas[pk]
+            delta[0] += (new_rating or 0) - (old_rating or 0)
+            delta[1] += (new_rating is not None) - (old_rating is not None)
+
+        groups = defaultdict(list)
+        for pk, (delta_sum, delta_count) in deltas.items():
+            if delta_sum or delta_count:
+                groups[delta_sum, delta_count].append(pk)
+
+        now = timezone.now()
+        for (delta_sum, delta_count), pks in groups.items():
+            self.model.objects.filter(pk__in=pks).update(
+                **self.increments(delta_sum, delta_count), updated_at=now
+            )
+        return [pk for pks in groups.values() for pk in pks]
+
+    def changed(self, pk, old_rating, new_rating):
+        """Une note posée (``old_rating`` None), modifiée ou retirée (``new_rating`` None)"""
+        return self.apply([(pk, old_rating, new_rating)])
+
+    def rebuild(self, pks=None):
+        """Recalcule somme, nombre et moyenne depuis les notes (deux UPDATE ensemblistes)"""
+        ratings = (
+            self.source.objects.filter(
+                self.counted, **{self.key: OuterRef("pk"), f"{self.field}__isnull": False}
+            )
+            .order_by()
+            .values(self.key)
+        )
+        queryset = self.model.objects.all()
+        if pks is not None:
+            queryset = queryset.filter(pk__in=pks)
+        count = queryset.update(
+            rating_sum=Coalesce(
+                Subquery(ratings.annotate(total=Sum(self.field)).values("total")), 0
+            ),
+            rating_count=Coalesce(Subquery(ratings.annotate(total=Count("pk")).values("total")), 0),
+        )
+        queryset.update(
+            average_rating=average(F("rating_sum"), F("rating_count")), updated_at=timezone.now()
+        )
+        return count
+
+
+volunteers = RunningRating(
+    Volunteer,
+    Participation,
+    "volunteer",
+    "organization_rating",
+    counted=Q(hours_validated=True),
+)
+organizations = RunningRating(Organization, Review, "organization", "rating")
+
+
+def counted_rating(participation):
+    """Note de la participation comptée dans la moyenne du bénévole, ou None"""
+    return participation.organization_rating if participation.hours_validated else None
@@ -0,0 +1,245 @@
+"""
+Données de référence en mémoire : catalogues des ODD et des compétences
+
+Ces tables changent quelques fois par an mais sont lues à chaque liste de
+missions. Chaque worker charge un catalogue complet une seule fois, le garde en
+mémoire et le sert par id, sans jointure ni requête. Les représentations
+sérialisées sont elles aussi calculées une fois par version.
+
+Cohérence entre workers : la version courante d'un catalogue est un jeton
+stocké dans le cache partagé (``reference:<nom>:version``). Les signaux
+``post_save``/``post_delete`` (missions/signals.py) marquent l'état local périmé
+tout de suite et publient un nouveau jeton après le commit ; les autres workers
+comparent leur jeton au cache au plus toutes les ``CHECK_INTERVAL`` secondes
+et rechargent s'il a changé. Un jeton aléatoire plutôt qu'un compteur : après
+un vidage du cache, aucun ETag déjà émis ne peut resservir. Le jeton n'est vu
+par tous les workers qu'avec un cache partagé (``CACHE_URL``) ; en filet de
+sécurité (jeton perdu, écriture sans signal), un catalogue plus vieux que
+``RELOAD_INTERVAL`` secondes est rechargé sans condition. L'ETag inclut une
+empreinte du contenu chargé : un rechargement qui change les lignes change
+l'ETag même sous le même jeton.
+
+Sous ASGI, aucune requête SQL n'est faite depuis la boucle d'événements : les
+vues asynchrones appellent ``awarm()`` (rechargement dans un thread) et, entre
+deux, l'état en mémoire est servi tel quel.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+
+from odd.models import ODD
+from skills.models import Skill
+
+from .conditional import fingerprint
+
+DEFAULTS = {
+    "CHECK_INTERVAL": 5,  # secondes entre deux lectures du jeton partagé
+    "MAX_AGE": 300,  # Cache-Control des endpoints de référence
+    "RELOAD_INTERVAL": 10 * 60,  # secondes : au-delà, rechargement sans condition
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "REFERENCE_DATA", {})}
+
+
+def _new_token():
+    return uuid.uuid4().hex[:12]
+
+
+def _in_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+@dataclass
+class _State:
+    version: str
+    rows: dict
+    digest: str  # empreinte du contenu chargé
+    loaded_at: float  # time.monotonic() du chargement
+    representations: dict = field(default_factory=dict)
+
+    def expired(self, now):
+        return now - self.loaded_at >= get_config()["RELOAD_INTERVAL"]
+
+
+class Catalogue:
+    """Toutes les lignes d'un modèle de référence, rechargées quand la version change"""
+
+    def __init__(self, name, model):
+        self.name = name
+        self.model = model
+        self.version_key = f"reference:{name}:version"
+        self._lock = threading.Lock()
+        self._state = None
+        self._stale = False
+        self._checked_at = 0.0
+
+    # ----- Version partagée -----
+
+    def get_version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            # add() : tous les workers retiennent le même jeton
+            cache.add(self.version_key, _new_token(), timeout=None)
+            version = cache.get(self.version_key)
+        return version
+
+    def invalidate(self):
+        """Après une écriture : rechargement local immédiat, nouveau jeton au commit"""
+        self._stale = True
+        transaction.on_commit(self.publish)
+
+    def publish(self):
+        cache.set(self.version_key, _new_token(), timeout=None)
+        self._stale = True
+
+    def reset(self):
+        """Force un rechargement à la prochaine lecture (tests)"""
+        self._stale = True
+
+    # ----- État local -----
+
+    def _load(self, version):
+        rows = {obj.pk: obj for obj in self.model.objects.all()}
+        fields = self.model._meta.concrete_fields
+        content = repr([[getattr(obj, f.attname) for f in fields] for obj in rows.values()])
+        digest = hashlib.sha1(content.encode(), usedforsecurity=False).hexdigest()[:8]
+        return _State(version, rows, digest, time.monotonic())
+
+    def _current(self):
+        state, now = self._state, time.monotonic()
+        fresh = now - self._checked_at < get_config()["CHECK_INTERVAL"]
+        if state is not None and not self._stale and fresh and not state.expired(now):
+            return state
+        if state is not None and _in_event_loop():
+            # Aucune requête SQL depuis la boucle : aensure() recharge avant chaque vue
+            return state
+        version = self.get_version()
+        with self._lock:
+            state = self._state
+            if (
+                self._stale
+                or state is None
+                or state.version != version
+                or state.expired(time.monotonic())
+            ):
+                self._stale = False
+                state = self._state = self._load(version)
+        self._checked_at = now
+        return state
+
+    async def aensure(self):
+        """Depuis une vue asynchrone : vérifie la version et recharge dans un thread"""
+        state, now = self._state, time.monotonic()
+        interval = get_config()["CHECK_INTERVAL"]
+        if state is None or self._stale or now - self._checked_at >= interval or state.expired(now):
+            await sync_to_async(self._current)()
+
+    @property
+    def version(self):
+        return self._current().version
+
+    def get(self, pk):
+        """
+        Instance par id, None si inconnu ; un id inconnu ne recharge pas le
+        catalogue (un id fantaisiste rechargerait à chaque requête) : une ligne
+        créée par un autre worker arrive avec le nouveau jeton publié par les signaux
+        """
+        return self._current().rows.get(pk)
+
+    def active(self):
+        """Lignes actives, dans l'ordre de ``Meta.ordering``"""
+        return [obj for obj in self._current().rows.values() if obj.is_active]
+
+    def representation(self, pk, serializer_class, fields=None, request=None):
+        """``serializer_class(obj).data`` mis en cache par version, ou None"""
+        state = self._current()
+        base = request.build_absolute_uri("/") if request is not None else None
+        key = (pk, serializer_class, fields, base)
+        data = state.representations.get(key)
+        if data is None:
+            obj = self.get(pk)
+            if obj is None:
+                return None
+            context = {"request": request} if request is not None else {}
+            # expand=() : ne pas relire ?fields=/?expand= de la liste englobante
+            data = dict(serializer_class(obj, fields=fields, expand=(), context=context).data)
+            self._current().representations[key] = data
+        return dict(data)
+
+    def etag(self, request):
+        """ETag fort : version et contenu du catalogue, URL complète et format négocié"""
+        state = self._current()
+        return f'"{self.name}-{state.version}-{state.digest}-{fingerprint(request)}"'
+
+
+odds = Catalogue("odd", ODD)
+skills = Catalogue("skill", Skill)
+
+CATALOGUES = {catalogue.name: catalogue for catalogue in (odds, skills)}
+
+
+def warm():
+    """Charge tous les catalogues (démarrage d'un worker, tests)"""
+    for catalogue in CATALOGUES.values():
+        catalogue._current()
+
+
+async def awarm():
+    for catalogue in CATALOGUES.values():
+        await catalogue.aensure()
+
+
+class ReferenceDataMixin:
+    """
+    Vues servies depuis un catalogue (à placer avant la vue générique DRF)
+
+    ``get_queryset()`` renvoie les lignes actives en mémoire ; la réponse porte
+    un ETag fort et un ``Cache-Control`` public, et un ``If-None-Match``
+    correspondant reçoit un 304 avant toute sérialisation. Pas de filtres ni de
+    tri à la demande : l'ordre est celui du modèle.
+    """
+
+    catalogue = None
+    filter_backends = ()
+
+    def get_queryset(self):
+        return self.catalogue.active()
+
+    def get_object(self):
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        obj = self.catalogue.get(lookup)
+        if obj is None or not obj.is_active:
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response["ETag"] = self.catalogue.etag(request)
+            patch_cache_control(response, public=True, max_age=get_config()["MAX_AGE"])
+            patch_vary_headers(response, ["Accept"])
+        return response
+
+    def get(self, request, *args, **kwargs):
+        not_modified = get_conditional_response(request, etag=self.catalogue.etag(request))
+        if not_modified is not None:
+            return not_modified
+        return super().get(request, *args, **kwargs)
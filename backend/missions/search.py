@@ -0,0 +1,212 @@
+"""
+Moteur de recherche plein texte du catalogue des missions
+
+Chaque mission possède un document de recherche pondéré (titre, descriptions,
+commune, nom de l'organisation) stocké sous forme d'index inversé dans
+``MissionSearchTerm``. L'analyse (pliage des accents, normalisation de l'arabe,
+racinisation légère français/arabe) est faite en Python : le même code sert à
+l'indexation et aux requêtes, quel que soit le moteur SQL (PostgreSQL ou SQLite).
+"""
+
+import re
+import unicodedata
+
+from django.db import transaction
+from django.db.models import IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+# Poids par champ (équivalent des classes A/B/C/D de PostgreSQL)
+FIELD_WEIGHTS = {
+    "title": 8,
+    "short_description": 4,
+    "organization_name": 4,
+    "commune": 2,
+    "full_description": 1,
+}
+
+# Champs de Mission dont la modification impose une réindexation
+INDEXED_FIELDS = {"title", "short_description", "full_description", "commune", "organization"}
+
+MAX_TERM_LENGTH = 50
+MIN_TERM_LENGTH = 2
+
+FRENCH_STOPWORDS = {
+    "au", "aux", "avec", "ce", "ces", "dans", "de", "des", "du", "elle", "en", "et",
+    "eux", "il", "je", "la", "le", "les", "leur", "lui", "ma", "mais", "me", "meme",
+    "mes", "moi", "mon", "ne", "nos", "notre", "nous", "on", "ou", "par", "pas",
+    "pour", "qu", "que", "qui", "sa", "se", "ses", "son", "sur", "ta", "te", "tes",
+    "toi", "ton", "tu", "un", "une", "vos", "votre", "vous", "est", "sont",
+}  # fmt: skip
+
+ARABIC_STOPWORDS = {
+    "في", "من", "علي", "الي", "عن", "مع", "هذا", "هذه", "ذلك", "التي", "الذي",
+    "او", "ثم", "كل", "بين", "هو", "هي", "ما", "لا", "قد",
+}  # fmt: skip
+
+ARABIC_PREFIXES = ("وال", "بال", "كال", "فال", "لل", "ال")
+ARABIC_SUFFIXES = ("ها", "ان", "ات", "ون", "ين", "يه", "ه", "ي")
+
+FRENCH_SUFFIXES = (
+    "issements", "issement", "atrices", "atrice", "ateurs", "ateur", "ations", "ation",
+    "atives", "ative", "atifs", "atif", "tions", "tion", "ements", "ement", "euses",
+    "euse", "ences", "ence", "ances", "ance", "iques", "ique", "istes", "iste", "ismes",
+    "isme", "ites", "ite", "ives", "ive", "ifs", "if", "eurs", "eur", "ages", "age",
+    "ales", "al", "er",
+)  # fmt: skip
+
+_ARABIC_RE = re.compile(r"[؀-ۿ]")
+_TOKEN_RE = re.compile(r"\w+")
+_ARABIC_FOLD = str.maketrans({"ى": "ي", "ة": "ه", "ـ": None})
+_LIGATURES = str.maketrans({"œ": "oe", "æ": "ae"})
+
+
+def fold(text):
+    """Minuscules, suppression des accents/harakat et normalisation des lettres arabes"""
+    text = unicodedata.normalize("NFKD", text.casefold().translate(_LIGATURES))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return text.translate(_ARABIC_FOLD)
+
+
+def stem_french(word):
+    """Racinisation légère du français (pluriels et suffixes dérivationnels)"""
+    if len(word) > 4 and word.endswith("aux"):
+        word = word[:-3] + "al"
+    elif len(word) > 3 and word[-1] in "sx" and not word.endswith("ss"):
+        word = word[:-1]
+
+    # Deux passes : « environnemental » -> « environnement » -> « environn »
+    for _ in range(2):
+        for suffix in FRENCH_SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                word = word[: -len(suffix)]
+                break
+        else:
+            break
+
+    if len(word) > 3 and word.endswith("e"):
+        word = word[:-1]
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "aeiouy":
+        word = word[:-1]
+    return word
+
+
+def stem_arabic(word):
+    """Racinisation légère de l'arabe (préfixes d'article et suffixes usuels)"""
+    for prefix in ARABIC_PREFIXES:
+        if word.startswith(prefix) and len(word) - len(prefix) >= 2:
+            word = word[len(prefix) :]
+            break
+    else:
+        if word.startswith("و") and len(word) > 3:
+            word = word[1:]
+
+    for suffix in ARABIC_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            word = word[: -len(suffix)]
+    return word
+
+
+def analyze(text):
+    """Découpe un texte en termes normalisés et racinisés"""
+    terms = []
+    for token in _TOKEN_RE.findall(fold(text or "")):
+        if token in FRENCH_STOPWORDS or token in ARABIC_STOPWORDS:
+            continue
+        stem = stem_arabic(token) if _ARABIC_RE.search(token) else stem_french(token)
+        if len(stem) >= MIN_TERM_LENGTH:
+            terms.append(stem[:MAX_TERM_LENGTH])
+    return terms
+
+
+def build_document(mission):
+    """Construit le document pondéré {terme: poids} d'une mission"""
+    sources = {
+        "title": mission.title,
+        "short_description": mission.short_description,
+        "organization_name": mission.organization.name,
+        "commune": mission.commune,
+        "full_description": mission.full_description,
+    }
+    document = {}
+    for field, text in sources.items():
+        for term in set(analyze(text)):
+            document[term] = document.get(term, 0) + FIELD_WEIGHTS[field]
+    return document
+
+
+def index_mission(mission):
+    """(Ré)indexe une mission"""
+    from .models import MissionSearchTerm
+
+    document = build_document(mission)
+    with transaction.atomic():
+        MissionSearchTerm.objects.filter(mission=mission).delete()
+        MissionSearchTerm.objects.bulk_create(
+            MissionSearchTerm(mission=mission, term=term, weight=weight)
+            for term, weight in document.items()
+        )
+
+
+def rebuild_index(queryset=None, batch_size=500):
+    """Reconstruit l'index pour toutes les missions (ou un sous-ensemble)"""
+    from .models import Mission, MissionSearchTerm
+
+    if queryset is None:
+        queryset = Mission.objects.all()
+    queryset = queryset.select_related("organization").order_by("pk")
+
+    count = 0
+    with transaction.atomic():
+        MissionSearchTerm.objects.filter(mission__in=queryset.values("pk")).delete()
+        batch = []
+        for mission in queryset.iterator(chunk_size=batch_size):
+            batch.extend(
+                MissionSearchTerm(mission=mission, term=term, weight=weight)
+                for term, weight in build_document(mission).items()
+            )
+            count += 1
+            if len(batch) >= batch_size:
+                MissionSearchTerm.objects.bulk_create(batch)
+                batch = []
+        MissionSearchTerm.objects.bulk_create(batch)
+    return count
+
+
+def _term_condition(term, prefix):
+    return Q(term__startswith=term) if prefix else Q(term=term)
+
+
+def search_missions(queryset, query, order_by_rank=True):
+    """
+    Filtre un queryset de missions sur une requête texte et annote ``search_rank``
+
+    Tous les termes doivent être présents (ET logique) ; le dernier terme est
+    recherché en préfixe pour la saisie au fil de l'eau.
+    """
+    from .models import MissionSearchTerm
+
+    terms = list(dict.fromkeys(analyze(query)))
+    if not terms:
+        return queryset
+
+    matched = Q()
+    for position, term in enumerate(terms):
+        condition = _term_condition(term, prefix=position == len(terms) - 1)
+        matched |= condition
+        queryset = queryset.filter(
+            pk__in=MissionSearchTerm.objects.filter(condition).values("mission_id")
+        )
+
+    rank = (
+        MissionSearchTerm.objects.filter(matched, mission=OuterRef("pk"))
+        .order_by()
+        .values("mission")
+        .annotate(total=Sum("weight"))
+        .values("total")
+    )
+    queryset = queryset.annotate(
+        search_rank=Coalesce(Subquery(rank, output_field=IntegerField()), 0)
+    )
+    if order_by_rank:
+        queryset = queryset.order_by("-search_rank", "-created_at", "-pk")
+    return queryset
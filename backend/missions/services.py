@@ -0,0 +1,385 @@
+"""
+Opérations métier transactionnelles sur les missions et candidatures
+
+La capacité d'une mission est réservée par un ``UPDATE`` conditionnel
+(``accepted_volunteers < required_volunteers``) exécuté dans la même transaction
+que le changement de statut et la création de la ``Participation`` : deux
+acceptations simultanées ne peuvent pas dépasser ``required_volunteers`` et les
+compteurs ne dérivent pas.
+"""
+
+from decimal import Decimal, InvalidOperation
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from accounts.models import Volunteer
+
+from . import eligibility, homepage, matching, org_stats, ratings
+from .models import Application, Mission, Participation
+
+
+class MissionError(Exception):
+    """Erreur métier renvoyée au client (message en français)"""
+
+
+class MissionFullError(MissionError):
+    pass
+
+
+def reserve_place(mission_id, count=1):
+    """Réserve ``count`` places si elles sont disponibles ; renvoie True si réservé"""
+    updated = Mission.objects.filter(
+        pk=mission_id, accepted_volunteers__lte=F("required_volunteers") - count
+    ).update(accepted_volunteers=F("accepted_volunteers") + count, updated_at=timezone.now())
+    return updated == 1
+
+
+def release_place(mission_id, count=1):
+    """Libère ``count`` places (sans descendre sous zéro)"""
+    Mission.objects.filter(pk=mission_id, accepted_volunteers__gte=count).update(
+        accepted_volunteers=F("accepted_volunteers") - count, updated_at=timezone.now()
+    )
+
+
+def submit_application(mission, volunteer, message=""):
+    """
+    Crée la candidature et incrémente ``application_count`` de façon atomique
+
+    Les compétences vérifiées requises sont contrôlées dans la même transaction,
+    depuis la base (voir missions.eligibility).
+    """
+    try:
+        with transaction.atomic():
+            if not eligibility.is_eligible(mission.pk, volunteer.pk):
+                raise MissionError("Vous ne possédez pas toutes les compétences vérifiées requises")
+            application = Application.objects.create(
+                mission=mission,
+                volunteer=volunteer,
+                message=message,
+                has_required_skills=True,
+            )
+            Mission.objects.filter(pk=mission.pk).update(
+                application_count=F("application_count") + 1, updated_at=timezone.now()
+            )
+    except IntegrityError:
+        # Double soumission concurrente : la contrainte unique a tranché
+        raise MissionError("Vous avez déjà postulé à cette mission") from None
+    return application
+
+
+def _lock_application(application):
+    """
+    Verrouille la mission puis la candidature, dans l'ordre de
+    ``respond_to_applications`` (sinon une réponse unitaire et un lot simultanés
+    sur la même mission s'interbloquent), et lit l'organisation au passage
+    """
+    organization_id = (
+        Mission.objects.select_for_update()
+        .values_list("organization_id", flat=True)
+        .get(pk=application.mission_id)
+    )
+    locked = Application.objects.select_for_update().get(pk=application.pk)
+    locked.organization_id = organization_id
+    return locked
+
+
+def accept_application(application, message=""):
+    """
+    Accepte une candidature : réserve une place, passe la candidature en ACCEPTED
+    et crée la participation, le tout dans une seule transaction
+    """
+    try:
+        with transaction.atomic():
+            locked = _lock_application(application)
+            if locked.status == "ACCEPTED":
+                raise MissionError("Candidature déjà acceptée")
+            if not reserve_place(locked.mission_id):
+                raise MissionFullError("Mission complète")
+
+            locked.status = "ACCEPTED"
+            locked.organization_message = message
+            locked.responded_at = timezone.now()
+            locked.save(update_fields=["status", "organization_message", "responded_at"])
+
+            with org_stats.tracking_volunteers(
+                locked.organization_id, [locked.volunteer_id]
+            ) as tracker:
+                Participation.objects.create(
+                    mission_id=locked.mission_id,
+                    volunteer_id=locked.volunteer_id,
+                    application=locked,
+                )
+                tracker.created(locked.volunteer_id)
+    except IntegrityError:
+        raise MissionError("Le bénévole participe déjà à cette mission") from None
+    return locked
+
+
+def reject_application(application, message=""):
+    """Refuse une candidature ; si elle était acceptée, libère la place et la participation"""
+    with transaction.atomic():
+        locked = _lock_application(application)
+        if locked.status == "ACCEPTED":
+            with org_stats.tracking_volunteers(
+                locked.organization_id, [locked.volunteer_id]
+            ) as tracker:
+                Participation.objects.filter(application=locked).delete()
+                tracker.deleted([locked.pk])
+            release_place(locked.mission_id)
+
+        locked.status = "REJECTED"
+        locked.organization_message = message
+        locked.responded_at = timezone.now()
+        locked.save(update_fields=["status", "organization_message", "responded_at"])
+    return locked
+
+
+MAX_BATCH_SIZE = 500
+
+
+def respond_to_applications(mission, decisions, default_message=""):
+    """
+    Accepte/refuse un lot de candidatures d'une mission en une transaction
+
+    ``decisions`` : liste de ``{"application_id", "action", "message"?}``. La
+    capacité restante est vérifiée pour tout le lot : les refus sont traités
+    d'abord, puis les acceptations dans l'ordre du lot. Renvoie un résultat par
+    élément et le nombre de places restantes.
+    """
+    if len(decisions) > MAX_BATCH_SIZE:
+        raise MissionError(f"Un lot ne peut pas dépasser {MAX_BATCH_SIZE} candidatures")
+    decisions = [{**decision, "application_id": _as_id(decision)} for decision in decisions]
+    now = timezone.now()
+    results = []
+
+    try:
+        with transaction.atomic():
+            remaining, outcome = _apply_decisions(mission, decisions, default_message, now)
+    except IntegrityError:
+        raise MissionError("Un des bénévoles participe déjà à cette mission") from None
+
+    for index, decision in enumerate(decisions):
+        result = outcome[index]
+        if isinstance(result, Application):
+            results.append({"application_id": result.pk, "status": result.status})
+        else:
+            results.append({"application_id": decision["application_id"], "error": result})
+    return results, remaining
+
+
+def _as_id(decision):
+    try:
+        return int(decision.get("application_id"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _apply_decisions(mission, decisions, default_message, now):
+    """Corps transactionnel de ``respond_to_applications`` (mission puis candidatures verrouillées)"""
+    mission = Mission.objects.select_for_update().get(pk=mission.pk)
+    ids = [decision["application_id"] for decision in decisions]
+    applications = Application.objects.select_for_update().in_bulk(
+        [pk for pk in ids if pk is not None]
+    )
+    applications = {pk: app for pk, app in applications.items() if app.mission_id == mission.pk}
+
+    remaining = mission.required_volunteers - mission.accepted_volunteers
+    to_update, to_accept, to_release, seen = [], [], [], set()
+
+    # Les refus libèrent des places avant les acceptations du même lot
+    ordered = sorted(enumerate(decisions), key=lambda item: item[1].get("action") != "reject")
+    outcome = {}
+    for index, decision in ordered:
+        application_id = decision.get("application_id")
+        action = decision.get("action")
+        application = applications.get(application_id)
+
+        if application is None:
+            outcome[index] = "Candidature non trouvée"
+            continue
+        if action not in ("accept", "reject"):
+            outcome[index] = "Action invalide"
+            continue
+        if application_id in seen:
+            outcome[index] = "Candidature en double dans le lot"
+            continue
+        seen.add(application_id)
+
+        if action == "accept":
+            if application.status == "ACCEPTED":
+                outcome[index] = "Candidature déjà acceptée"
+                continue
+            if remaining <= 0:
+                outcome[index] = "Mission complète"
+                continue
+            remaining -= 1
+            to_accept.append(application)
+            application.status = "ACCEPTED"
+        else:
+            if application.status == "ACCEPTED":
+                remaining += 1
+                to_release.append(application)
+            application.status = "REJECTED"
+
+        application.organization_message = decision.get("message", default_message)
+        application.responded_at = now
+        to_update.append(application)
+        outcome[index] = application
+
+    Application.objects.bulk_update(
+        to_update, ["status", "organization_message", "responded_at"], batch_size=200
+    )
+    changed = {app.volunteer_id for app in to_accept + to_release}
+    with org_stats.tracking_volunteers(mission.organization_id, changed) as tracker:
+        if to_release:
+            Participation.objects.filter(application__in=to_release).delete()
+            tracker.deleted(app.pk for app in to_release)
+        for app in to_accept:
+            tracker.created(app.volunteer_id)
+        Participation.objects.bulk_create(
+            [
+                Participation(mission_id=mission.pk, volunteer_id=app.volunteer_id, application=app)
+                for app in to_accept
+            ],
+            batch_size=200,
+        )
+    delta = len(to_accept) - len(to_release)
+    if delta:
+        Mission.objects.filter(pk=mission.pk).update(
+            accepted_volunteers=F("accepted_volunteers") + delta, updated_at=timezone.now()
+        )
+
+    return remaining, outcome
+
+
+def recompute_volunteer_stats(volunteer_ids):
+    """
+    Recalcule heures, missions complétées et badge des bénévoles à partir de
+    leurs participations validées (une agrégation + un bulk_update)
+
+    Le calcul repart toujours de la source : il est idempotent. La note moyenne
+    est tenue à part par son agrégat courant (voir ratings.py).
+    """
+    validated = Q(participations__hours_validated=True, participations__was_present=True)
+    rows = (
+        Volunteer.objects.filter(pk__in=volunteer_ids)
+        .annotate(
+            validated_hours=Coalesce(
+                Sum("participations__hours_completed", filter=validated), Decimal("0")
+            ),
+            validated_missions=Count(
+                "participations",
+                filter=validated & Q(participations__hours_completed__gt=0),
+            ),
+        )
+        .values("pk", "total_hours", "validated_hours", "validated_missions")
+    )
+
+    now = timezone.now()
+    volunteers = [
+        Volunteer(
+            pk=row["pk"],
+            total_hours=row["validated_hours"],
+            completed_missions=row["validated_missions"],
+            badge_level=Volunteer.badge_for_hours(row["validated_hours"]),
+            updated_at=now,
+        )
+        for row in rows
+    ]
+    Volunteer.objects.bulk_update(
+        volunteers,
+        ["total_hours", "completed_missions", "badge_level", "updated_at"],
+        batch_size=500,
+    )
+    homepage.increment(total_hours=sum(row["validated_hours"] - row["total_hours"] for row in rows))
+    # bulk_update n'émet pas de signal : le badge fait partie de l'index
+    matching.volunteers.changed(*(volunteer.pk for volunteer in volunteers))
+    return len(volunteers)
+
+
+def _parse_validation(validation):
+    """Normalise un élément de validation ; lève ValueError si invalide"""
+    was_present = bool(validation.get("was_present", False))
+    hours = Decimal(str(validation.get("hours", 0) or 0))
+    if hours < 0 or hours >= 1000:
+        raise ValueError("Nombre d'heures invalide")
+    rating = validation.get("rating")
+    if rating is not None:
+        rating = int(rating)
+        if not 1 <= rating <= 5:
+            raise ValueError("La note doit être comprise entre 1 et 5")
+    return {
+        "was_present": was_present,
+        "hours_completed": hours if was_present else Decimal("0"),
+        "organization_rating": rating,
+        "organization_comment": validation.get("comment", "") or "",
+    }
+
+
+def validate_hours(mission, validations):
+    """
+    Valide les heures d'un lot de participations d'une mission
+
+    Une lecture des participations, un ``bulk_update``, puis un recalcul agrégé
+    des statistiques des bénévoles concernés, dans une seule transaction.
+    Rejouer la même validation donne le même résultat. Renvoie
+    ``(validées, erreurs)`` où ``erreurs`` associe un id de participation à un message.
+    """
+    parsed, errors = {}, {}
+    for validation in validations:
+        participation_id = validation.get("participation_id")
+        try:
+            parsed[int(participation_id)] = _parse_validation(validation)
+        except (TypeError, ValueError, InvalidOperation) as exc:
+            message = str(exc) if isinstance(exc, ValueError) and str(exc) else "Valeur invalide"
+            errors[str(participation_id)] = message
+
+    now = timezone.now()
+    with transaction.atomic():
+        participations = list(
+            Participation.objects.select_for_update().filter(mission=mission, pk__in=parsed)
+        )
+        # Absence validée (ou corrigée) : total_volunteers de l'organisation peut changer
+        flipped, rated = [], []
+        for participation in participations:
+            was_engaged = participation.was_present or not participation.hours_validated
+            old_rating = ratings.counted_rating(participation)
+            for field, value in parsed[participation.pk].items():
+                setattr(participation, field, value)
+            participation.hours_validated = True
+            participation.validated_at = now
+            participation.updated_at = now
+            if participation.was_present != was_engaged:
+                flipped.append(participation)
+            rated.append(
+                (participation.volunteer_id, old_rating, participation.organization_rating)
+            )
+
+        volunteer_ids = {p.volunteer_id for p in participations}
+        with org_stats.tracking_volunteers(
+            mission.organization_id, {p.volunteer_id for p in flipped}
+        ) as tracker:
+            tracker.validated(flipped)
+            Participation.objects.bulk_update(
+                participations,
+                [
+                    "was_present",
+                    "hours_completed",
+                    "organization_rating",
+                    "organization_comment",
+                    "hours_validated",
+                    "validated_at",
+                    "updated_at",
+                ],
+                batch_size=500,
+            )
+        ratings.volunteers.apply(rated)
+        recompute_volunteer_stats(volunteer_ids)
+
+    found = {p.pk for p in participations}
+    for participation_id in parsed.keys() - found:
+        errors[str(participation_id)] = "Participation non trouvée"
+    return participations, errors
@@ -0,0 +1,230 @@
+"""
+Signaux de l'application missions
+"""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from accounts.models import Organization, User, Volunteer
+from odd.models import ODD
+from skills.models import Skill, VolunteerSkill
+
+from . import (
+    eligibility,
+    facets,
+    homepage,
+    matching,
+    org_stats,
+    ratings,
+    reference,
+    search,
+    services,
+)
+from .models import Mission, MissionSkillRequirement, Participation, Review
+
+
+@receiver(post_save, sender=Mission)
+def index_mission_on_save(sender, instance, update_fields=None, **kwargs):
+    """Maintient le document de recherche à jour"""
+    if update_fields is not None and not search.INDEXED_FIELDS.intersection(update_fields):
+        return
+    search.index_mission(instance)
+
+
+@receiver(post_save, sender=Organization)
+def reindex_organization_missions(sender, instance, created, update_fields=None, **kwargs):
+    """Le nom de l'organisation fait partie du document de recherche de ses missions"""
+    if created or (update_fields is not None and "name" not in update_fields):
+        return
+    search.rebuild_index(Mission.objects.filter(organization=instance))
+
+
+@receiver(post_save, sender=Mission)
+def invalidate_facets_on_save(sender, instance, created, update_fields=None, **kwargs):
+    """Publication, changement de statut ou de catégorie : les comptages changent"""
+    if update_fields is not None and not facets.FACETED_FIELDS.intersection(update_fields):
+        return
+    facets.bump_version()
+
+
+@receiver(post_delete, sender=Mission)
+@receiver(post_save, sender=MissionSkillRequirement)
+@receiver(post_delete, sender=MissionSkillRequirement)
+def invalidate_facets(sender, **kwargs):
+    facets.bump_version()
+
+
+@receiver(post_save, sender=MissionSkillRequirement)
+@receiver(post_delete, sender=MissionSkillRequirement)
+def touch_mission_on_requirement_change(sender, instance, **kwargs):
+    """Les compétences requises font partie du détail : nouvelle version (ETag)"""
+    Mission.objects.filter(pk=instance.mission_id).update(updated_at=timezone.now())
+
+
+@receiver(m2m_changed, sender=MissionSkillRequirement)
+def touch_mission_on_required_skills_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """``mission.required_skills.add()/remove()/clear()`` ne passe pas par post_save"""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    mission_ids = (pk_set or ()) if reverse else (instance.pk,)
+    Mission.objects.filter(pk__in=mission_ids).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Mission)
+def update_matching_index_on_save(sender, instance, update_fields=None, **kwargs):
+    """Publication, dépublication ou changement d'une caractéristique recommandée"""
+    if update_fields is not None and not matching.MATCHED_FIELDS.intersection(update_fields):
+        return
+    matching.missions.changed(instance.pk)
+
+
+@receiver(post_delete, sender=Mission)
+@receiver(post_save, sender=MissionSkillRequirement)
+@receiver(post_delete, sender=MissionSkillRequirement)
+def update_matching_index(sender, instance, **kwargs):
+    matching.missions.changed(getattr(instance, "mission_id", instance.pk))
+
+
+@receiver(m2m_changed, sender=MissionSkillRequirement)
+def update_matching_index_on_required_skills_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    for mission_id in (pk_set or ()) if reverse else (instance.pk,):
+        matching.missions.changed(mission_id)
+
+
+@receiver(post_save, sender=MissionSkillRequirement)
+@receiver(post_delete, sender=MissionSkillRequirement)
+def invalidate_required_skills(sender, **kwargs):
+    eligibility.requirements_changed()
+
+
+@receiver(m2m_changed, sender=MissionSkillRequirement)
+def invalidate_required_skills_on_m2m_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        eligibility.requirements_changed()
+
+
+@receiver(post_save, sender=VolunteerSkill)
+@receiver(post_delete, sender=VolunteerSkill)
+def invalidate_validated_skills(sender, instance, **kwargs):
+    eligibility.volunteer_changed(instance.volunteer_id)
+
+
+@receiver(post_save, sender=Volunteer)
+def update_candidate_index_on_save(sender, instance, update_fields=None, **kwargs):
+    """Profil, visibilité, note ou badge d'un bénévole modifiés"""
+    if update_fields is not None and not matching.VOLUNTEER_FIELDS.intersection(update_fields):
+        return
+    matching.volunteers.changed(instance.pk)
+
+
+@receiver(post_delete, sender=Volunteer)
+@receiver(post_save, sender=VolunteerSkill)
+@receiver(post_delete, sender=VolunteerSkill)
+def update_candidate_index(sender, instance, **kwargs):
+    matching.volunteers.changed(getattr(instance, "volunteer_id", instance.pk))
+
+
+@receiver(post_save, sender=User)
+def update_candidate_index_on_user_save(sender, instance, created, update_fields=None, **kwargs):
+    """Compte désactivé ou réactivé : le bénévole sort ou revient dans le classement"""
+    if created or (update_fields is not None and "is_active" not in update_fields):
+        return
+    volunteer_id = Volunteer.objects.filter(user=instance).values_list("pk", flat=True).first()
+    if volunteer_id is not None:
+        matching.volunteers.changed(volunteer_id)
+
+
+@receiver(post_save, sender=ODD)
+@receiver(post_delete, sender=ODD)
+def invalidate_odd_catalogue(sender, **kwargs):
+    reference.odds.invalidate()
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def invalidate_skill_catalogue(sender, **kwargs):
+    reference.skills.invalidate()
+
+
+@receiver(post_save, sender=Volunteer)
+def count_volunteer_registration(sender, instance, created, **kwargs):
+    if created:
+        homepage.increment(total_volunteers=1, total_hours=instance.total_hours)
+
+
+@receiver(post_delete, sender=Volunteer)
+def count_volunteer_deletion(sender, instance, **kwargs):
+    homepage.increment(total_volunteers=-1, total_hours=-instance.total_hours)
+
+
+@receiver(post_save, sender=Mission)
+def count_mission_publication(sender, instance, created, update_fields=None, **kwargs):
+    """Publication ou dépublication : compteurs de l'accueil et de l'organisation, instantané"""
+    if update_fields is not None and "status" not in update_fields:
+        if instance.__dict__.get("status") == "PUBLISHED":
+            homepage.bump_version()
+        return
+    loaded_status = None if created else getattr(instance, "_loaded_status", None)
+    was_published = loaded_status == "PUBLISHED"
+    is_published = instance.status == "PUBLISHED"
+    instance._loaded_status = instance.status
+    org_stats.mission_status_changed(instance.organization_id, loaded_status, instance.status)
+    if was_published != is_published:
+        homepage.increment(total_missions=1 if is_published else -1)
+    elif is_published:
+        # Les dernières missions affichées peuvent avoir changé
+        homepage.bump_version()
+
+
+@receiver(post_delete, sender=Mission)
+def count_mission_deletion(sender, instance, **kwargs):
+    if instance.status == "PUBLISHED":
+        homepage.increment(total_missions=-1)
+    org_stats.mission_status_changed(instance.organization_id, instance.status, None)
+
+
+@receiver(post_save, sender=Review)
+def update_organization_rating_on_save(sender, instance, created, **kwargs):
+    old_rating = None if created else getattr(instance, "_loaded_rating", None)
+    instance._loaded_rating = instance.rating
+    ratings.organizations.changed(instance.organization_id, old_rating, instance.rating)
+
+
+@receiver(post_delete, sender=Review)
+def update_organization_rating_on_delete(sender, instance, **kwargs):
+    ratings.organizations.changed(instance.organization_id, instance.rating, None)
+
+
+@receiver(post_save, sender=Participation)
+def update_volunteer_rating_on_save(sender, instance, created, **kwargs):
+    # validate_hours passe par bulk_update (sans signal) et applique ses écarts lui-même
+    old_rating = None if created else getattr(instance, "_loaded_rating", None)
+    new_rating = ratings.counted_rating(instance)
+    instance._loaded_rating = new_rating
+    if ratings.volunteers.changed(instance.volunteer_id, old_rating, new_rating):
+        matching.volunteers.changed(instance.volunteer_id)
+
+
+@receiver(post_delete, sender=Participation)
+def update_volunteer_rating_on_delete(sender, instance, **kwargs):
+    """Refus après acceptation, suppression depuis l'admin ou en cascade d'une mission"""
+    old_rating = getattr(instance, "_loaded_rating", ratings.counted_rating(instance))
+    if ratings.volunteers.changed(instance.volunteer_id, old_rating, None):
+        matching.volunteers.changed(instance.volunteer_id)
+
+
+@receiver(post_delete, sender=Participation)
+def recompute_volunteer_stats_on_delete(sender, instance, **kwargs):
+    """Heures validées supprimées : heures, missions complétées et badge à recalculer"""
+    if instance.hours_validated:
+        services.recompute_volunteer_stats([instance.volunteer_id])
+
+
+@receiver(post_delete, sender=Participation)
+def count_participation_deletion(sender, instance, **kwargs):
+    org_stats.participation_deleted(instance)
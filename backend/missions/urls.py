@@ -4,13 +4,22 @@ URLs pour les missions
 
 from django.urls import path
 
+from .async_views import (
+    AsyncHomePageStatsView,
+    AsyncMissionDetailView,
+    AsyncMissionListView,
+    read_view,
+)
 from .views import (
     # Admin
     AdminStatsView,
     ApplyToMissionView,
+    BulkRespondToApplicationsView,
     HomePageStatsView,
     MissionApplicationsView,
+    MissionCandidatesView,
     MissionDetailView,
+    MissionFacetsView,
     # Pages publiques
     MissionListView,
     MyApplicationsView,
@@ -19,6 +28,7 @@ from .views import (
     OrganizationDashboardView,
     OrganizationMissionsView,
     OrganizationPublicProfileView,
+    RecommendedMissionsView,
     RespondToApplicationView,
     ValidateHoursView,
     # Espace Bénévole
@@ -29,18 +39,28 @@ app_name = "missions"
 
 urlpatterns = [
     # ========== PAGES PUBLIQUES ==========
-    path("", MissionListView.as_view(), name="mission_list"),  # Page 2
-    path("<int:pk>/", MissionDetailView.as_view(), name="mission_detail"),  # Page 3
+    path("", read_view(MissionListView, AsyncMissionListView), name="mission_list"),  # Page 2
+    path("facets/", MissionFacetsView.as_view(), name="mission_facets"),  # Page 2
+    path(
+        "<int:pk>/", read_view(MissionDetailView, AsyncMissionDetailView), name="mission_detail"
+    ),  # Page 3
     path(
         "organization/<int:pk>/",
         OrganizationPublicProfileView.as_view(),
         name="organization_profile",
     ),  # Page 4
-    path("home-stats/", HomePageStatsView.as_view(), name="home_stats"),  # Page 1
+    path(
+        "home-stats/", read_view(HomePageStatsView, AsyncHomePageStatsView), name="home_stats"
+    ),  # Page 1
     # ========== ESPACE BÉNÉVOLE ==========
     path(
         "volunteer/dashboard/", VolunteerDashboardView.as_view(), name="volunteer_dashboard"
     ),  # Page 8
+    path(
+        "volunteer/recommendations/",
+        RecommendedMissionsView.as_view(),
+        name="volunteer_recommendations",
+    ),
     path("volunteer/apply/<int:mission_id>/", ApplyToMissionView.as_view(), name="apply"),
     path(
         "volunteer/applications/", MyApplicationsView.as_view(), name="my_applications"
@@ -60,11 +80,21 @@ urlpatterns = [
         MissionApplicationsView.as_view(),
         name="mission_applications",
     ),  # Page 18
+    path(
+        "organization/mission/<int:mission_id>/candidates/",
+        MissionCandidatesView.as_view(),
+        name="mission_candidates",
+    ),
     path(
         "organization/application/<int:application_id>/respond/",
         RespondToApplicationView.as_view(),
         name="respond_application",
     ),
+    path(
+        "organization/mission/<int:mission_id>/applications/respond/",
+        BulkRespondToApplicationsView.as_view(),
+        name="bulk_respond_applications",
+    ),  # Page 18
     path(
         "organization/mission/<int:mission_id>/validate-hours/",
         ValidateHoursView.as_view(),
@@ -0,0 +1,293 @@
+"""
+Compteur de vues des missions en écriture différée
+
+Les vues sont accumulées dans un tampon (mémoire du processus ou cache Django
+partagé), dédupliquées par visiteur, les robots sont ignorés, puis le tampon est
+vidé périodiquement en quelques ``UPDATE ... SET view_count = view_count + n``
+atomiques (une requête par valeur d'incrément distincte).
+
+Configuration (``settings.VIEW_COUNTER``) :
+    BACKEND         "local" (par processus) ou "cache" (partagé entre workers)
+    CACHE_ALIAS     alias du cache utilisé pour la déduplication et le backend "cache"
+    FLUSH_INTERVAL  délai (s) entre deux écritures en base
+    DEDUP_TTL       durée (s) pendant laquelle un même visiteur n'est compté qu'une fois
+    FLUSH_THREAD    vide aussi le tampon toutes les FLUSH_INTERVAL secondes sans
+                    attendre une nouvelle vue (thread du processus) : un worker tué
+                    par le ``timeout`` de gunicorn ne perd qu'un intervalle de vues
+
+Les visiteurs anonymes sont identifiés par ``REMOTE_ADDR`` (réécrit par gunicorn
+depuis ``X-Forwarded-For`` pour les proxys de ``forwarded_allow_ips``) : l'en-tête
+lui-même est fourni par le client et ne sert pas à la déduplication.
+"""
+
+import atexit
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.db.models import F
+
+DEFAULTS = {
+    "BACKEND": "local",
+    "CACHE_ALIAS": "default",
+    "FLUSH_INTERVAL": 30,
+    "DEDUP_TTL": 30 * 60,
+    "FLUSH_THREAD": True,
+}
+
+BOT_USER_AGENT_RE = re.compile(
+    r"bot|crawl|spider|slurp|facebookexternalhit|preview|monitor|headless|"
+    r"curl|wget|python-requests|httpclient|okhttp",
+    re.IGNORECASE,
+)
+
+KEY_PREFIX = "mission_views"
+
+logger = logging.getLogger(__name__)
+
+
+class LocalViewBuffer:
+    """Tampon en mémoire, propre au processus"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = defaultdict(int)
+
+    def add(self, mission_id, amount=1):
+        with self._lock:
+            self._pending[mission_id] += amount
+
+    def pending(self, mission_id):
+        return self._pending.get(mission_id, 0)
+
+    def drain(self):
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(int)
+        return dict(pending)
+
+
+class CacheViewBuffer:
+    """
+    Tampon partagé dans le cache Django (Redis/Memcached en production)
+
+    Les compteurs en attente sont des clés ``incr`` par mission. Une mission dont
+    le compteur passe de zéro à positif est inscrite dans un journal
+    (``dirty:seq`` + ``dirty:<n>``, comme le journal de missions/matching.py) :
+    le vidage ne lit que ces missions, quel que soit leur statut, et retranche
+    exactement ce qu'il a lu, ce qui ne perd pas les vues arrivées entre la
+    lecture et l'écriture.
+    """
+
+    SEQ_KEY = f"{KEY_PREFIX}:dirty:seq"
+    CURSOR_KEY = f"{KEY_PREFIX}:dirty:cursor"
+    # Au-delà, une entrée absente du journal est considérée comme évincée
+    MAX_LAG = 1000
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    @staticmethod
+    def _key(mission_id):
+        return f"{KEY_PREFIX}:pending:{mission_id}"
+
+    @staticmethod
+    def _dirty_key(seq):
+        return f"{KEY_PREFIX}:dirty:{seq}"
+
+    def add(self, mission_id, amount=1):
+        key = self._key(mission_id)
+        if self.cache.add(key, amount, timeout=None):
+            self._mark_dirty(mission_id)
+            return
+        try:
+            total = self.cache.incr(key, amount)
+        except ValueError:
+            # Clé expirée/évincée entre add() et incr()
+            self.cache.add(key, amount, timeout=None)
+            total = amount
+        if total == amount:
+            # Compteur remis à zéro par un vidage : la mission redevient à vider
+            self._mark_dirty(mission_id)
+
+    def _mark_dirty(self, mission_id):
+        try:
+            seq = self.cache.incr(self.SEQ_KEY)
+        except ValueError:
+            self.cache.add(self.SEQ_KEY, 0, timeout=None)
+            seq = self.cache.incr(self.SEQ_KEY)
+        self.cache.set(self._dirty_key(seq), mission_id, timeout=None)
+
+    def pending(self, mission_id):
+        return self.cache.get(self._key(mission_id), 0)
+
+    def drain(self):
+        start = self.cache.get(self.CURSOR_KEY, 0)
+        end = self.cache.get(self.SEQ_KEY, 0)
+        seqs = range(start + 1, end + 1)
+        found = self.cache.get_many(self._dirty_key(seq) for seq in seqs)
+
+        drained = {}
+        mission_ids = set(found.values())
+        for key, amount in self.cache.get_many(self._key(pk) for pk in mission_ids).items():
+            if amount:
+                self.cache.decr(key, amount)
+                drained[int(key.rsplit(":", 1)[1])] = amount
+
+        # Une entrée absente est en cours d'écriture (incr du numéro puis set) :
+        # le curseur s'arrête avant elle et la relira au prochain vidage
+        missing = [
+            seq for seq in seqs if self._dirty_key(seq) not in found and end - seq < self.MAX_LAG
+        ]
+        cursor = missing[0] - 1 if missing else end
+        self.cache.delete_many(self._dirty_key(seq) for seq in range(start + 1, cursor + 1))
+        self.cache.set(self.CURSOR_KEY, cursor, timeout=None)
+        return drained
+
+
+class ViewCounter:
+    """Enregistre les vues, les déduplique et les écrit en base par lots"""
+
+    def __init__(self, buffer, cache, flush_interval, dedup_ttl):
+        self.buffer = buffer
+        self.cache = cache
+        self.flush_interval = flush_interval
+        self.dedup_ttl = dedup_ttl
+        self._last_flush = time.monotonic()
+        self._flush_lock = threading.Lock()
+
+    @staticmethod
+    def is_bot(request):
+        user_agent = request.META.get("HTTP_USER_AGENT", "")
+        return not user_agent or bool(BOT_USER_AGENT_RE.search(user_agent))
+
+    @staticmethod
+    def viewer_fingerprint(request):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return f"u{user.pk}"
+        raw = f"{request.META.get('REMOTE_ADDR', '')}|{request.META.get('HTTP_USER_AGENT', '')}"
+        return "a" + hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()
+
+    def record(self, request, mission):
+        """Compte une vue si elle vient d'un humain pas encore compté ; renvoie True si comptée"""
+        if self.is_bot(request):
+            return False
+        seen_key = f"{KEY_PREFIX}:seen:{mission.pk}:{self.viewer_fingerprint(request)}"
+        if not self.cache.add(seen_key, 1, timeout=self.dedup_ttl):
+            return False
+        self.buffer.add(mission.pk)
+        # Vues écrites par ce vidage : absentes du tampon, et de l'instance déjà chargée
+        mission.view_count += self.maybe_flush().get(mission.pk, 0)
+        return True
+
+    def current_count(self, mission):
+        """Valeur approximativement fraîche : base + vues en attente"""
+        return mission.view_count + self.buffer.pending(mission.pk)
+
+    def maybe_flush(self):
+        """Vide le tampon si l'intervalle est écoulé ; renvoie {id de mission: vues écrites}"""
+        if time.monotonic() - self._last_flush < self.flush_interval:
+            return {}
+        if not self._flush_lock.acquire(blocking=False):
+            return {}
+        try:
+            # Avec un tampon partagé, un seul worker vide le tampon par intervalle
+            if isinstance(self.buffer, CacheViewBuffer) and not self.cache.add(
+                f"{KEY_PREFIX}:flush_lock", 1, timeout=self.flush_interval
+            ):
+                self._last_flush = time.monotonic()
+                return {}
+            return self._write()
+        finally:
+            self._flush_lock.release()
+
+    def start_flusher(self):
+        """Vide le tampon toutes les ``flush_interval`` secondes, même sans nouvelle vue"""
+        thread = threading.Thread(target=self._flush_loop, name="view-counter-flush", daemon=True)
+        thread.start()
+        return thread
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(max(self.flush_interval, 1))
+            try:
+                self.flush_tick()
+            finally:
+                # Connexion ouverte par ce thread : Django ne la ferme qu'en fin de requête
+                connection.close()
+
+    def flush_tick(self):
+        """Une itération du thread de vidage ; les erreurs sont journalisées"""
+        try:
+            return self.maybe_flush()
+        except Exception:
+            logger.exception("Impossible d'écrire les vues en attente")
+            return {}
+
+    def flush(self):
+        """Écrit les vues en attente en base ; renvoie le nombre de vues écrites"""
+        return sum(self._write().values())
+
+    def _write(self):
+        from .models import Mission
+
+        self._last_flush = time.monotonic()
+        pending = self.buffer.drain()
+        if not pending:
+            return {}
+
+        by_amount = defaultdict(list)
+        for mission_id, amount in pending.items():
+            by_amount[amount].append(mission_id)
+
+        try:
+            with transaction.atomic():
+                for amount, mission_ids in by_amount.items():
+                    Mission.objects.filter(pk__in=mission_ids).update(
+                        view_count=F("view_count") + amount
+                    )
+        except Exception:
+            # Remettre les vues dans le tampon pour le prochain vidage
+            for mission_id, amount in pending.items():
+                self.buffer.add(mission_id, amount)
+            raise
+        return pending
+
+
+_counter = None
+_counter_lock = threading.Lock()
+
+
+def get_view_counter():
+    """Compteur du processus, construit à partir de ``settings.VIEW_COUNTER``"""
+    global _counter
+    if _counter is None:
+        with _counter_lock:
+            if _counter is None:
+                config = {**DEFAULTS, **getattr(settings, "VIEW_COUNTER", {})}
+                cache = caches[config["CACHE_ALIAS"]]
+                if config["BACKEND"] == "cache":
+                    buffer = CacheViewBuffer(cache)
+                elif config["BACKEND"] == "local":
+                    buffer = LocalViewBuffer()
+                else:
+                    raise ValueError(f"VIEW_COUNTER: backend inconnu {config['BACKEND']!r}")
+                _counter = ViewCounter(buffer, cache, config["FLUSH_INTERVAL"], config["DEDUP_TTL"])
+                if isinstance(buffer, LocalViewBuffer):
+                    atexit.register(_flush_at_exit, _counter)
+                if config["FLUSH_THREAD"]:
+                    _counter.start_flusher()
+    return _counter
+
+
+def _flush_at_exit(counter):
+    try:
+        counter.flush()
+    except Exception:
+        logger.exception("Impossible d'écrire les vues en attente à l'arrêt du processus")
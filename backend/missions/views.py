@@ -2,7 +2,7 @@
 Vues pour les missions
 """
 
-from django.db.models import Count, F, Sum
+from django.db.models import F, Q, Sum
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, generics, permissions, status
@@ -12,13 +12,21 @@ from rest_framework.views import APIView
 from accounts.models import Organization
 from accounts.serializers import (
     ApplicationSerializer,
+    CandidateVolunteerSerializer,
     MissionCreateSerializer,
     MissionDetailSerializer,
     MissionListSerializer,
     ParticipationSerializer,
+    RecommendedMissionSerializer,
 )
 
+from . import dashboard, facets, homepage, matching, reference, services
+from .conditional import ConditionalRetrieveMixin
+from .fast_serializers import FastListMixin
+from .filters import MissionEligibilityFilter, MissionProximityFilter, MissionSearchFilter
 from .models import Application, Mission, Participation
+from .pagination import KeysetPagination
+from .view_counter import get_view_counter
 
 
 class IsOrganization(permissions.BasePermission):
@@ -38,7 +46,7 @@ class IsVolunteer(permissions.BasePermission):
 # ========== PAGES PUBLIQUES ==========
 
 
-class MissionListView(generics.ListAPIView):
+class MissionListView(FastListMixin, generics.ListAPIView):
     """
     Liste des missions (Page 2: Catalogue des Missions)
     Accessible sans connexion
@@ -46,16 +54,22 @@ class MissionListView(generics.ListAPIView):
 
     serializer_class = MissionListSerializer
     permission_classes = [permissions.AllowAny]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = KeysetPagination
+    filter_backends = [
+        DjangoFilterBackend,
+        filters.OrderingFilter,
+        MissionSearchFilter,
+        MissionProximityFilter,
+        MissionEligibilityFilter,
+    ]
     filterset_fields = ["wilaya", "odd", "status", "mission_type"]
-    search_fields = ["title", "short_description", "organization__name"]
     ordering_fields = ["date", "created_at", "accepted_volunteers"]
     ordering = ["-created_at"]
 
     def get_queryset(self):
         queryset = Mission.objects.filter(
             status="PUBLISHED", date__gte=timezone.now().date()
-        ).select_related("organization", "odd")
+        ).select_related("organization")
 
         # Filtre par compétences
         skills = self.request.query_params.get("skills", None)
@@ -63,6 +77,14 @@ class MissionListView(generics.ListAPIView):
             skill_ids = skills.split(",")
             queryset = queryset.filter(required_skills__id__in=skill_ids).distinct()
 
+        # Filtre par causes (liste JSON)
+        causes = self.request.query_params.get("causes", None)
+        if causes:
+            cause_filter = Q()
+            for cause in causes.split(","):
+                cause_filter |= Q(causes__icontains=f'"{cause.strip()}"')
+            queryset = queryset.filter(cause_filter)
+
         # Filtre places disponibles
         has_places = self.request.query_params.get("has_places", None)
         if has_places == "true":
@@ -71,7 +93,38 @@ class MissionListView(generics.ListAPIView):
         return queryset
 
 
-class MissionDetailView(generics.RetrieveAPIView):
+class _WithoutQueryParam:
+    """Requête dont un paramètre de filtre est retiré (comptage d'une facette)"""
+
+    def __init__(self, request, param):
+        self._request = request
+        self.query_params = request.query_params.copy()
+        self.query_params.pop(param, None)
+
+    def __getattr__(self, name):
+        return getattr(self._request, name)
+
+
+class MissionFacetsView(MissionListView):
+    """
+    Comptages par facette du catalogue (barre latérale de la Page 2)
+    Mêmes paramètres de filtre que la liste des missions
+    """
+
+    pagination_class = None
+
+    def list(self, request, *args, **kwargs):
+        def filtered_queryset_without(param):
+            self.request = _WithoutQueryParam(request, param)
+            try:
+                return self.filter_queryset(self.get_queryset())
+            finally:
+                self.request = request
+
+        return Response(facets.get_facets(request, filtered_queryset_without))
+
+
+class MissionDetailView(ConditionalRetrieveMixin, generics.RetrieveAPIView):
     """
     Détail d'une mission (Page 3)
     Accessible sans connexion
@@ -79,20 +132,29 @@ class MissionDetailView(generics.RetrieveAPIView):
 
     serializer_class = MissionDetailSerializer
     permission_classes = [permissions.AllowAny]
-    queryset = Mission.objects.filter(status="PUBLISHED").select_related("organization", "odd")
+    queryset = Mission.objects.filter(status="PUBLISHED").select_related("organization")
 
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
+    # view_count n'entre pas dans l'ETag (faible) ; no-cache : chaque vue revalide
+    # auprès du serveur et reste comptée, même quand la réponse est un 304
+    weak_etag = True
+    cache_control = {"public": True, "no_cache": True}
 
-        # Incrémenter le compteur de vues
-        instance.view_count += 1
-        instance.save(update_fields=["view_count"])
+    def object_retrieved(self, instance):
+        # Compteur de vues en écriture différée (voir missions.view_counter)
+        counter = get_view_counter()
+        counter.record(self.request, instance)
+        instance.view_count = counter.current_count(instance)
 
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+    def get_versions(self, instance):
+        odd = reference.odds.get(instance.odd_id) if instance.odd_id else None
+        return (
+            instance.updated_at,
+            instance.organization.updated_at,
+            odd.updated_at if odd is not None else None,
+        )
 
 
-class OrganizationPublicProfileView(generics.RetrieveAPIView):
+class OrganizationPublicProfileView(ConditionalRetrieveMixin, generics.RetrieveAPIView):
     """
     Profil public d'une organisation (Page 4)
     """
@@ -103,6 +165,9 @@ class OrganizationPublicProfileView(generics.RetrieveAPIView):
     permission_classes = [permissions.AllowAny]
     queryset = Organization.objects.filter(is_verified=True)
 
+    def get_versions(self, instance):
+        return (instance.updated_at,)
+
 
 class HomePageStatsView(APIView):
     """
@@ -112,23 +177,8 @@ class HomePageStatsView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def get(self, request):
-        from accounts.models import Volunteer
-
-        stats = {
-            "total_volunteers": Volunteer.objects.count(),
-            "total_missions": Mission.objects.filter(status="PUBLISHED").count(),
-            "total_hours": Volunteer.objects.aggregate(total=Sum("total_hours"))["total"]
-            or 0,
-        }
-
-        # Dernières missions
-        latest_missions = Mission.objects.filter(
-            status="PUBLISHED", date__gte=timezone.now().date()
-        ).select_related("organization", "odd")[:6]
-
-        stats["latest_missions"] = MissionListSerializer(latest_missions, many=True).data
-
-        return Response(stats)
+        # Instantané précalculé : aucune requête tant que le cache est valide
+        return homepage.snapshot_response(request, homepage.get_snapshot())
 
 
 # ========== ESPACE BÉNÉVOLE ==========
@@ -142,44 +192,34 @@ class VolunteerDashboardView(APIView):
     permission_classes = [IsVolunteer]
 
     def get(self, request):
-        volunteer = request.user.volunteer_profile
+        return Response(dashboard.build_dashboard(request.user.volunteer_profile))
 
-        # Applications en attente
-        pending_applications = Application.objects.filter(
-            volunteer=volunteer, status="PENDING"
-        ).count()
 
-        # Missions acceptées à venir
-        accepted_missions = Application.objects.filter(
-            volunteer=volunteer, status="ACCEPTED", mission__date__gte=timezone.now().date()
-        ).count()
+def _matching_limit(request):
+    """``?limit=`` borné à [1, MAX_LIMIT] ; ValueError si ce n'est pas un entier"""
+    config = matching.get_config()
+    limit = int(request.query_params.get("limit", config["LIMIT"]))
+    return min(max(limit, 1), config["MAX_LIMIT"])
 
-        # Prochaines missions
-        upcoming_missions = Application.objects.filter(
-            volunteer=volunteer, status="ACCEPTED", mission__date__gte=timezone.now().date()
-        ).select_related("mission__organization")[:3]
 
-        # Candidatures récentes
-        recent_applications = Application.objects.filter(volunteer=volunteer).select_related(
-            "mission__organization"
-        )[:5]
+class RecommendedMissionsView(APIView):
+    """
+    Missions recommandées au bénévole (compétences, causes, disponibilités, distance)
+    """
 
-        data = {
-            "profile": {
-                "total_hours": volunteer.total_hours,
-                "badge_level": volunteer.badge_level,
-                "completed_missions": volunteer.completed_missions,
-                "average_rating": volunteer.average_rating,
-            },
-            "stats": {
-                "pending_applications": pending_applications,
-                "accepted_missions": accepted_missions,
-            },
-            "upcoming_missions": ApplicationSerializer(upcoming_missions, many=True).data,
-            "recent_applications": ApplicationSerializer(recent_applications, many=True).data,
-        }
+    permission_classes = [IsVolunteer]
 
-        return Response(data)
+    def get(self, request):
+        try:
+            limit = _matching_limit(request)
+        except ValueError:
+            return Response(
+                {"error": "limit doit être un entier"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        missions = matching.recommend(request.user.volunteer_profile, limit)
+        serializer = RecommendedMissionSerializer(missions, many=True, context={"request": request})
+        return Response({"count": len(missions), "results": serializer.data})
 
 
 class ApplyToMissionView(APIView):
@@ -210,67 +250,52 @@ class ApplyToMissionView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Vérifier les compétences requises
-        required_skills = mission.skill_requirements.filter(verification_required=True)
-        volunteer_skills = volunteer.skills.filter(status="VALIDATED").values_list(
-            "skill_id", flat=True
-        )
-
-        has_all_skills = all(req.skill_id in volunteer_skills for req in required_skills)
-
-        if not has_all_skills:
-            return Response(
-                {"error": "Vous ne possédez pas toutes les compétences vérifiées requises"},
-                status=status.HTTP_400_BAD_REQUEST,
+        # Créer la candidature : compétences vérifiées requises contrôlées et compteur
+        # incrémenté dans la même transaction
+        try:
+            application = services.submit_application(
+                mission, volunteer, message=request.data.get("message", "")
             )
-
-        # Créer la candidature
-        application = Application.objects.create(
-            mission=mission,
-            volunteer=volunteer,
-            message=request.data.get("message", ""),
-            has_required_skills=has_all_skills,
-        )
-
-        # Incrémenter le compteur
-        mission.application_count += 1
-        mission.save(update_fields=["application_count"])
+        except services.MissionError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response(ApplicationSerializer(application).data, status=status.HTTP_201_CREATED)
 
 
-class MyApplicationsView(generics.ListAPIView):
+class MyApplicationsView(FastListMixin, generics.ListAPIView):
     """
     Liste des candidatures du bénévole (Page 11)
     """
 
     serializer_class = ApplicationSerializer
     permission_classes = [IsVolunteer]
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["status"]
 
     def get_queryset(self):
         return (
             Application.objects.filter(volunteer=self.request.user.volunteer_profile)
-            .select_related("mission__organization")
-            .order_by("-applied_at")
+            .select_related("volunteer__user", "mission__organization")
+            .order_by("-applied_at", "-id")
         )
 
 
-class MyMissionsView(generics.ListAPIView):
+class MyMissionsView(FastListMixin, generics.ListAPIView):
     """
     Missions du bénévole (Page 12)
     """
 
     serializer_class = ParticipationSerializer
     permission_classes = [IsVolunteer]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         status_filter = self.request.query_params.get("status", "all")
         volunteer = self.request.user.volunteer_profile
 
         queryset = Participation.objects.filter(volunteer=volunteer).select_related(
-            "mission__organization"
+            "volunteer__user", "mission__organization"
         )
 
         if status_filter == "upcoming":
@@ -278,7 +303,7 @@ class MyMissionsView(generics.ListAPIView):
         elif status_filter == "completed":
             queryset = queryset.filter(mission__date__lt=timezone.now().date())
 
-        return queryset.order_by("-mission__date")
+        return queryset.order_by("-mission__date", "-id")
 
 
 # ========== ESPACE ORGANISATION ==========
@@ -294,8 +319,7 @@ class OrganizationDashboardView(APIView):
     def get(self, request):
         organization = request.user.organization_profile
 
-        # Statistiques
-        total_missions = Mission.objects.filter(organization=organization).count()
+        # Statistiques (total_missions : hors brouillons et annulées, voir org_stats.py)
         pending_applications = Application.objects.filter(
             mission__organization=organization, status="PENDING"
         ).count()
@@ -303,11 +327,11 @@ class OrganizationDashboardView(APIView):
         # Missions actives
         active_missions = Mission.objects.filter(
             organization=organization, status="PUBLISHED", date__gte=timezone.now().date()
-        ).annotate(application_count=Count("applications"))[:5]
+        ).select_related("organization")[:5]
 
         data = {
             "stats": {
-                "total_missions": total_missions,
+                "total_missions": organization.total_missions,
                 "pending_applications": pending_applications,
                 "total_volunteers": organization.total_volunteers,
                 "average_rating": organization.average_rating,
@@ -318,7 +342,7 @@ class OrganizationDashboardView(APIView):
         return Response(data)
 
 
-class OrganizationMissionsView(generics.ListCreateAPIView):
+class OrganizationMissionsView(FastListMixin, generics.ListCreateAPIView):
     """
     Liste et création des missions de l'organisation (Page 16, 17)
     """
@@ -331,7 +355,7 @@ class OrganizationMissionsView(generics.ListCreateAPIView):
     def get_queryset(self):
         return (
             Mission.objects.filter(organization=self.request.user.organization_profile)
-            .select_related("odd")
+            .select_related("organization")
             .order_by("-created_at")
         )
 
@@ -344,13 +368,14 @@ class OrganizationMissionsView(generics.ListCreateAPIView):
         serializer.save(organization=self.request.user.organization_profile)
 
 
-class MissionApplicationsView(generics.ListAPIView):
+class MissionApplicationsView(FastListMixin, generics.ListAPIView):
     """
     Candidatures pour une mission (Page 18)
     """
 
     serializer_class = ApplicationSerializer
     permission_classes = [IsOrganization]
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["status"]
 
@@ -360,9 +385,36 @@ class MissionApplicationsView(generics.ListAPIView):
             Application.objects.filter(
                 mission_id=mission_id, mission__organization=self.request.user.organization_profile
             )
-            .select_related("volunteer__user")
-            .order_by("-applied_at")
+            .select_related("volunteer__user", "mission__organization")
+            .order_by("-applied_at", "-id")
+        )
+
+
+class MissionCandidatesView(APIView):
+    """
+    Bénévoles les mieux adaptés à une mission (compétences vérifiées, distance,
+    disponibilités, note moyenne, badge)
+    """
+
+    permission_classes = [IsOrganization]
+
+    def get(self, request, mission_id):
+        try:
+            mission = Mission.objects.get(id=mission_id, organization__user=request.user)
+        except Mission.DoesNotExist:
+            return Response({"error": "Mission non trouvée"}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            limit = _matching_limit(request)
+        except ValueError:
+            return Response(
+                {"error": "limit doit être un entier"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        volunteers = matching.rank_volunteers(mission, limit)
+        serializer = CandidateVolunteerSerializer(
+            volunteers, many=True, context={"request": request}
         )
+        return Response({"count": len(volunteers), "results": serializer.data})
 
 
 class RespondToApplicationView(APIView):
@@ -383,32 +435,58 @@ class RespondToApplicationView(APIView):
         action = request.data.get("action")  # 'accept' ou 'reject'
         message = request.data.get("message", "")
 
-        if action == "accept":
-            # Vérifier si la mission n'est pas pleine
-            if application.mission.is_full():
-                return Response({"error": "Mission complète"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            if action == "accept":
+                # Réservation de place conditionnelle + participation, en une transaction
+                application = services.accept_application(application, message)
+            elif action == "reject":
+                application = services.reject_application(application, message)
+            else:
+                return Response({"error": "Action invalide"}, status=status.HTTP_400_BAD_REQUEST)
+        except services.MissionError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
-            application.status = "ACCEPTED"
-            application.mission.accepted_volunteers += 1
-            application.mission.save(update_fields=["accepted_volunteers"])
+        return Response(ApplicationSerializer(application).data)
 
-            # Créer la participation
-            Participation.objects.create(
-                mission=application.mission,
-                volunteer=application.volunteer,
-                application=application,
-            )
 
-        elif action == "reject":
-            application.status = "REJECTED"
-        else:
-            return Response({"error": "Action invalide"}, status=status.HTTP_400_BAD_REQUEST)
+class BulkRespondToApplicationsView(APIView):
+    """
+    Accepter ou refuser plusieurs candidatures d'une mission en une fois (Page 18)
+    """
 
-        application.organization_message = message
-        application.responded_at = timezone.now()
-        application.save()
+    permission_classes = [IsOrganization]
 
-        return Response(ApplicationSerializer(application).data)
+    def post(self, request, mission_id):
+        try:
+            mission = Mission.objects.get(
+                id=mission_id, organization=request.user.organization_profile
+            )
+        except Mission.DoesNotExist:
+            return Response({"error": "Mission non trouvée"}, status=status.HTTP_404_NOT_FOUND)
+
+        decisions = request.data.get("decisions")
+        if not isinstance(decisions, list) or not all(isinstance(d, dict) for d in decisions):
+            return Response(
+                {"error": "Le champ 'decisions' doit être une liste"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            results, remaining = services.respond_to_applications(
+                mission, decisions, default_message=request.data.get("message", "")
+            )
+        except services.MissionError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {
+                "results": results,
+                "accepted": sum(r.get("status") == "ACCEPTED" for r in results),
+                "rejected": sum(r.get("status") == "REJECTED" for r in results),
+                "errors": sum("error" in r for r in results),
+                "remaining_places": remaining,
+            }
+        )
 
 
 class ValidateHoursView(APIView):
@@ -434,36 +512,26 @@ class ValidateHoursView(APIView):
             )
 
         validations = request.data.get("validations", [])
+        if not isinstance(validations, list) or not all(isinstance(v, dict) for v in validations):
+            return Response(
+                {"error": "validations doit être une liste d'objets"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(validations) > services.MAX_BATCH_SIZE:
+            return Response(
+                {"error": f"Un lot ne peut pas dépasser {services.MAX_BATCH_SIZE} validations"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        for validation in validations:
-            participation_id = validation.get("participation_id")
-            was_present = validation.get("was_present", False)
-            hours = validation.get("hours", 0)
-            rating = validation.get("rating")
-            comment = validation.get("comment", "")
-
-            try:
-                participation = Participation.objects.get(id=participation_id, mission=mission)
-
-                participation.was_present = was_present
-                participation.hours_completed = hours if was_present else 0
-                participation.organization_rating = rating
-                participation.organization_comment = comment
-                participation.hours_validated = True
-                participation.validated_at = timezone.now()
-                participation.save()
-
-                # Mettre à jour les statistiques du bénévole
-                if was_present and hours > 0:
-                    volunteer = participation.volunteer
-                    volunteer.total_hours += float(hours)
-                    volunteer.completed_missions += 1
-                    volunteer.update_badge()
-
-            except Participation.DoesNotExist:
-                continue
+        participations, errors = services.validate_hours(mission, validations)
 
-        return Response({"message": "Heures validées avec succès"})
+        return Response(
+            {
+                "message": "Heures validées avec succès",
+                "validated": len(participations),
+                "errors": errors,
+            }
+        )
 
 
 # ========== ESPACE ADMIN ==========
@@ -487,8 +555,7 @@ class AdminStatsView(APIView):
             "total_missions": Mission.objects.count(),
             "active_missions": Mission.objects.filter(status="PUBLISHED").count(),
             "pending_skills": VolunteerSkill.objects.filter(status="PENDING").count(),
-            "total_hours": Volunteer.objects.aggregate(total=Sum("total_hours"))["total"]
-            or 0,
+            "total_hours": Volunteer.objects.aggregate(total=Sum("total_hours"))["total"] or 0,
         }
 
         return Response(stats)
@@ -6,29 +6,29 @@ from django.urls import path
 from rest_framework import generics, permissions
 
 from accounts.serializers import ODDSerializer
+from missions import reference
+from missions.async_views import AsyncReferenceListView, read_view
 
-from .models import ODD
 
-
-class ODDListView(generics.ListAPIView):
-    """Liste des 17 ODD"""
+class ODDListView(reference.ReferenceDataMixin, generics.ListAPIView):
+    """Liste des 17 ODD (données de référence en mémoire)"""
 
     serializer_class = ODDSerializer
     permission_classes = [permissions.AllowAny]
-    queryset = ODD.objects.filter(is_active=True)
+    catalogue = reference.odds
 
 
-class ODDDetailView(generics.RetrieveAPIView):
+class ODDDetailView(reference.ReferenceDataMixin, generics.RetrieveAPIView):
     """Détail d'un ODD"""
 
     serializer_class = ODDSerializer
     permission_classes = [permissions.AllowAny]
-    queryset = ODD.objects.filter(is_active=True)
+    catalogue = reference.odds
 
 
 app_name = "odd"
 
 urlpatterns = [
-    path("", ODDListView.as_view(), name="odd_list"),
+    path("", read_view(ODDListView, AsyncReferenceListView), name="odd_list"),
     path("<int:pk>/", ODDDetailView.as_view(), name="odd_detail"),
 ]
@@ -1,5 +1,7 @@
 from django.contrib import admin
 
+from missions import eligibility, matching
+
 from .models import Skill, VolunteerSkill
 
 
@@ -22,13 +24,19 @@ class VolunteerSkillAdmin(admin.ModelAdmin):
     def validate_skills(self, request, queryset):
         from django.utils import timezone
 
+        volunteer_ids = set(queryset.values_list("volunteer_id", flat=True))
         queryset.update(status="VALIDATED", validated_by=request.user, validated_at=timezone.now())
+        matching.volunteers.changed(*volunteer_ids)
+        eligibility.volunteer_changed(*volunteer_ids)
         self.message_user(request, f"{queryset.count()} compétences validées.")
 
     validate_skills.short_description = "Valider les compétences sélectionnées"
 
     def reject_skills(self, request, queryset):
+        volunteer_ids = set(queryset.values_list("volunteer_id", flat=True))
         queryset.update(status="REJECTED")
+        matching.volunteers.changed(*volunteer_ids)
+        eligibility.volunteer_changed(*volunteer_ids)
         self.message_user(request, f"{queryset.count()} compétences refusées.")
 
     reject_skills.short_description = "Refuser les compétences sélectionnées"
@@ -8,16 +8,18 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from accounts.serializers import SkillSerializer, VolunteerSkillSerializer
+from missions import reference
+from missions.async_views import AsyncReferenceListView, read_view
 
-from .models import Skill, VolunteerSkill
+from .models import VolunteerSkill
 
 
-class SkillListView(generics.ListAPIView):
-    """Liste de toutes les compétences disponibles"""
+class SkillListView(reference.ReferenceDataMixin, generics.ListAPIView):
+    """Liste de toutes les compétences disponibles (données de référence en mémoire)"""
 
     serializer_class = SkillSerializer
     permission_classes = [permissions.AllowAny]
-    queryset = Skill.objects.filter(is_active=True)
+    catalogue = reference.skills
 
 
 class VolunteerSkillListView(generics.ListCreateAPIView):
@@ -27,9 +29,7 @@ class VolunteerSkillListView(generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return VolunteerSkill.objects.filter(
-            volunteer=self.request.user.volunteer_profile
-        ).select_related("skill")
+        return VolunteerSkill.objects.filter(volunteer=self.request.user.volunteer_profile)
 
     def perform_create(self, serializer):
         serializer.save(volunteer=self.request.user.volunteer_profile)
@@ -79,15 +79,13 @@ class PendingSkillsView(generics.ListAPIView):
 
     serializer_class = VolunteerSkillSerializer
     permission_classes = [permissions.IsAdminUser]
-    queryset = VolunteerSkill.objects.filter(status="PENDING").select_related(
-        "volunteer__user", "skill"
-    )
+    queryset = VolunteerSkill.objects.filter(status="PENDING").select_related("volunteer__user")
 
 
 app_name = "skills"
 
 urlpatterns = [
-    path("", SkillListView.as_view(), name="skill_list"),
+    path("", read_view(SkillListView, AsyncReferenceListView), name="skill_list"),
     path("my-skills/", VolunteerSkillListView.as_view(), name="my_skills"),  # Page 10
     path("my-skills/<int:pk>/", VolunteerSkillDeleteView.as_view(), name="delete_skill"),
     # Admin
@@ -21,6 +21,37 @@ def django_db_setup():
     }
 
 
+@pytest.fixture(scope="session", autouse=True)
+def view_counter_thread():
+    """
+    Pas de thread de vidage du compteur de vues : les tests vident le tampon eux-mêmes
+    """
+    settings.VIEW_COUNTER = {**settings.VIEW_COUNTER, "FLUSH_THREAD": False}
+
+
+@pytest.fixture(autouse=True)
+def reference_data():
+    """
+    Données de référence rechargées à chaque test (la base est annulée entre deux
+    tests sans passer par les signaux)
+    """
+    from missions import reference
+
+    for catalogue in reference.CATALOGUES.values():
+        catalogue.reset()
+
+
+@pytest.fixture(autouse=True)
+def matching_index():
+    """
+    Index des recommandations reconstruit à chaque test (même raison)
+    """
+    from missions import matching
+
+    matching.missions.reset()
+    matching.volunteers.reset()
+
+
 @pytest.fixture
 def api_client():
     """
@@ -57,9 +88,7 @@ def volunteer_user(db):
         last_name="Test",
         user_type="VOLUNTEER",
     )
-    Volunteer.objects.create(
-        user=user, date_of_birth="1995-01-01", phone="0555123456", wilaya="Alger"
-    )
+    Volunteer.objects.create(user=user, date_of_birth="1995-01-01", wilaya="16")
     return user
 
 
@@ -79,15 +108,16 @@ def organization_user(db):
     )
     Organization.objects.create(
         user=user,
-        organization_name="Test ONG",
+        name="Test ONG",
         organization_type="NGO",
+        email="contact@test-ong.dz",
         phone="0555654321",
-        wilaya="Alger",
+        wilaya="16",
         address="123 Rue Test",
         description="Organisation de test",
-        representative_first_name="Rep",
-        representative_last_name="Test",
+        representative_name="Rep Test",
         representative_position="Directeur",
+        representative_email="rep@test-ong.dz",
     )
     return user
 
@@ -139,6 +169,8 @@ def sample_mission(db, organization_user, sample_odd):
     """
     Fixture pour créer une mission
     """
+    from datetime import date, time, timedelta
+
     from accounts.models import Organization
     from missions.models import Mission
 
@@ -146,14 +178,85 @@ def sample_mission(db, organization_user, sample_odd):
     return Mission.objects.create(
         organization=org,
         title="Mission Test",
-        description="Description de la mission de test",
-        cause="SOCIAL",
-        type="ONE_TIME",
+        short_description="Mission de test",
+        full_description="Description de la mission de test",
+        causes=["SOCIAL"],
+        mission_type="ONE_TIME",
         status="PUBLISHED",
-        wilaya="Alger",
-        address="123 Rue Mission",
-        start_date="2025-12-25",
-        end_date="2025-12-26",
-        max_volunteers=10,
+        wilaya="16",
+        commune="Alger Centre",
+        full_address="123 Rue Mission",
+        meeting_point="Devant la mairie",
+        date=date.today() + timedelta(days=7),
+        start_time=time(9, 0),
+        end_time=time(13, 0),
+        required_volunteers=10,
         odd=sample_odd,
     )
+
+
+@pytest.fixture
+def seeded_volumes(volunteer_user, organization_user, admin_user, sample_mission, sample_skill):
+    """
+    Fixture pour un jeu de données de volume réaliste (budgets de requêtes)
+
+    Une organisation vérifiée avec 25 missions, 20 bénévoles avec candidatures,
+    participations et compétences (dont certaines en attente), des signalements.
+    """
+    from datetime import date, timedelta
+    from types import SimpleNamespace
+
+    from accounts.models import Organization, User, Volunteer
+    from missions.models import Application, Mission, Participation, Report
+    from skills.models import Skill, VolunteerSkill
+
+    Organization.objects.filter(user=organization_user).update(is_verified=True)
+    verified_skill = Skill.objects.create(name="Secourisme", requires_verification=True)
+
+    missions = [sample_mission]
+    for i in range(24):
+        mission = Mission.objects.get(pk=sample_mission.pk)
+        mission.pk = None
+        mission._state.adding = True
+        mission.title = f"Mission {i}"
+        mission.date = date.today() + timedelta(days=i % 10 - 3)
+        mission.save()
+        missions.append(mission)
+
+    volunteers = [volunteer_user.volunteer_profile]
+    for i in range(19):
+        user = User.objects.create_user(
+            email=f"seed{i}@test.com", password="testpass123", user_type="VOLUNTEER"
+        )
+        volunteers.append(Volunteer.objects.create(user=user, wilaya="16"))
+
+    applications = []
+    for v, volunteer in enumerate(volunteers):
+        for m in range(8 if v == 0 else 4):
+            mission = missions[(v + m * 3) % len(missions)]
+            status = ("PENDING", "ACCEPTED", "REJECTED", "ACCEPTED")[(v + m) % 4]
+            applications.append(Application(mission=mission, volunteer=volunteer, status=status))
+    applications = Application.objects.bulk_create(applications)
+    participations = Participation.objects.bulk_create(
+        Participation(mission_id=a.mission_id, volunteer_id=a.volunteer_id, application=a)
+        for a in applications
+        if a.status == "ACCEPTED"
+    )
+
+    for volunteer in volunteers:
+        VolunteerSkill.objects.create(volunteer=volunteer, skill=sample_skill)
+        VolunteerSkill.objects.create(volunteer=volunteer, skill=verified_skill)
+
+    Report.objects.bulk_create(
+        Report(reporter=volunteer.user, report_type="MISSION", mission=missions[0], reason="Test")
+        for volunteer in volunteers[:5]
+    )
+
+    return SimpleNamespace(
+        missions=missions,
+        volunteers=volunteers,
+        applications=applications,
+        participations=participations,
+        pending_skill=VolunteerSkill.objects.filter(status="PENDING").first(),
+        own_skill=VolunteerSkill.objects.filter(volunteer=volunteers[0]).first(),
+    )
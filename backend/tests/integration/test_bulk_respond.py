@@ -0,0 +1,134 @@
+"""
+Tests d'Intégration - Réponse groupée aux candidatures d'une mission
+"""
+
+import pytest
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User, Volunteer
+from missions.models import Application, Mission, Participation
+
+
+@pytest.fixture
+def org_client(api_client, organization_user):
+    token = RefreshToken.for_user(organization_user).access_token
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return api_client
+
+
+def _applications(mission, count):
+    applications = []
+    for i in range(count):
+        user = User.objects.create_user(
+            email=f"bulk{i}@test.com", password="testpass123", user_type="VOLUNTEER"
+        )
+        volunteer = Volunteer.objects.create(user=user)
+        applications.append(Application.objects.create(mission=mission, volunteer=volunteer))
+    return applications
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestBulkRespondAPI:
+    """Tests de POST /api/missions/organization/mission/<id>/applications/respond/"""
+
+    def _url(self, mission):
+        return reverse("missions:bulk_respond_applications", args=[mission.pk])
+
+    def test_batch_enforces_remaining_capacity(self, org_client, sample_mission):
+        """Test: Les acceptations au-delà de la capacité sont refusées élément par élément"""
+        Mission.objects.filter(pk=sample_mission.pk).update(required_volunteers=3)
+        applications = _applications(sample_mission, 5)
+
+        response = org_client.post(
+            self._url(sample_mission),
+            {"decisions": [{"application_id": a.pk, "action": "accept"} for a in applications]},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        assert response.data["accepted"] == 3
+        assert response.data["remaining_places"] == 0
+        assert [r.get("error") for r in response.data["results"]] == [None] * 3 + [
+            "Mission complète"
+        ] * 2
+        sample_mission.refresh_from_db()
+        assert sample_mission.accepted_volunteers == 3
+        assert Participation.objects.filter(mission=sample_mission).count() == 3
+
+    def test_rejecting_accepted_frees_places_for_the_batch(self, org_client, sample_mission):
+        """Test: Un refus d'une candidature acceptée libère sa place pour le même lot"""
+        Mission.objects.filter(pk=sample_mission.pk).update(required_volunteers=1)
+        first, second = _applications(sample_mission, 2)
+        org_client.post(
+            self._url(sample_mission),
+            {"decisions": [{"application_id": first.pk, "action": "accept"}]},
+            format="json",
+        )
+
+        response = org_client.post(
+            self._url(sample_mission),
+            {
+                "decisions": [
+                    {"application_id": second.pk, "action": "accept"},
+                    {"application_id": first.pk, "action": "reject", "message": "Désolé"},
+                ]
+            },
+            format="json",
+        )
+
+        assert response.data["accepted"] == 1
+        assert response.data["rejected"] == 1
+        first.refresh_from_db()
+        assert first.status == "REJECTED"
+        assert first.organization_message == "Désolé"
+        assert list(
+            Participation.objects.filter(mission=sample_mission).values_list(
+                "application_id", flat=True
+            )
+        ) == [second.pk]
+
+    def test_unknown_and_invalid_items_are_reported(self, org_client, sample_mission):
+        """Test: Les éléments invalides sont signalés sans bloquer le lot"""
+        (application,) = _applications(sample_mission, 1)
+
+        response = org_client.post(
+            self._url(sample_mission),
+            {
+                "decisions": [
+                    {"application_id": 999999, "action": "accept"},
+                    {"application_id": application.pk, "action": "maybe"},
+                    {"application_id": application.pk, "action": "reject"},
+                ]
+            },
+            format="json",
+        )
+
+        assert [r.get("error") for r in response.data["results"]] == [
+            "Candidature non trouvée",
+            "Action invalide",
+            None,
+        ]
+
+    def test_query_count_does_not_grow_with_batch(
+        self, org_client, sample_mission, django_assert_max_num_queries
+    ):
+        """Test: Le nombre de requêtes est indépendant de la taille du lot"""
+        Mission.objects.filter(pk=sample_mission.pk).update(required_volunteers=50)
+        applications = _applications(sample_mission, 40)
+
+        with django_assert_max_num_queries(12):
+            response = org_client.post(
+                self._url(sample_mission),
+                {
+                    "decisions": [
+                        {"application_id": a.pk, "action": "accept" if i % 2 else "reject"}
+                        for i, a in enumerate(applications)
+                    ]
+                },
+                format="json",
+            )
+
+        assert response.data["accepted"] == 20
+        assert response.data["rejected"] == 20
@@ -0,0 +1,133 @@
+"""
+Tests d'Intégration - Contention sur la capacité d'une mission
+Benchmark: de nombreux threads acceptent des candidatures sur la même mission
+"""
+
+import threading
+import time
+
+import pytest
+from django.db import OperationalError, connection
+
+from accounts.models import User, Volunteer
+from missions import services
+from missions.models import Application, Mission, Participation
+
+THREADS = 16
+APPLICATIONS = 60
+CAPACITY = 10
+
+
+def _hammer(application_ids, outcomes, barrier):
+    """Accepte une série de candidatures dès que tous les threads sont prêts"""
+    barrier.wait()
+    try:
+        for application_id in application_ids:
+            application = Application(pk=application_id)
+            for _ in range(50):
+                try:
+                    services.accept_application(application)
+                    outcomes.append("accepted")
+                except services.MissionFullError:
+                    outcomes.append("full")
+                except OperationalError:
+                    # Interblocage ou verrou transitoire : on réessaie
+                    time.sleep(0.005)
+                    continue
+                break
+    finally:
+        connection.close()
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+@pytest.mark.django_db(transaction=True)
+class TestCapacityContention:
+    """La mission ne doit jamais être surréservée, quelle que soit la concurrence"""
+
+    def test_concurrent_accepts_never_overbook(self, sample_mission):
+        """
+        Benchmark: THREADS threads acceptent APPLICATIONS candidatures
+        pour une mission de CAPACITY places
+        """
+        if connection.vendor != "postgresql":
+            pytest.skip("Verrouillage de lignes (SELECT ... FOR UPDATE) requis : PostgreSQL")
+        Mission.objects.filter(pk=sample_mission.pk).update(required_volunteers=CAPACITY)
+        application_ids = []
+        for i in range(APPLICATIONS):
+            user = User.objects.create_user(
+                email=f"contention{i}@test.com", password="testpass123", user_type="VOLUNTEER"
+            )
+            volunteer = Volunteer.objects.create(user=user)
+            application_ids.append(
+                Application.objects.create(mission=sample_mission, volunteer=volunteer).pk
+            )
+
+        outcomes = []
+        barrier = threading.Barrier(THREADS)
+        threads = [
+            threading.Thread(target=_hammer, args=(application_ids[i::THREADS], outcomes, barrier))
+            for i in range(THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        sample_mission.refresh_from_db()
+        assert len(outcomes) == APPLICATIONS
+        assert outcomes.count("accepted") == CAPACITY
+        assert outcomes.count("full") == APPLICATIONS - CAPACITY
+        assert sample_mission.accepted_volunteers == CAPACITY
+        assert Participation.objects.filter(mission=sample_mission).count() == CAPACITY
+        assert (
+            Application.objects.filter(mission=sample_mission, status="ACCEPTED").count()
+            == CAPACITY
+        )
+
+    def test_single_and_bulk_responses_do_not_deadlock(self, sample_mission):
+        """
+        Test: réponses unitaires et lots simultanés sur la même mission -> même
+        ordre de verrouillage (mission puis candidatures), aucun interblocage
+        """
+        if connection.vendor != "postgresql":
+            pytest.skip("Verrouillage de lignes (SELECT ... FOR UPDATE) requis : PostgreSQL")
+        Mission.objects.filter(pk=sample_mission.pk).update(required_volunteers=APPLICATIONS)
+        application_ids = []
+        for i in range(APPLICATIONS):
+            user = User.objects.create_user(
+                email=f"ordre{i}@test.com", password="testpass123", user_type="VOLUNTEER"
+            )
+            volunteer = Volunteer.objects.create(user=user)
+            application_ids.append(
+                Application.objects.create(mission=sample_mission, volunteer=volunteer).pk
+            )
+
+        errors = []
+        barrier = threading.Barrier(THREADS)
+
+        def respond(index):
+            barrier.wait()
+            try:
+                for _ in range(5):
+                    if index % 2:
+                        for application_id in application_ids[index::THREADS]:
+                            services.reject_application(Application(pk=application_id))
+                    else:
+                        decisions = [
+                            {"application_id": application_id, "action": "accept"}
+                            for application_id in reversed(application_ids)
+                        ]
+                        services.respond_to_applications(sample_mission, decisions)
+            except OperationalError as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=respond, args=(i,)) for i in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
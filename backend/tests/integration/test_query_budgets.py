@@ -0,0 +1,223 @@
+"""
+Tests d'Intégration - Budget de requêtes SQL par endpoint et détection des N+1
+Voir tests/query_budget.py (régénération : UPDATE_QUERY_BUDGETS=1)
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from django.core.cache import cache
+from django.urls import get_resolver, reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from missions import matching, reference
+from tests import query_budget
+
+
+def _endpoint(role, method="get", kwargs=None, data=None, expected=200):
+    return SimpleNamespace(
+        role=role,
+        method=method,
+        kwargs=kwargs or (lambda seed: {}),
+        data=data or (lambda seed: None),
+        expected=expected,
+    )
+
+
+def _past_mission(seed):
+    return seed.missions[1]
+
+
+def _pending_application(seed):
+    return next(a for a in seed.applications if a.status == "PENDING")
+
+
+ORGANIZATION_DESCRIPTION = "Association de quartier engagée dans l'entraide. " * 12
+
+# Chaque URL des modules accounts, missions, skills et odd
+ENDPOINTS = {
+    # ----- Comptes -----
+    "accounts:register_volunteer": _endpoint(
+        "anonymous",
+        "post",
+        data=lambda seed: {
+            "email": "budget@test.com",
+            "password": "testpass123",
+            "password_confirm": "testpass123",
+            "first_name": "Budget",
+            "last_name": "Test",
+        },
+        expected=201,
+    ),
+    "accounts:register_organization": _endpoint(
+        "anonymous",
+        "post",
+        data=lambda seed: {
+            "email": "budget-org@test.com",
+            "password": "testpass123",
+            "password_confirm": "testpass123",
+            "name": "Budget ONG",
+            "organization_type": "NGO",
+            "email_org": "contact@budget.dz",
+            "phone": "0555000000",
+            "wilaya": "16",
+            "address": "1 Rue Budget",
+            "representative_name": "Rep",
+            "representative_position": "Président",
+            "representative_email": "rep@budget.dz",
+            "description": ORGANIZATION_DESCRIPTION,
+        },
+        expected=201,
+    ),
+    "accounts:login": _endpoint(
+        "anonymous",
+        "post",
+        data=lambda seed: {"email": "volunteer@test.com", "password": "testpass123"},
+    ),
+    "accounts:token_refresh": _endpoint(
+        "anonymous",
+        "post",
+        data=lambda seed: {"refresh": str(RefreshToken.for_user(seed.volunteers[0].user))},
+    ),
+    "accounts:volunteer_profile": _endpoint("volunteer"),
+    "accounts:organization_profile": _endpoint("organization"),
+    # ----- Missions : pages publiques -----
+    "missions:mission_list": _endpoint("anonymous"),
+    "missions:mission_facets": _endpoint("anonymous"),
+    "missions:mission_detail": _endpoint(
+        "anonymous", kwargs=lambda seed: {"pk": seed.missions[2].pk}
+    ),
+    "missions:organization_profile": _endpoint(
+        "anonymous", kwargs=lambda seed: {"pk": seed.missions[0].organization_id}
+    ),
+    "missions:home_stats": _endpoint("anonymous"),
+    # ----- Missions : espace bénévole -----
+    "missions:volunteer_dashboard": _endpoint("volunteer"),
+    "missions:apply": _endpoint(
+        "volunteer",
+        "post",
+        kwargs=lambda seed: {"mission_id": seed.missions[5].pk},
+        data=lambda seed: {"message": "Je suis disponible"},
+        expected=201,
+    ),
+    "missions:volunteer_recommendations": _endpoint("volunteer"),
+    "missions:my_applications": _endpoint("volunteer"),
+    "missions:my_missions": _endpoint("volunteer"),
+    # ----- Missions : espace organisation -----
+    "missions:organization_dashboard": _endpoint("organization"),
+    "missions:organization_missions": _endpoint("organization"),
+    "missions:mission_applications": _endpoint(
+        "organization", kwargs=lambda seed: {"mission_id": seed.missions[0].pk}
+    ),
+    "missions:mission_candidates": _endpoint(
+        "organization", kwargs=lambda seed: {"mission_id": seed.missions[0].pk}
+    ),
+    "missions:respond_application": _endpoint(
+        "organization",
+        "post",
+        kwargs=lambda seed: {"application_id": _pending_application(seed).pk},
+        data=lambda seed: {"action": "reject", "message": "Merci"},
+    ),
+    "missions:bulk_respond_applications": _endpoint(
+        "organization",
+        "post",
+        kwargs=lambda seed: {"mission_id": seed.missions[3].pk},
+        data=lambda seed: {
+            "decisions": [
+                {"application_id": a.pk, "action": "reject"}
+                for a in seed.applications
+                if a.mission_id == seed.missions[3].pk
+            ]
+        },
+    ),
+    "missions:validate_hours": _endpoint(
+        "organization",
+        "post",
+        kwargs=lambda seed: {"mission_id": _past_mission(seed).pk},
+        data=lambda seed: {
+            "validations": [
+                {"participation_id": p.pk, "was_present": True, "hours": 3, "rating": 5}
+                for p in seed.participations
+                if p.mission_id == _past_mission(seed).pk
+            ]
+        },
+    ),
+    # ----- Missions : admin -----
+    "missions:admin_stats": _endpoint("admin"),
+    # ----- Compétences -----
+    "skills:skill_list": _endpoint("anonymous"),
+    "skills:my_skills": _endpoint("volunteer"),
+    "skills:delete_skill": _endpoint(
+        "volunteer", "delete", kwargs=lambda seed: {"pk": seed.own_skill.pk}, expected=204
+    ),
+    "skills:validate_skill": _endpoint(
+        "admin",
+        "post",
+        kwargs=lambda seed: {"skill_id": seed.pending_skill.pk},
+        data=lambda seed: {"action": "validate"},
+    ),
+    "skills:pending_skills": _endpoint("admin"),
+    # ----- ODD -----
+    "odd:odd_list": _endpoint("anonymous"),
+    "odd:odd_detail": _endpoint("anonymous", kwargs=lambda seed: {"pk": seed.missions[0].odd_id}),
+}
+
+BUDGETED_NAMESPACES = ("accounts", "missions", "skills", "odd")
+
+
+@pytest.fixture
+def client_for(api_client, volunteer_user, organization_user, admin_user):
+    users = {"volunteer": volunteer_user, "organization": organization_user, "admin": admin_user}
+
+    def _client(role):
+        if role != "anonymous":
+            token = RefreshToken.for_user(users[role]).access_token
+            api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return api_client
+
+    return _client
+
+
+@pytest.mark.integration
+class TestQueryBudgets:
+    """Nombre de requêtes de chaque endpoint sur un jeu de données réaliste"""
+
+    def test_every_url_has_a_budgeted_endpoint(self):
+        """Test: Toute nouvelle URL doit être ajoutée au harnais"""
+        names = set()
+        for pattern in get_resolver().url_patterns:
+            namespace = getattr(pattern, "namespace", None)
+            if namespace in BUDGETED_NAMESPACES:
+                names.update(f"{namespace}:{p.name}" for p in pattern.url_patterns)
+
+        assert names == set(ENDPOINTS)
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize("name", sorted(ENDPOINTS))
+    def test_endpoint_query_budget(self, name, seeded_volumes, client_for):
+        """Test: Pas de N+1 et pas plus de requêtes que le budget enregistré"""
+        endpoint = ENDPOINTS[name]
+        client = client_for(endpoint.role)
+        url = reverse(name, kwargs=endpoint.kwargs(seeded_volumes))
+        data = endpoint.data(seeded_volumes)
+        cache.clear()  # chemin à froid : budgets indépendants de l'ordre des tests
+        reference.warm()  # ODD et compétences : chargés une fois par worker, pas par requête
+        matching.missions.warm()  # index des recommandations : idem
+        matching.volunteers.warm()
+
+        with query_budget.QueryRecorder() as recorder:
+            response = getattr(client, endpoint.method)(url, data, format="json")
+
+        assert response.status_code == endpoint.expected, response.content
+        assert (
+            not recorder.repeated_shapes()
+        ), f"{name} : requêtes répétées (N+1 probable)\n{recorder.report()}"
+
+        if query_budget.updating_budgets():
+            query_budget.save_budget(name, recorder.count)
+            return
+        budget = query_budget.load_budgets().get(name)
+        assert budget is not None, f"{name} : pas de budget, lancer avec UPDATE_QUERY_BUDGETS=1"
+        assert (
+            recorder.count <= budget
+        ), f"{name} : {recorder.count} requêtes pour un budget de {budget}\n{recorder.report()}"
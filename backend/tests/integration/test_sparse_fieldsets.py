@@ -0,0 +1,140 @@
+"""
+Tests d'Intégration - Représentations compactes, ?fields= et ?expand=
+"""
+
+import pytest
+from django.urls import reverse
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.serializers import (
+    ApplicationSerializer,
+    MissionListSerializer,
+    VolunteerSkillSerializer,
+    parse_field_paths,
+)
+from missions.models import Application
+
+
+@pytest.fixture
+def organization_client(api_client, organization_user):
+    token = RefreshToken.for_user(organization_user).access_token
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return api_client
+
+
+@pytest.fixture
+def application(sample_mission, volunteer_user):
+    return Application.objects.create(
+        mission=sample_mission, volunteer=volunteer_user.volunteer_profile
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    """Tests des réponses à la carte sur les listes"""
+
+    def test_parse_field_paths(self):
+        """Test: chemins pointés regroupés par champ de premier niveau"""
+        assert parse_field_paths("id, mission.title,mission.odd.number,,volunteer") == {
+            "id": {""},
+            "mission": {"title", "odd.number"},
+            "volunteer": {""},
+        }
+
+    def test_mission_list_nests_compact_organization_and_odd(self, api_client, sample_mission):
+        """Test: organisation et ODD compacts par défaut"""
+        response = api_client.get(reverse("missions:mission_list"))
+
+        mission = response.data["results"][0]
+        assert set(mission["organization"]) == {"id", "name", "logo"}
+        assert set(mission["odd"]) == {"id", "number", "title_fr", "color", "icon"}
+
+    def test_expand_restores_full_representations(self, api_client, sample_mission):
+        """Test: ?expand= rend le profil public et l'ODD complets"""
+        response = api_client.get(reverse("missions:mission_list"), {"expand": "organization,odd"})
+
+        mission = response.data["results"][0]
+        assert mission["organization"]["description"] == "Organisation de test"
+        assert "description_fr" in mission["odd"]
+
+    def test_fields_limits_top_level_and_nested_fields(self, api_client, sample_mission):
+        """Test: ?fields= avec chemins pointés"""
+        response = api_client.get(
+            reverse("missions:mission_list"), {"fields": "id,title,organization.name"}
+        )
+
+        assert response.status_code == 200
+        assert response.data["results"] == [
+            {
+                "id": sample_mission.pk,
+                "title": "Mission Test",
+                "organization": {"name": "Test ONG"},
+            }
+        ]
+        # La pagination par curseur n'est pas affectée
+        assert "next" in response.data
+
+    def test_unknown_names_are_ignored(self, api_client, sample_mission):
+        """Test: champ ou expansion inconnus sans erreur"""
+        response = api_client.get(
+            reverse("missions:mission_list"), {"fields": "id,nope", "expand": "nope"}
+        )
+
+        assert response.status_code == 200
+        assert response.data["results"] == [{"id": sample_mission.pk}]
+
+    def test_applications_nest_compact_volunteer(self, organization_client, application):
+        """Test: bénévole compact dans les candidatures, complet avec ?expand=volunteer"""
+        url = reverse("missions:mission_applications", args=[application.mission_id])
+
+        compact = organization_client.get(url).data["results"][0]["volunteer"]
+        full = organization_client.get(url, {"expand": "volunteer"}).data["results"][0]
+
+        assert compact["first_name"] == "Bénévole"
+        assert "user" not in compact and "availability" not in compact
+        assert full["volunteer"]["user"]["email"] == "volunteer@test.com"
+        assert "latitude" not in full["volunteer"] and "longitude" not in full["volunteer"]
+        assert set(full["mission"]["organization"]) == {"id", "name", "logo"}
+
+    def test_nested_expand_with_dotted_path(self, organization_client, application):
+        """Test: ?expand=mission.organization traverse la mission imbriquée"""
+        url = reverse("missions:mission_applications", args=[application.mission_id])
+
+        response = organization_client.get(
+            url, {"expand": "mission.organization", "fields": "id,mission.organization"}
+        )
+
+        row = response.data["results"][0]
+        assert set(row) == {"id", "mission"}
+        assert set(row["mission"]) == {"organization"}
+        assert row["mission"]["organization"]["description"] == "Organisation de test"
+
+    def test_reference_lists_accept_fields(self, api_client, sample_odd, sample_skill):
+        """Test: ?fields= sur les listes d'ODD et de compétences"""
+        odds = api_client.get(reverse("odd:odd_list"), {"fields": "id,number"})
+        skills = api_client.get(reverse("skills:skill_list"), {"fields": "id,name"})
+
+        odd_rows = odds.data["results"] if isinstance(odds.data, dict) else odds.data
+        skill_rows = skills.data["results"] if isinstance(skills.data, dict) else skills.data
+        assert odd_rows == [{"id": sample_odd.pk, "number": 1}]
+        assert skill_rows == [{"id": sample_skill.pk, "name": sample_skill.name}]
+
+    def test_constructor_arguments_without_request(self, application):
+        """Test: fields/expand passés au constructeur (hors vue)"""
+        data = ApplicationSerializer(
+            [application], many=True, fields=["id", "volunteer.badge_level"]
+        ).data
+        mission = MissionListSerializer(application.mission, expand="organization").data
+
+        assert data == [{"id": application.pk, "volunteer": {"badge_level": "BRONZE"}}]
+        assert "description" in mission["organization"]
+
+    def test_fields_are_ignored_on_writes(self):
+        """Test: ?fields= ne retire aucun champ d'un sérialiseur en écriture"""
+        request = Request(APIRequestFactory().post("/?fields=id"))
+        serializer = VolunteerSkillSerializer(data={}, context={"request": request})
+
+        assert {"id", "skill", "skill_id", "status"} <= set(serializer.fields)
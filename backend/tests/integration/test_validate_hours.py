@@ -0,0 +1,163 @@
+"""
+Tests d'Intégration - Validation groupée des heures d'une mission
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User, Volunteer
+from missions import services
+from missions.models import Application, Mission, Participation, SiteStats
+
+
+@pytest.fixture
+def org_client(api_client, organization_user):
+    token = RefreshToken.for_user(organization_user).access_token
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return api_client
+
+
+@pytest.fixture
+def past_mission(sample_mission):
+    Mission.objects.filter(pk=sample_mission.pk).update(
+        date=timezone.now().date() - timedelta(days=1)
+    )
+    sample_mission.refresh_from_db()
+    return sample_mission
+
+
+def _participations(mission, count):
+    participations = []
+    for i in range(count):
+        user = User.objects.create_user(
+            email=f"hours{i}@test.com", password="testpass123", user_type="VOLUNTEER"
+        )
+        volunteer = Volunteer.objects.create(user=user)
+        participations.append(Participation.objects.create(mission=mission, volunteer=volunteer))
+    return participations
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestValidateHoursAPI:
+    """Tests de POST /api/missions/organization/mission/<id>/validate-hours/"""
+
+    def _url(self, mission):
+        return reverse("missions:validate_hours", args=[mission.pk])
+
+    def test_updates_participations_and_volunteer_stats(self, org_client, past_mission):
+        """Test: Les heures sont validées et les statistiques du bénévole recalculées"""
+        present, absent = _participations(past_mission, 2)
+
+        response = org_client.post(
+            self._url(past_mission),
+            {
+                "validations": [
+                    {"participation_id": present.pk, "was_present": True, "hours": 60, "rating": 4},
+                    {"participation_id": absent.pk, "was_present": False, "hours": 5},
+                ]
+            },
+            format="json",
+        )
+
+        assert response.status_code == 200
+        assert response.data["validated"] == 2
+        present.refresh_from_db()
+        assert present.hours_validated
+        assert present.hours_completed == Decimal("60")
+        volunteer = present.volunteer
+        volunteer.refresh_from_db()
+        assert volunteer.total_hours == Decimal("60")
+        assert volunteer.completed_missions == 1
+        assert volunteer.average_rating == Decimal("4.00")
+        assert volunteer.badge_level == "SILVER"
+        absent.refresh_from_db()
+        assert absent.hours_completed == 0
+        assert absent.volunteer.completed_missions == 0
+
+    def test_replay_is_idempotent(self, org_client, past_mission):
+        """Test: Rejouer la même validation ne compte pas les heures deux fois"""
+        (participation,) = _participations(past_mission, 1)
+        payload = {
+            "validations": [{"participation_id": participation.pk, "was_present": True, "hours": 4}]
+        }
+
+        org_client.post(self._url(past_mission), payload, format="json")
+        org_client.post(self._url(past_mission), payload, format="json")
+
+        volunteer = Volunteer.objects.get(pk=participation.volunteer_id)
+        assert volunteer.total_hours == Decimal("4")
+        assert volunteer.completed_missions == 1
+
+    def test_reject_after_validation_removes_hours(self, org_client, past_mission):
+        """Test: Refuser une candidature aux heures validées retire ces heures"""
+        (participation,) = _participations(past_mission, 1)
+        application = Application.objects.create(
+            mission=past_mission, volunteer=participation.volunteer, status="ACCEPTED"
+        )
+        Participation.objects.filter(pk=participation.pk).update(application=application)
+        org_client.post(
+            self._url(past_mission),
+            {
+                "validations": [
+                    {"participation_id": participation.pk, "was_present": True, "hours": 60}
+                ]
+            },
+            format="json",
+        )
+        assert SiteStats.objects.get().total_hours == Decimal("60")
+
+        services.reject_application(application)
+
+        volunteer = Volunteer.objects.get(pk=participation.volunteer_id)
+        assert volunteer.total_hours == 0
+        assert volunteer.completed_missions == 0
+        assert volunteer.badge_level == "BRONZE"
+        assert SiteStats.objects.get().total_hours == 0
+
+    def test_invalid_and_unknown_items_are_reported(self, org_client, past_mission):
+        """Test: Les éléments invalides ou inconnus sont signalés sans bloquer le lot"""
+        (participation,) = _participations(past_mission, 1)
+
+        response = org_client.post(
+            self._url(past_mission),
+            {
+                "validations": [
+                    {"participation_id": participation.pk, "was_present": True, "hours": 3},
+                    {"participation_id": 999999, "was_present": True, "hours": 3},
+                    {"participation_id": 5, "was_present": True, "hours": 3, "rating": 9},
+                ]
+            },
+            format="json",
+        )
+
+        assert response.data["validated"] == 1
+        assert response.data["errors"] == {
+            "999999": "Participation non trouvée",
+            "5": "La note doit être comprise entre 1 et 5",
+        }
+
+    def test_query_count_does_not_grow_with_batch(
+        self, org_client, past_mission, django_assert_max_num_queries
+    ):
+        """Test: Le nombre de requêtes est indépendant de la taille du lot"""
+        participations = _participations(past_mission, 40)
+
+        with django_assert_max_num_queries(10):
+            response = org_client.post(
+                self._url(past_mission),
+                {
+                    "validations": [
+                        {"participation_id": p.pk, "was_present": True, "hours": 2}
+                        for p in participations
+                    ]
+                },
+                format="json",
+            )
+
+        assert response.data["validated"] == 40
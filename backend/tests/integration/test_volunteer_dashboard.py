@@ -0,0 +1,86 @@
+"""
+Tests d'Intégration - Tableau de bord bénévole
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from missions import reference
+from missions.models import Application, Mission
+
+# Authentification (utilisateur) + profil bénévole + compteurs + candidatures
+QUERY_BUDGET = 4
+
+
+@pytest.fixture
+def volunteer_client(api_client, volunteer_user):
+    token = RefreshToken.for_user(volunteer_user).access_token
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return api_client
+
+
+def _history(sample_mission, volunteer, specs):
+    """Crée une mission et une candidature par (décalage en jours, statut)"""
+    applications = []
+    for days, application_status in specs:
+        mission = Mission.objects.get(pk=sample_mission.pk)
+        mission.pk = None
+        mission._state.adding = True
+        mission.date = timezone.now().date() + timedelta(days=days)
+        mission.save()
+        applications.append(
+            Application.objects.create(
+                mission=mission, volunteer=volunteer, status=application_status
+            )
+        )
+    return applications
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestVolunteerDashboardAPI:
+    """Tests de GET /api/missions/volunteer/dashboard/"""
+
+    url = reverse("missions:volunteer_dashboard")
+
+    def test_counters_and_lists(self, volunteer_client, volunteer_user, sample_mission):
+        """Test: Compteurs, prochaines missions et candidatures récentes"""
+        volunteer = volunteer_user.volunteer_profile
+        applications = _history(
+            sample_mission,
+            volunteer,
+            [(5, "ACCEPTED"), (-5, "ACCEPTED"), (3, "PENDING"), (4, "PENDING")]
+            + [(10, "REJECTED")] * 4
+            + [(8, "ACCEPTED")],
+        )
+
+        response = volunteer_client.get(self.url)
+
+        assert response.status_code == 200
+        assert response.data["stats"] == {"pending_applications": 2, "accepted_missions": 2}
+        assert [a["id"] for a in response.data["upcoming_missions"]] == [
+            applications[8].pk,
+            applications[0].pk,
+        ]
+        assert [a["id"] for a in response.data["recent_applications"]] == [
+            a.pk for a in applications[::-1][:5]
+        ]
+        assert "volunteer" not in response.data["recent_applications"][0]
+        assert response.data["recent_applications"][0]["mission"]["organization"]["name"]
+
+    def test_query_budget(
+        self, volunteer_client, volunteer_user, sample_mission, django_assert_num_queries
+    ):
+        """Test: Le nombre de requêtes est fixe quel que soit l'historique"""
+        _history(sample_mission, volunteer_user.volunteer_profile, [(5, "ACCEPTED")] * 30)
+        reference.warm()  # ODD : chargés une fois par worker, pas par requête
+
+        with django_assert_num_queries(QUERY_BUDGET):
+            response = volunteer_client.get(self.url)
+
+        assert len(response.data["upcoming_missions"]) == 3
+        assert len(response.data["recent_applications"]) == 5
@@ -0,0 +1,92 @@
+"""
+Support de tests : budget de requêtes SQL par endpoint et détection des N+1
+
+Chaque endpoint est appelé sur un jeu de données de volume réaliste (fixture
+``seeded_volumes``) pendant que ``QueryRecorder`` capture les requêtes. Deux
+contrôles :
+
+- le nombre de requêtes ne dépasse pas le budget de ``query_budgets.json`` ;
+- aucune « forme » de requête (SQL sans ses valeurs) n'est répétée plus de
+  ``REPEAT_LIMIT`` fois, signe d'une requête par ligne sérialisée (N+1).
+
+Pour régénérer le fichier de budgets après une modification volontaire :
+
+    UPDATE_QUERY_BUDGETS=1 pytest tests/integration/test_query_budgets.py
+"""
+
+import json
+import os
+import re
+from collections import Counter
+from pathlib import Path
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+BUDGET_FILE = Path(__file__).with_name("query_budgets.json")
+UPDATE_ENV = "UPDATE_QUERY_BUDGETS"
+
+# Au-delà, une même forme de requête est considérée comme un N+1
+REPEAT_LIMIT = 2
+
+_IGNORED_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN \((?:\?(?:, )?)+\)")
+
+
+def query_shape(sql):
+    """SQL sans ses valeurs : deux requêtes de même forme ne diffèrent que par leurs paramètres"""
+    shape = _STRING.sub("?", sql)
+    shape = _NUMBER.sub("?", shape)
+    shape = shape.replace("%s", "?")
+    return _IN_LIST.sub("IN (...)", shape)
+
+
+class QueryRecorder(CaptureQueriesContext):
+    """Capture les requêtes d'un bloc et regroupe celles de même forme"""
+
+    def __init__(self):
+        super().__init__(connection)
+
+    @property
+    def statements(self):
+        return [
+            query["sql"]
+            for query in self.captured_queries
+            if not query["sql"].startswith(_IGNORED_PREFIXES)
+        ]
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def repeated_shapes(self, limit=REPEAT_LIMIT):
+        """Formes exécutées plus de ``limit`` fois, avec leur nombre d'exécutions"""
+        counts = Counter(query_shape(sql) for sql in self.statements)
+        return {shape: count for shape, count in counts.items() if count > limit}
+
+    def report(self, width=160):
+        return "\n".join(
+            f"  {index}. {sql[:width]}" for index, sql in enumerate(self.statements, 1)
+        )
+
+
+def updating_budgets():
+    return os.environ.get(UPDATE_ENV) == "1"
+
+
+def load_budgets():
+    if not BUDGET_FILE.exists():
+        return {}
+    return json.loads(BUDGET_FILE.read_text(encoding="utf-8"))
+
+
+def save_budget(name, count):
+    """Enregistre le nombre de requêtes mesuré pour un endpoint (mode mise à jour)"""
+    budgets = load_budgets()
+    budgets[name] = count
+    BUDGET_FILE.write_text(
+        json.dumps(dict(sorted(budgets.items())), indent=2, ensure_ascii=False) + "\n",
+        encoding="utf-8",
+    )
@@ -0,0 +1,165 @@
+"""
+Tests Unitaires - Vues asynchrones des lectures publiques (mode ASGI)
+"""
+
+import json
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import RequestFactory
+
+from missions import async_views
+from missions.view_counter import get_view_counter
+from missions.views import HomePageStatsView, MissionDetailView, MissionListView
+from odd.urls import ODDListView
+from skills.urls import SkillListView
+
+BROWSER_UA = "Mozilla/5.0 (X11; Linux x86_64) Firefox/120.0"
+
+
+@pytest.fixture
+def clean_cache():
+    cache.clear()
+    # Compteur global partagé entre les tests : tampon vide, pas de vidage pendant le test
+    counter = get_view_counter()
+    counter.buffer.drain()
+    counter._last_flush = time.monotonic()
+    yield
+    counter.buffer.drain()
+    cache.clear()
+
+
+def _request(path, ip="10.0.0.1", **extra):
+    return RequestFactory().get(path, REMOTE_ADDR=ip, HTTP_USER_AGENT=BROWSER_UA, **extra)
+
+
+def _render(response):
+    # Rendu fait par le gestionnaire de Django hors RequestFactory
+    if hasattr(response, "render"):
+        response.render()
+    return response
+
+
+def _both(drf_view, async_view, path, kwargs=None, **extra):
+    """Réponses de la vue DRF puis de la vue asynchrone à la même requête"""
+    kwargs = kwargs or {}
+    sync_response = drf_view.as_view()(_request(path, **extra), **kwargs)
+    view = async_view.as_view(drf_view)
+    async_response = async_to_sync(view)(_request(path, ip="10.0.0.2", **extra), **kwargs)
+    return _render(sync_response), _render(async_response)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestAsyncReadViews:
+    """Tests de parité entre les vues asynchrones et les vues DRF"""
+
+    @pytest.mark.parametrize(
+        "query",
+        ["", "?page_size=1", "?fields=id,title,odd.number", "?expand=odd&ordering=-created_at"],
+    )
+    def test_mission_list(self, clean_cache, sample_mission, query):
+        """Test: même corps et mêmes en-têtes pour le catalogue des missions"""
+        sync_response, async_response = _both(
+            MissionListView, async_views.AsyncMissionListView, f"/api/missions/{query}"
+        )
+
+        assert async_response.status_code == 200
+        assert json.loads(async_response.content) == json.loads(sync_response.content)
+        assert async_response["Content-Type"] == sync_response["Content-Type"]
+
+    def test_mission_list_cursor(self, clean_cache, sample_mission):
+        """Test: le curseur de la page suivante est suivi à l'identique"""
+        for index in range(3):
+            sample_mission.pk = None
+            sample_mission.title = f"Mission {index}"
+            sample_mission.save()
+
+        view = async_views.AsyncMissionListView.as_view(MissionListView)
+        first = json.loads(async_to_sync(view)(_request("/api/missions/?page_size=2")).content)
+        sync_response, async_response = _both(
+            MissionListView, async_views.AsyncMissionListView, first["next"]
+        )
+
+        assert json.loads(async_response.content) == json.loads(sync_response.content)
+        assert len(json.loads(async_response.content)["results"]) == 2
+
+    def test_mission_detail_not_modified_and_view_count(self, clean_cache, sample_mission):
+        """Test: même ETag, 304 et vue comptée comme la vue DRF"""
+        path = f"/api/missions/{sample_mission.pk}/"
+        kwargs = {"pk": sample_mission.pk}
+        sync_response, async_response = _both(
+            MissionDetailView, async_views.AsyncMissionDetailView, path, kwargs
+        )
+
+        assert async_response.status_code == 200
+        assert async_response["ETag"] == sync_response["ETag"]
+        assert async_response["Cache-Control"] == sync_response["Cache-Control"]
+        assert get_view_counter().current_count(sample_mission) == 2
+
+        view = async_views.AsyncMissionDetailView.as_view(MissionDetailView)
+        request = _request(path, ip="10.0.0.3", HTTP_IF_NONE_MATCH=sync_response["ETag"])
+        response = async_to_sync(view)(request, **kwargs)
+        assert response.status_code == 304
+        assert get_view_counter().current_count(sample_mission) == 3
+
+    def test_mission_detail_not_found(self, clean_cache, db):
+        """Test: 404 rendu par la vue DRF"""
+        view = async_views.AsyncMissionDetailView.as_view(MissionDetailView)
+
+        response = async_to_sync(view)(_request("/api/missions/999/"), pk=999)
+
+        assert response.status_code == 404
+        assert "ETag" not in response
+
+    def test_home_stats(self, clean_cache, sample_mission):
+        """Test: même instantané et mêmes en-têtes pour la page d'accueil"""
+        sync_response, async_response = _both(
+            HomePageStatsView, async_views.AsyncHomePageStatsView, "/api/missions/home-stats/"
+        )
+
+        assert json.loads(async_response.content) == json.loads(sync_response.content)
+        assert async_response["ETag"] == sync_response["ETag"]
+
+    @pytest.mark.parametrize("drf_view", [ODDListView, SkillListView])
+    def test_reference_lists(self, clean_cache, sample_odd, sample_skill, drf_view):
+        """Test: ODD et compétences servis depuis le catalogue en mémoire"""
+        sync_response, async_response = _both(
+            drf_view, async_views.AsyncReferenceListView, "/api/reference/"
+        )
+
+        assert json.loads(async_response.content) == json.loads(sync_response.content)
+        assert async_response["ETag"] == sync_response["ETag"]
+
+    def test_browsable_api_falls_back(self, clean_cache, sample_mission):
+        """Test: le format HTML est délégué à la vue DRF"""
+        view = async_views.AsyncMissionListView.as_view(MissionListView)
+
+        response = _render(async_to_sync(view)(_request("/api/missions/", HTTP_ACCEPT="text/html")))
+
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/html")
+
+    def test_invalid_filter_falls_back(self, clean_cache, sample_mission):
+        """Test: une erreur de validation reçoit la réponse de la vue DRF"""
+        sync_response, async_response = _both(
+            MissionListView, async_views.AsyncMissionListView, "/api/missions/?cursor=invalide"
+        )
+
+        assert async_response.status_code == sync_response.status_code
+        assert async_response.content == sync_response.content
+
+    def test_read_view_setting(self, settings):
+        """Test: ASYNC_READ_VIEWS choisit la vue asynchrone"""
+        settings.ASYNC_READ_VIEWS = False
+        assert (
+            async_views.read_view(MissionListView, async_views.AsyncMissionListView).view_class
+            is MissionListView
+        )
+
+        settings.ASYNC_READ_VIEWS = True
+        view = async_views.read_view(MissionListView, async_views.AsyncMissionListView)
+        assert view.view_class is MissionListView
+        assert view.csrf_exempt
@@ -0,0 +1,56 @@
+"""
+Tests Unitaires - Statistiques et comparaison des benchmarks HTTP
+"""
+
+import pytest
+
+from benchmarks.stats import compare, percentile, summarize
+
+
+def _result(rps, p50, p95, p99):
+    return {
+        "meta": {"commit": "abc"},
+        "scenarios": {
+            "catalogue": {"rps": rps, "latency_ms": {"p50": p50, "p95": p95, "p99": p99}}
+        },
+    }
+
+
+@pytest.mark.unit
+class TestBenchmarkStats:
+    """Tests des percentiles et de la détection de régression"""
+
+    def test_percentile_nearest_rank(self):
+        """Test: percentile par rang le plus proche"""
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile([7], 99) == 7
+        assert percentile([], 50) == 0.0
+
+    def test_summarize(self):
+        """Test: requêtes/s, percentiles en millisecondes et statuts"""
+        summary = summarize([0.010, 0.030, 0.020, 0.040], elapsed=2, statuses={200: 3, 500: 1})
+
+        assert summary["requests"] == 4
+        assert summary["rps"] == 2.0
+        assert summary["latency_ms"]["p50"] == 20.0
+        assert summary["latency_ms"]["p99"] == 40.0
+        assert summary["latency_ms"]["mean"] == 25.0
+        assert summary["statuses"] == {"200": 3, "500": 1}
+
+    def test_compare_flags_regressions_beyond_threshold(self):
+        """Test: moins de requêtes/s ou latence plus haute au-delà du seuil"""
+        before = _result(rps=100, p50=10, p95=20, p99=40)
+        after = _result(rps=85, p50=10.5, p95=25, p99=30)
+
+        rows = {
+            metric: (delta, regression)
+            for _, metric, _, _, delta, regression in compare(before, after, threshold=0.10)
+        }
+
+        assert rows["rps"] == (pytest.approx(-0.15), True)
+        assert rows["latency_ms.p50"][1] is False
+        assert rows["latency_ms.p95"][1] is True
+        assert rows["latency_ms.p99"][1] is False  # amélioration
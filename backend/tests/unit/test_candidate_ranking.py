@@ -0,0 +1,170 @@
+"""
+Tests Unitaires - Classement des bénévoles pour une mission (missions/matching.py)
+"""
+
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from accounts.models import Organization, User, Volunteer
+from missions import matching, services
+from missions.models import Application, MissionSkillRequirement, Participation
+from skills.models import Skill, VolunteerSkill
+
+
+@pytest.fixture
+def clean_cache(settings):
+    settings.MATCHING = {"CHECK_INTERVAL": 0}
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def org_client(api_client, organization_user):
+    api_client.force_authenticate(organization_user)
+    return api_client
+
+
+@pytest.fixture
+def mission(sample_mission):
+    sample_mission.latitude, sample_mission.longitude = Decimal("36.753800"), Decimal("3.058800")
+    sample_mission.save()
+    return sample_mission
+
+
+def _volunteer(email, **fields):
+    user = User.objects.create_user(
+        email=email, password="testpass123", first_name=email.split("@")[0], user_type="VOLUNTEER"
+    )
+    return Volunteer.objects.create(user=user, wilaya="16", **fields)
+
+
+def _ids(client, mission, **params):
+    url = reverse("missions:mission_candidates", kwargs={"mission_id": mission.pk})
+    response = client.get(url, params)
+    assert response.status_code == 200
+    return [volunteer["id"] for volunteer in response.data["results"]]
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestMissionCandidates:
+    """Tests de GET /api/missions/organization/mission/<id>/candidates/"""
+
+    def test_ranking(self, clean_cache, org_client, mission):
+        """Test: proximité, note moyenne et badge font remonter un bénévole"""
+        near = _volunteer(
+            "near@test.com", latitude=Decimal("36.760000"), longitude=Decimal("3.060000")
+        )
+        rated = _volunteer(
+            "rated@test.com",
+            latitude=Decimal("36.760000"),
+            longitude=Decimal("3.060000"),
+            average_rating=Decimal("5.00"),
+            completed_missions=4,
+            badge_level="GOLD",
+        )
+        far = _volunteer(
+            "far@test.com", latitude=Decimal("22.785000"), longitude=Decimal("5.522800")
+        )
+
+        url = reverse("missions:mission_candidates", kwargs={"mission_id": mission.pk})
+        results = org_client.get(url).data["results"]
+
+        assert [volunteer["id"] for volunteer in results][:2] == [rated.pk, near.pk]
+        assert results[-1]["id"] == far.pk
+        assert results[0]["match_score"] > results[1]["match_score"]
+        assert results[0]["distance_km"] == 5  # tranche, pas la distance exacte
+        assert results[-1]["distance_km"] == 1600
+
+    def test_verified_skills(self, clean_cache, org_client, mission):
+        """Test: compétence à vérification obligatoire exigée au statut VALIDATED"""
+        first_aid = Skill.objects.create(name="Secourisme", requires_verification=True)
+        MissionSkillRequirement.objects.create(
+            mission=mission, skill=first_aid, verification_required=True
+        )
+        pending = _volunteer("pending@test.com")
+        skill = VolunteerSkill.objects.create(
+            volunteer=pending, skill=first_aid, status="PENDING", document="skills/pending.pdf"
+        )
+        validated = _volunteer("validated@test.com")
+        VolunteerSkill.objects.create(
+            volunteer=validated, skill=first_aid, status="VALIDATED", document="skills/ok.pdf"
+        )
+
+        assert _ids(org_client, mission) == [validated.pk]
+
+        skill.status = "VALIDATED"
+        skill.save()
+        assert set(_ids(org_client, mission)) == {validated.pk, pending.pk}
+
+    def test_excluded_volunteers(self, clean_cache, org_client, mission, volunteer_user):
+        """Test: candidats existants, profils privés et comptes inactifs écartés"""
+        Application.objects.create(mission=mission, volunteer=volunteer_user.volunteer_profile)
+        private = _volunteer("private@test.com", profile_visibility="PRIVATE")
+        inactive = _volunteer("inactive@test.com")
+        listed = _volunteer("listed@test.com")
+        assert set(_ids(org_client, mission)) == {inactive.pk, listed.pk}
+
+        inactive.user.is_active = False
+        inactive.user.save()
+        private.profile_visibility = "PUBLIC"
+        private.save()
+
+        assert set(_ids(org_client, mission)) == {private.pk, listed.pk}
+
+    def test_stats_recompute_updates_index(self, clean_cache, mission):
+        """Test: le recalcul en masse (bulk_update, sans signal) met à jour note et badge"""
+        volunteer = _volunteer("stats@test.com")
+        assert list(matching.volunteers.features.badges) == [0]
+        Participation.objects.create(
+            mission=mission,
+            volunteer=volunteer,
+            was_present=True,
+            hours_completed=Decimal("60"),
+            hours_validated=True,
+            organization_rating=4,
+        )
+
+        services.recompute_volunteer_stats([volunteer.pk])
+
+        features = matching.volunteers.features
+        assert list(features.badges) == [1]
+        assert list(features.ratings) == [4.0]
+
+    def test_rebuilds_after_max_age(self, clean_cache, settings, mission):
+        """Test: profil modifié sans entrée du journal (autre worker) -> MAX_AGE"""
+        volunteer = _volunteer("ancien@test.com")
+        other_worker = matching.VolunteerIndex()
+        assert list(other_worker.features.ids) == [volunteer.pk]
+
+        Volunteer.objects.filter(pk=volunteer.pk).update(profile_visibility="PRIVATE")
+        assert list(other_worker.features.ids) == [volunteer.pk]
+
+        settings.MATCHING = {"CHECK_INTERVAL": 0, "MAX_AGE": 0}
+        assert list(other_worker.features.ids) == []
+
+    def test_all_causes_fit(self):
+        """Test: le masque des causes tient toutes les causes, sans débordement"""
+        everything = matching.cause_bits(matching.CAUSES)
+        assert int(matching.CAUSE_DTYPE(everything)) == (1 << len(matching.CAUSES)) - 1
+
+    def test_access(self, api_client, mission, volunteer_user):
+        """Test: réservé à l'organisation propriétaire de la mission"""
+        url = reverse("missions:mission_candidates", kwargs={"mission_id": mission.pk})
+        other = User.objects.create_user(
+            email="other-org@test.com", password="testpass123", user_type="ORGANIZATION"
+        )
+        Organization.objects.create(
+            user=other, name="Autre ONG", organization_type="NGO", wilaya="16"
+        )
+
+        api_client.force_authenticate(volunteer_user)
+        assert api_client.get(url).status_code == 403
+        api_client.force_authenticate(other)
+        assert api_client.get(url).status_code == 404
+        api_client.force_authenticate(mission.organization.user)
+        assert api_client.get(url, {"limit": "dix"}).status_code == 400
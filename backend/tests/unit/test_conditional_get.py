@@ -0,0 +1,157 @@
+"""
+Tests Unitaires - Requêtes conditionnelles sur le détail des missions et des organisations
+"""
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils.http import http_date
+
+from missions import services
+from missions.models import Mission, MissionSkillRequirement
+from missions.view_counter import get_view_counter
+
+BROWSER_UA = "Mozilla/5.0 (X11; Linux x86_64) Firefox/120.0"
+
+
+@pytest.fixture
+def clean_cache():
+    cache.clear()
+    get_view_counter().buffer.drain()
+    yield
+    cache.clear()
+
+
+def _get(api_client, url, ip="10.0.0.1", **headers):
+    return api_client.get(url, REMOTE_ADDR=ip, HTTP_USER_AGENT=BROWSER_UA, **headers)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestMissionDetailConditional:
+    """Tests de l'ETag et du 304 de GET /api/missions/<id>/"""
+
+    def test_not_modified_before_serialization(
+        self, clean_cache, api_client, sample_mission, django_assert_num_queries
+    ):
+        """Test: If-None-Match à jour -> 304, sans la requête des compétences requises"""
+        url = reverse("missions:mission_detail", args=[sample_mission.pk])
+        response = _get(api_client, url)
+        etag = response["ETag"]
+
+        assert response.status_code == 200
+        assert etag.startswith('W/"')
+        assert response["Last-Modified"]
+        assert "no-cache" in response["Cache-Control"]
+
+        with django_assert_num_queries(1):
+            response = _get(api_client, url, ip="10.0.0.2", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert not response.content
+
+    def test_not_modified_still_counts_view(self, clean_cache, api_client, sample_mission):
+        """Test: un 304 compte la vue comme un 200 (mêmes règles de déduplication)"""
+        url = reverse("missions:mission_detail", args=[sample_mission.pk])
+        etag = _get(api_client, url)["ETag"]
+
+        for ip in ("10.0.0.2", "10.0.0.3", "10.0.0.3"):
+            assert _get(api_client, url, ip=ip, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        assert get_view_counter().current_count(sample_mission) == 3
+        assert _get(api_client, url, ip="10.0.0.4").data["view_count"] == 4
+
+    def test_if_modified_since(self, clean_cache, api_client, sample_mission):
+        """Test: If-Modified-Since seul (sans ETag)"""
+        url = reverse("missions:mission_detail", args=[sample_mission.pk])
+        last_modified = _get(api_client, url)["Last-Modified"]
+
+        response = _get(api_client, url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == 304
+
+    @pytest.mark.parametrize("change", ["mission", "organization", "odd", "skills", "capacity"])
+    def test_new_version_on_change(
+        self, clean_cache, api_client, sample_mission, sample_skill, change
+    ):
+        """Test: mission, organisation, ODD, compétences requises et places changent l'ETag"""
+        url = reverse("missions:mission_detail", args=[sample_mission.pk])
+        etag = _get(api_client, url)["ETag"]
+
+        if change == "mission":
+            sample_mission.title = "Nouveau titre"
+            sample_mission.save()
+        elif change == "organization":
+            sample_mission.organization.description = "Nouvelle description"
+            sample_mission.organization.save()
+        elif change == "odd":
+            sample_mission.odd.color = "#000000"
+            sample_mission.odd.save()
+        elif change == "skills":
+            MissionSkillRequirement.objects.create(mission=sample_mission, skill=sample_skill)
+        else:
+            assert services.reserve_place(sample_mission.pk)
+
+        response = _get(api_client, url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+    def test_required_skills_m2m(self, clean_cache, sample_mission, sample_skill):
+        """Test: required_skills.add() avance updated_at (pas de post_save)"""
+        before = Mission.objects.get(pk=sample_mission.pk).updated_at
+
+        sample_mission.required_skills.add(sample_skill)
+
+        assert Mission.objects.get(pk=sample_mission.pk).updated_at > before
+
+    def test_etag_depends_on_representation(self, clean_cache, api_client, sample_mission):
+        """Test: ?fields= et le format négocié donnent des ETag distincts"""
+        url = reverse("missions:mission_detail", args=[sample_mission.pk])
+
+        etags = {
+            _get(api_client, url)["ETag"],
+            api_client.get(url, {"fields": "id,title"}, HTTP_USER_AGENT=BROWSER_UA)["ETag"],
+            _get(api_client, url, HTTP_ACCEPT="text/html")["ETag"],
+        }
+
+        assert len(etags) == 3
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestOrganizationProfileConditional:
+    """Tests de l'ETag et du 304 de GET /api/missions/organization/<id>/"""
+
+    def test_etag_and_not_modified(self, clean_cache, api_client, organization_user):
+        """Test: ETag fort, 304 puis nouvelle version après modification"""
+        organization = organization_user.organization_profile
+        organization.is_verified = True
+        organization.save()
+        url = reverse("missions:organization_profile", args=[organization.pk])
+
+        response = api_client.get(url)
+        etag = response["ETag"]
+        assert response.status_code == 200
+        assert not etag.startswith("W/")
+        assert response["Last-Modified"] == http_date(organization.updated_at.timestamp())
+        assert "max-age=60" in response["Cache-Control"]
+
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        organization.name = "ONG renommée"
+        organization.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data["name"] == "ONG renommée"
+
+    def test_unverified_organization_not_found(self, clean_cache, api_client, organization_user):
+        """Test: 404 sans validateurs pour une organisation non vérifiée"""
+        organization = organization_user.organization_profile
+        organization.is_verified = False
+        organization.save()
+
+        response = api_client.get(reverse("missions:organization_profile", args=[organization.pk]))
+
+        assert response.status_code == 404
+        assert "ETag" not in response
@@ -0,0 +1,163 @@
+"""
+Tests Unitaires - Éligibilité aux missions (missions/eligibility.py)
+"""
+
+import pytest
+from django.contrib.admin.sites import AdminSite
+from django.core.cache import cache
+from django.test import RequestFactory
+from django.urls import reverse
+
+from missions import eligibility
+from missions.models import Application, Mission, MissionSkillRequirement
+from skills.admin import VolunteerSkillAdmin
+from skills.models import Skill, VolunteerSkill
+
+
+@pytest.fixture
+def clean_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def first_aid(db):
+    return Skill.objects.create(name="Secourisme", requires_verification=True)
+
+
+@pytest.fixture
+def locked_mission(sample_mission, first_aid):
+    MissionSkillRequirement.objects.create(
+        mission=sample_mission, skill=first_aid, verification_required=True
+    )
+    return sample_mission
+
+
+def _pending(volunteer, skill):
+    return VolunteerSkill.objects.create(
+        volunteer=volunteer, skill=skill, status="PENDING", document="skills/diplome.pdf"
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestEligibility:
+    """Tests des ensembles de bits et de leur invalidation"""
+
+    def test_single_bitwise_check(
+        self, clean_cache, locked_mission, first_aid, volunteer_user, django_assert_num_queries
+    ):
+        """Test: cache chaud -> aucune requête pour le catalogue ; validation prise en compte"""
+        volunteer = volunteer_user.volunteer_profile
+        skill = _pending(volunteer, first_aid)
+        assert eligibility.ineligible_missions(volunteer.pk) == [locked_mission.pk]
+
+        with django_assert_num_queries(0):
+            assert eligibility.ineligible_missions(volunteer.pk) == [locked_mission.pk]
+
+        skill.status = "VALIDATED"
+        skill.save()
+        assert eligibility.ineligible_missions(volunteer.pk) == []
+
+    def test_apply_check_ignores_cache(
+        self, clean_cache, locked_mission, first_aid, volunteer_user, django_assert_num_queries
+    ):
+        """Test: candidature -> une requête, même si le cache (d'un autre worker) est périmé"""
+        volunteer = volunteer_user.volunteer_profile
+        skill = _pending(volunteer, first_aid)
+        skill.status = "VALIDATED"
+        skill.save()
+        assert eligibility.ineligible_missions(volunteer.pk) == []
+
+        # Refus sans signal : le cache garde l'ancienne valeur
+        VolunteerSkill.objects.update(status="REJECTED")
+        assert eligibility.ineligible_missions(volunteer.pk) == []
+        with django_assert_num_queries(1):
+            assert not eligibility.is_eligible(locked_mission.pk, volunteer.pk)
+
+    def test_only_open_missions(self, clean_cache, locked_mission, volunteer_user):
+        """Test: brouillons et missions passées absents des compétences requises en cache"""
+        volunteer = volunteer_user.volunteer_profile
+        assert eligibility.ineligible_missions(volunteer.pk) == [locked_mission.pk]
+
+        Mission.objects.filter(pk=locked_mission.pk).update(status="DRAFT")
+        eligibility.requirements_changed()
+        assert eligibility.ineligible_missions(volunteer.pk) == []
+
+    def test_requirement_changes(self, clean_cache, locked_mission, first_aid, volunteer_user):
+        """Test: compétence requise ajoutée ou retirée (y compris via required_skills)"""
+        volunteer = volunteer_user.volunteer_profile
+        assert not eligibility.is_eligible(locked_mission.pk, volunteer.pk)
+
+        locked_mission.required_skills.clear()
+        assert eligibility.is_eligible(locked_mission.pk, volunteer.pk)
+
+        locked_mission.required_skills.add(
+            first_aid, through_defaults={"verification_required": True}
+        )
+        assert eligibility.ineligible_missions(volunteer.pk) == [locked_mission.pk]
+        assert not eligibility.is_eligible(locked_mission.pk, volunteer.pk)
+
+    def test_admin_validation(
+        self, clean_cache, locked_mission, first_aid, volunteer_user, admin_user
+    ):
+        """Test: validation en masse depuis l'admin (update, sans signal)"""
+        volunteer = volunteer_user.volunteer_profile
+        _pending(volunteer, first_aid)
+        assert eligibility.ineligible_missions(volunteer.pk) == [locked_mission.pk]
+
+        request = RequestFactory().post("/")
+        request.user = admin_user
+        model_admin = VolunteerSkillAdmin(VolunteerSkill, AdminSite())
+        model_admin.message_user = lambda *args, **kwargs: None
+        model_admin.validate_skills(request, VolunteerSkill.objects.all())
+
+        assert eligibility.ineligible_missions(volunteer.pk) == []
+        assert eligibility.is_eligible(locked_mission.pk, volunteer.pk)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestApplyAndCatalogue:
+    """Tests de la candidature et du filtre ?eligible=true"""
+
+    def test_apply_requires_validated_skill(
+        self, clean_cache, authenticated_client, locked_mission, first_aid, volunteer_user
+    ):
+        """Test: candidature refusée tant que la compétence n'est pas validée"""
+        url = reverse("missions:apply", kwargs={"mission_id": locked_mission.pk})
+        skill = _pending(volunteer_user.volunteer_profile, first_aid)
+
+        response = authenticated_client.post(url)
+        assert response.status_code == 400
+        assert not Application.objects.exists()
+
+        skill.status = "VALIDATED"
+        skill.save()
+        response = authenticated_client.post(url)
+
+        assert response.status_code == 201
+        assert response.data["has_required_skills"] is True
+
+    def test_catalogue_filter(self, clean_cache, authenticated_client, locked_mission):
+        """Test: ?eligible=true écarte les missions inaccessibles au bénévole"""
+        open_mission = Mission.objects.get(pk=locked_mission.pk)
+        open_mission.pk = None
+        open_mission.save()
+        url = reverse("missions:mission_list")
+
+        ids = [mission["id"] for mission in authenticated_client.get(url).data["results"]]
+        eligible = [
+            mission["id"]
+            for mission in authenticated_client.get(url, {"eligible": "true"}).data["results"]
+        ]
+
+        assert sorted(ids) == [locked_mission.pk, open_mission.pk]
+        assert eligible == [open_mission.pk]
+
+    def test_catalogue_filter_volunteers_only(self, api_client, sample_mission):
+        """Test: ?eligible=true sans bénévole connecté -> 400"""
+        response = api_client.get(reverse("missions:mission_list"), {"eligible": "true"})
+
+        assert response.status_code == 400
@@ -0,0 +1,229 @@
+"""
+Tests Unitaires - Sérialisation rapide des listes (parité octet pour octet avec DRF)
+"""
+
+from decimal import Decimal
+
+import pytest
+from django.db.models import FloatField, Value
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.serializers import (
+    ApplicationSerializer,
+    MissionListSerializer,
+    ParticipationSerializer,
+)
+from missions.fast_serializers import get_plan, serialize
+from missions.models import Application, Mission, Participation
+
+MISSION_OPTIONS = [
+    {},
+    {"expand": "organization,odd"},
+    {"fields": "id,title,remaining_places,organization.name,odd.number"},
+    {"fields": "id,distance_km", "expand": "organization"},
+]
+
+RELATED_OPTIONS = [
+    {},
+    {"expand": "volunteer"},
+    {"expand": "volunteer,mission.organization,mission.odd"},
+    {"fields": "id,volunteer.first_name,mission.id,mission.fill_percentage"},
+]
+
+
+def _render(data):
+    return JSONRenderer().render(data)
+
+
+def _assert_parity(serializer_class, queryset, request=None, **options):
+    context = {"request": request} if request is not None else {}
+    expected = serializer_class(queryset, many=True, context=context, **options).data
+
+    plan = get_plan(
+        serializer_class,
+        options.get("fields"),
+        options.get("expand"),
+        tuple(sorted(queryset.query.annotations)),
+    )
+    assert plan is not None
+    actual = plan.serialize(queryset.values(*plan.columns), request)
+
+    assert _render(actual) == _render(expected)
+    return actual
+
+
+@pytest.fixture
+def varied(seeded_volumes, organization_user):
+    """Valeurs nulles et non nulles, fichiers, décimales, dates de réponse"""
+    organization = organization_user.organization_profile
+    organization.logo = "organizations/logos/ong.png"
+    organization.save()
+    Mission.objects.filter(pk=seeded_volumes.missions[1].pk).update(
+        image="missions/photo.jpg", accepted_volunteers=3, duration_hours=Decimal("2.5")
+    )
+    Application.objects.filter(pk=seeded_volumes.applications[0].pk).update(
+        responded_at=timezone.now(), organization_message="Bienvenue"
+    )
+    Participation.objects.filter(pk=seeded_volumes.participations[0].pk).update(
+        hours_completed=Decimal("3.5"), validated_at=timezone.now(), organization_rating=4
+    )
+    Participation.objects.filter(pk=seeded_volumes.participations[1].pk).update(application=None)
+    volunteer = seeded_volumes.volunteers[0]
+    volunteer.profile_picture = "volunteers/me.jpg"
+    volunteer.total_hours = Decimal("12.25")
+    volunteer.availability = {"samedi": ["matin"]}
+    volunteer.save()
+    return seeded_volumes
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestFastSerializerParity:
+    """Tests de parité entre plan rapide et sérialiseurs DRF"""
+
+    @pytest.mark.parametrize("options", MISSION_OPTIONS)
+    def test_missions(self, varied, options):
+        """Test: missions, avec et sans requête (URL absolues des fichiers)"""
+        queryset = Mission.objects.select_related("organization", "odd").order_by("pk")
+        request = Request(APIRequestFactory().get("/api/missions/"))
+
+        _assert_parity(MissionListSerializer, queryset, **options)
+        rows = _assert_parity(MissionListSerializer, queryset, request=request, **options)
+        assert len(rows) == 25
+
+    def test_missions_with_distance_annotation(self, varied):
+        """Test: distance_km lue dans l'annotation de ?near="""
+        queryset = Mission.objects.select_related("organization", "odd").annotate(
+            distance_km=Value(12.345, output_field=FloatField())
+        )
+
+        rows = _assert_parity(MissionListSerializer, queryset)
+        assert rows[0]["distance_km"] == 12.3
+
+    @pytest.mark.parametrize("options", RELATED_OPTIONS)
+    def test_applications(self, varied, options):
+        """Test: candidatures (bénévole compact ou complet, mission imbriquée)"""
+        queryset = Application.objects.select_related(
+            "volunteer__user", "mission__organization", "mission__odd"
+        ).order_by("pk")
+
+        rows = _assert_parity(ApplicationSerializer, queryset, **options)
+        assert len(rows) == len(varied.applications)
+
+    @pytest.mark.parametrize("options", RELATED_OPTIONS)
+    def test_participations(self, varied, options):
+        """Test: participations (candidature nulle, heures et notes)"""
+        queryset = Participation.objects.select_related(
+            "volunteer__user", "mission__organization", "mission__odd"
+        ).order_by("pk")
+
+        _assert_parity(ParticipationSerializer, queryset, **options)
+
+    def test_serialize_falls_back_without_plan(self, varied):
+        """Test: champ sans équivalent rapide -> sérialiseur DRF"""
+
+        class WithMethod(MissionListSerializer):
+            shout = serializers.SerializerMethodField()
+
+            class Meta(MissionListSerializer.Meta):
+                fields = (*MissionListSerializer.Meta.fields, "shout")
+
+            def get_shout(self, obj):
+                return obj.title.upper()
+
+        queryset = Mission.objects.select_related("organization", "odd").order_by("pk")
+
+        assert get_plan(WithMethod) is None
+        assert serialize(WithMethod, queryset)[0]["shout"] == "MISSION TEST"
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestFastListViews:
+    """Tests des vues de liste : réponses identiques avec et sans plan rapide"""
+
+    def _get_all_pages(self, api_client, url, params):
+        pages, response = [], api_client.get(url, params)
+        pages.append(response.content)
+        while response.data.get("next"):
+            response = api_client.get(response.data["next"])
+            pages.append(response.content)
+        assert response.status_code == 200
+        return pages
+
+    @pytest.mark.parametrize(
+        "role,name,params",
+        [
+            (None, "mission_list", {}),
+            (None, "mission_list", {"page_size": 7, "ordering": "date"}),
+            (None, "mission_list", {"search": "mission", "fields": "id,title"}),
+            (None, "mission_list", {"near": "36.75,3.06", "expand": "organization"}),
+            ("volunteer", "my_applications", {"page_size": 3}),
+            ("volunteer", "my_missions", {"status": "all"}),
+            ("organization", "organization_missions", {"status": "PUBLISHED"}),
+        ],
+    )
+    def test_same_pages(self, settings, api_client, varied, role, name, params):
+        """Test: toutes les pages (curseurs compris) identiques octet pour octet"""
+        if role:
+            user = varied.volunteers[0].user if role == "volunteer" else None
+            user = user or Mission.objects.first().organization.user
+            token = RefreshToken.for_user(user).access_token
+            api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        url = reverse(f"missions:{name}")
+
+        settings.FAST_SERIALIZATION = True
+        fast = self._get_all_pages(api_client, url, params)
+        settings.FAST_SERIALIZATION = False
+        slow = self._get_all_pages(api_client, url, params)
+
+        assert fast == slow
+
+    def test_no_model_instances(self, settings, api_client, varied, monkeypatch):
+        """Test: le catalogue est servi sans instancier de Mission"""
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Mission instanciée")
+
+        monkeypatch.setattr(Mission, "from_db", classmethod(fail))
+        settings.FAST_SERIALIZATION = True
+
+        response = api_client.get(reverse("missions:mission_list"), {"page_size": 5})
+
+        assert response.status_code == 200
+        assert len(response.data["results"]) == 5
+
+    def test_mission_applications(self, settings, api_client, varied):
+        """Test: candidatures d'une mission (filtre de statut, bénévole complet)"""
+        mission = varied.missions[0]
+        token = RefreshToken.for_user(mission.organization.user).access_token
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        url = reverse("missions:mission_applications", args=[mission.pk])
+
+        results = {}
+        for enabled in (True, False):
+            settings.FAST_SERIALIZATION = enabled
+            results[enabled] = [
+                api_client.get(url, params).content
+                for params in ({}, {"status": "ACCEPTED"}, {"expand": "volunteer"})
+            ]
+
+        assert results[True] == results[False]
+
+    def test_homepage_snapshot_unchanged(self, settings, varied):
+        """Test: instantané de la page d'accueil identique (même ETag)"""
+        from missions import homepage
+
+        settings.FAST_SERIALIZATION = True
+        fast = homepage.build_snapshot()
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr("missions.fast_serializers.get_plan", lambda *args, **kwargs: None)
+            slow = homepage.build_snapshot()
+
+        assert fast["etag"] == slow["etag"]
@@ -0,0 +1,95 @@
+"""
+Tests Unitaires - Commande generate_load_data
+"""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count, F
+
+from accounts.models import User, Volunteer
+from missions.management.commands.generate_load_data import EMAIL_DOMAIN, Command
+from missions.models import Application, Mission, MissionSkillRequirement, Participation, Review
+from skills.models import VolunteerSkill
+
+OPTIONS = {
+    "volunteers": 40,
+    "organizations": 3,
+    "missions_per_wilaya": 1,
+    "applications": 300,
+    "participations": 50,
+    "skills": 60,
+    "requirements": 30,
+    "reviews": 20,
+    "batch_size": 70,
+    "skip_search_index": True,
+}
+
+
+def _generate(**options):
+    call_command("generate_load_data", stdout=StringIO(), **{**OPTIONS, **options})
+
+
+def _pairs():
+    return sorted(
+        Application.objects.values_list("mission__title", "volunteer__user__email", "status")
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestGenerateLoadData:
+    """Tests de manage.py generate_load_data"""
+
+    def test_generates_requested_volumes(self):
+        """Test: Les volumes demandés sont créés en respectant les contraintes"""
+        _generate()
+
+        assert Volunteer.objects.count() == 40
+        assert Mission.objects.count() == 58
+        assert Application.objects.count() == 300
+        assert Participation.objects.count() == 50
+        assert VolunteerSkill.objects.count() == 60
+        assert MissionSkillRequirement.objects.count() == 30
+        assert Review.objects.count() == 20
+        assert not Mission.objects.filter(accepted_volunteers__gt=F("required_volunteers")).exists()
+        mission = Mission.objects.exclude(application_count=0).first()
+        assert mission.application_count == mission.applications.count()
+
+    def test_accepted_counts_match_participations(self):
+        """Test: Chaque candidature acceptée a sa participation ; places prises cohérentes"""
+        _generate(participations=10)
+
+        assert Application.objects.filter(status="ACCEPTED").count() == 10
+        assert Participation.objects.count() == 10
+        missions = Mission.objects.annotate(taken=Count("participations"))
+        assert not missions.exclude(accepted_volunteers=F("taken")).exists()
+
+    def test_same_seed_same_data(self):
+        """Test: Le même seed produit les mêmes candidatures"""
+        _generate(seed=7)
+        first = _pairs()
+        _generate(seed=7, reset=True)
+
+        assert _pairs() == first
+
+    def test_reset_skips_signals(self, django_assert_max_num_queries):
+        """Test: --reset supprime par lots, sans relire chaque ligne pour ses signaux"""
+        _generate()
+        command = Command()
+        command.batch_size = 1000
+
+        with django_assert_max_num_queries(40):
+            command.delete_generated(User.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}"))
+
+        assert not User.objects.exists()
+        assert not Application.objects.exists()
+        assert not MissionSkillRequirement.objects.exists()
+
+    def test_refuses_to_duplicate_without_reset(self):
+        """Test: Une seconde génération sans --reset est refusée"""
+        _generate()
+
+        with pytest.raises(Exception, match="--reset"):
+            _generate()
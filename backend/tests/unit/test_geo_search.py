@@ -0,0 +1,101 @@
+"""
+Tests Unitaires - Recherche géographique par rayon
+Tests du geohash, de la couverture par cellules et du filtre ?near=
+"""
+
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from missions.geo import covering_cells, encode_geohash, haversine_km
+from missions.models import Mission
+
+ALGER = (36.7538, 3.0588)
+BLIDA = (36.4700, 2.8300)
+TIPAZA = (36.5900, 2.4500)
+ORAN = (35.6971, -0.6308)
+
+
+@pytest.mark.unit
+class TestGeohash:
+    """Tests des primitives géographiques"""
+
+    def test_encode_known_value(self):
+        """Test: Encodage conforme à la référence geohash"""
+        assert encode_geohash(57.64911, 10.40744, precision=11) == "u4pruydqqvj"
+
+    def test_haversine_alger_oran(self):
+        """Test: Distance Alger-Oran d'environ 350 km"""
+        assert 340 < haversine_km(*ALGER, *ORAN) < 370
+
+    def test_covering_cells_contain_points_in_radius(self):
+        """Test: Tout point dans le rayon tombe dans une cellule de couverture"""
+        cells = covering_cells(*ALGER, radius_km=60)
+        for point in (ALGER, BLIDA, TIPAZA):
+            assert any(encode_geohash(*point).startswith(cell) for cell in cells)
+        assert not any(encode_geohash(*ORAN).startswith(cell) for cell in cells)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestProximityFilter:
+    """Tests du filtre ?near= du catalogue"""
+
+    @pytest.fixture
+    def located_missions(self, sample_mission):
+        missions = {}
+        for name, (lat, lng) in {"Blida": BLIDA, "Tipaza": TIPAZA, "Oran": ORAN}.items():
+            mission = Mission.objects.get(pk=sample_mission.pk)
+            mission.pk = None
+            mission._state.adding = True
+            mission.title = f"Mission {name}"
+            mission.latitude, mission.longitude = Decimal(str(lat)), Decimal(str(lng))
+            mission.save()
+            missions[name] = mission
+        return missions
+
+    def _titles(self, response):
+        return [mission["title"] for mission in response.data["results"]]
+
+    def test_geohash_is_maintained_on_save(self, located_missions):
+        """Test: Le geohash est calculé à l'enregistrement"""
+        mission = located_missions["Oran"]
+        assert mission.geohash == encode_geohash(*ORAN)
+
+        mission.latitude, mission.longitude = Decimal("36.7538"), Decimal("3.0588")
+        mission.save(update_fields=["latitude", "longitude"])
+        mission.refresh_from_db()
+        assert mission.geohash == encode_geohash(*ALGER)
+
+    def test_near_filters_and_sorts_by_distance(self, api_client, located_missions):
+        """Test: Seules les missions dans le rayon sont renvoyées, triées par distance"""
+        response = api_client.get(
+            reverse("missions:mission_list"), {"near": "36.7538,3.0588", "radius_km": 80}
+        )
+
+        assert response.status_code == 200
+        assert self._titles(response) == ["Mission Blida", "Mission Tipaza"]
+        assert 30 < response.data["results"][0]["distance_km"] < 45
+
+    def test_near_me_uses_volunteer_radius(self, api_client, volunteer_user, located_missions):
+        """Test: ?near=me utilise la position et le rayon préféré du bénévole"""
+        volunteer = volunteer_user.volunteer_profile
+        volunteer.latitude, volunteer.longitude = Decimal("36.7538"), Decimal("3.0588")
+        volunteer.preferred_radius = 45
+        volunteer.save()
+        token = RefreshToken.for_user(volunteer_user).access_token
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = api_client.get(reverse("missions:mission_list"), {"near": "me"})
+
+        assert response.status_code == 200
+        assert self._titles(response) == ["Mission Blida"]
+
+    def test_invalid_near_returns_400(self, api_client):
+        """Test: Un paramètre near mal formé est rejeté"""
+        response = api_client.get(reverse("missions:mission_list"), {"near": "alger"})
+
+        assert response.status_code == 400
+        assert "near" in response.data
@@ -0,0 +1,98 @@
+"""
+Tests Unitaires - Instantané de la page d'accueil
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User, Volunteer
+from missions import homepage, services
+from missions.models import Mission, Participation, SiteStats
+
+
+@pytest.fixture
+def clean_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _stats():
+    return SiteStats.objects.get(pk=1)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestHomePageStats:
+    """Tests de GET /api/missions/home-stats/"""
+
+    url = reverse("missions:home_stats")
+
+    def test_counters_follow_write_paths(self, clean_cache, volunteer_user, sample_mission):
+        """Test: Inscription, publication et validation mettent à jour les compteurs"""
+        homepage.rebuild_stats()
+        assert (_stats().total_volunteers, _stats().total_missions) == (1, 1)
+
+        user = User.objects.create_user(
+            email="new@test.com", password="testpass123", user_type="VOLUNTEER"
+        )
+        volunteer = Volunteer.objects.create(user=user)
+        sample_mission.status = "CLOSED"
+        sample_mission.save()
+        assert (_stats().total_volunteers, _stats().total_missions) == (2, 0)
+
+        mission = Mission.objects.get(pk=sample_mission.pk)
+        mission.status = "PUBLISHED"
+        mission.save()
+        mission.save()
+        assert _stats().total_missions == 1
+
+        participation = Participation.objects.create(mission=mission, volunteer=volunteer)
+        validation = {"participation_id": participation.pk, "was_present": True, "hours": 6}
+        services.validate_hours(mission, [validation])
+        services.validate_hours(mission, [validation])
+        assert _stats().total_hours == Decimal("6")
+
+    def test_serves_snapshot_without_queries(
+        self, api_client, clean_cache, sample_mission, django_assert_num_queries
+    ):
+        """Test: Le corps est précalculé puis servi depuis le cache"""
+        first = api_client.get(self.url)
+        assert first.status_code == 200
+        assert first.json()["total_missions"] == 1
+        assert first.json()["latest_missions"][0]["id"] == sample_mission.pk
+
+        with django_assert_num_queries(0):
+            second = api_client.get(self.url)
+        assert second.content == first.content
+        assert second["ETag"] == first["ETag"]
+
+    def test_conditional_get(self, api_client, clean_cache, sample_mission):
+        """Test: If-None-Match et If-Modified-Since renvoient 304"""
+        first = api_client.get(self.url)
+
+        assert api_client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
+        assert (
+            api_client.get(self.url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]).status_code
+            == 304
+        )
+
+    def test_publication_invalidates_snapshot(self, api_client, clean_cache, sample_mission):
+        """Test: Une nouvelle publication change l'ETag et les dernières missions"""
+        first = api_client.get(self.url)
+
+        mission = Mission.objects.get(pk=sample_mission.pk)
+        mission.pk = None
+        mission._state.adding = True
+        mission.date = timezone.now().date() + timedelta(days=3)
+        mission.save()
+
+        second = api_client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+        assert second.status_code == 200
+        assert second.json()["total_missions"] == 2
+        assert len(second.json()["latest_missions"]) == 2
@@ -0,0 +1,85 @@
+"""
+Tests Unitaires - Instrumentation des requêtes (Server-Timing, logs, SQL lent)
+"""
+
+import json
+import logging
+
+import pytest
+from django.urls import reverse
+
+from dzvolunteer.instrumentation import server_timing
+
+
+def _timings(response):
+    entries = {}
+    for part in response["Server-Timing"].split(", "):
+        name, *attributes = part.split(";")
+        entries[name] = dict(attribute.split("=", 1) for attribute in attributes)
+    return entries
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestInstrumentation:
+    """Tests de dzvolunteer.instrumentation"""
+
+    def test_server_timing_header(self, authenticated_client):
+        """Test: Chaque phase est présente dans Server-Timing avec le nombre de requêtes"""
+        response = authenticated_client.get(reverse("missions:volunteer_dashboard"))
+
+        timings = _timings(response)
+        assert set(timings) == {"db", "auth", "render", "app", "total"}
+        assert timings["db"]["desc"] == '"SQL x4"'
+        assert float(timings["auth"]["dur"]) > 0
+        assert float(timings["total"]["dur"]) >= float(timings["db"]["dur"])
+
+    def test_structured_log_line(self, api_client, sample_mission, caplog):
+        """Test: Une ligne JSON par requête avec la vue résolue"""
+        with caplog.at_level(logging.INFO, logger="dzvolunteer.requests"):
+            api_client.get(reverse("missions:mission_list"))
+
+        entry = json.loads(caplog.records[-1].getMessage())
+        assert entry["view"] == "missions:mission_list"
+        assert entry["status"] == 200
+        assert entry["queries"] >= 1
+        assert "sql" not in entry
+
+    def test_slow_requests_are_sampled_with_sql(self, api_client, sample_mission, settings, caplog):
+        """Test: Une requête lente est journalisée avec le texte SQL complet"""
+        settings.INSTRUMENTATION = {**settings.INSTRUMENTATION, "SLOW_REQUEST_MS": 0}
+
+        with caplog.at_level(logging.INFO, logger="dzvolunteer.requests"):
+            api_client.get(reverse("missions:mission_list"))
+
+        record = caplog.records[-1]
+        entry = json.loads(record.getMessage())
+        assert record.levelname == "WARNING"
+        assert entry["slow"] is True
+        assert any("missions_mission" in query["sql"] for query in entry["sql"])
+
+    def test_slow_request_sql_has_no_parameter_values(
+        self, api_client, volunteer_user, settings, caplog
+    ):
+        """Test: Les paramètres SQL (e-mail, hachage du mot de passe) ne sont pas journalisés"""
+        settings.INSTRUMENTATION = {**settings.INSTRUMENTATION, "SLOW_REQUEST_MS": 0}
+
+        with caplog.at_level(logging.INFO, logger="dzvolunteer.requests"):
+            api_client.post(
+                reverse("accounts:login"),
+                {"email": volunteer_user.email, "password": "testpass123"},
+                format="json",
+            )
+
+        message = caplog.records[-1].getMessage()
+        entry = json.loads(message)
+        assert entry["slow"] is True
+        assert volunteer_user.email not in message
+        assert volunteer_user.password not in message
+        assert all(isinstance(query["param_count"], int) for query in entry["sql"])
+
+    def test_server_timing_format(self):
+        """Test: Format conforme à la spécification Server-Timing"""
+        header = server_timing({"db": 1.234, "total": 5}, 3)
+
+        assert header == 'db;dur=1.2;desc="SQL x3", total;dur=5.0'
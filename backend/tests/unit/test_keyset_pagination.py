@@ -0,0 +1,96 @@
+"""
+Tests Unitaires - Pagination par clé (curseur) du catalogue
+"""
+
+import base64
+import json
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+
+from missions.models import Mission
+
+
+@pytest.fixture
+def many_missions(sample_mission):
+    """25 missions dont plusieurs partagent la même date et le même nombre d'acceptés"""
+    missions = [sample_mission]
+    for i in range(24):
+        mission = Mission.objects.get(pk=sample_mission.pk)
+        mission.pk = None
+        mission._state.adding = True
+        mission.title = f"Mission {i}"
+        mission.date = sample_mission.date + timedelta(days=i % 4)
+        mission.accepted_volunteers = i % 3
+        mission.save()
+        missions.append(mission)
+    return missions
+
+
+def _cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def _walk(api_client, params):
+    """Parcourt toutes les pages en suivant les liens « next »"""
+    ids, pages = [], 0
+    response = api_client.get(reverse("missions:mission_list"), params)
+    while True:
+        assert response.status_code == 200
+        ids.extend(mission["id"] for mission in response.data["results"])
+        pages += 1
+        if not response.data["next"]:
+            return ids, pages
+        response = api_client.get(response.data["next"])
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestKeysetPagination:
+    """Tests du parcours par curseur"""
+
+    @pytest.mark.parametrize("ordering", ["-created_at", "date", "-date", "accepted_volunteers"])
+    def test_walk_returns_every_mission_once_in_order(self, api_client, many_missions, ordering):
+        """Test: Le parcours complet ne saute ni ne répète aucune mission"""
+        ids, pages = _walk(api_client, {"ordering": ordering, "page_size": 7})
+
+        field = ordering.lstrip("-")
+        expected = sorted(
+            many_missions,
+            key=lambda m: (getattr(m, field), m.pk),
+            reverse=ordering.startswith("-"),
+        )
+        assert ids == [m.pk for m in expected]
+        assert pages == 4
+
+    def test_no_count_by_default(self, api_client, many_missions):
+        """Test: Aucun total n'est calculé sans ?with_count=true"""
+        response = api_client.get(reverse("missions:mission_list"))
+
+        assert "count" not in response.data
+        assert "approximate_count" not in response.data
+        assert len(response.data["results"]) == 10
+
+    def test_opt_in_approximate_count(self, api_client, many_missions):
+        """Test: ?with_count=true renvoie un total approximatif"""
+        response = api_client.get(reverse("missions:mission_list"), {"with_count": "true"})
+
+        assert response.data["approximate_count"] == 25
+        assert "with_count" not in response.data["next"]
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "!!!",
+            _cursor(["abc", 1]),
+            _cursor([None, 1]),
+            _cursor([{"a": 1}, 1]),
+            _cursor(["2024-01-01T00:00:00+00:00", "abc"]),
+        ],
+    )
+    def test_invalid_cursor_returns_404(self, api_client, many_missions, cursor):
+        """Test: Un curseur corrompu ou aux valeurs mal typées est rejeté"""
+        response = api_client.get(reverse("missions:mission_list"), {"cursor": cursor})
+
+        assert response.status_code == 404
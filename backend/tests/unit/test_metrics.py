@@ -0,0 +1,92 @@
+"""
+Tests Unitaires - Endpoint /metrics (histogrammes, agrégation multi-workers, jauges)
+"""
+
+import json
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from dzvolunteer import metrics
+from missions.models import Application
+
+
+@pytest.fixture
+def registry(settings, tmp_path):
+    settings.METRICS = {**settings.METRICS, "DIRECTORY": str(tmp_path), "TOKEN": ""}
+    metrics.reset_registry()
+    cache.clear()
+    yield metrics.get_registry()
+    metrics.reset_registry()
+
+
+def _samples(body):
+    samples = {}
+    for line in body.decode().splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestMetrics:
+    """Tests de GET /metrics"""
+
+    url = reverse("metrics")
+
+    def test_latency_and_query_histograms_per_url_name(self, api_client, registry, sample_mission):
+        """Test: Chaque requête alimente les histogrammes de son nom d'URL"""
+        api_client.get(reverse("missions:mission_list"))
+        api_client.get(reverse("missions:mission_list"))
+
+        samples = _samples(api_client.get(self.url).content)
+
+        route = 'namespace="missions",url_name="mission_list"'
+        assert samples[f'http_request_duration_seconds_count{{{route},method="GET"}}'] == 2
+        assert (
+            samples[f'http_request_duration_seconds_bucket{{{route},method="GET",le="+Inf"}}'] == 2
+        )
+        assert samples[f"http_request_db_queries_count{{{route}}}"] == 2
+        assert samples[f'http_requests_total{{{route},method="GET",status="200"}}'] == 2
+
+    def test_aggregates_worker_files(self, api_client, registry, tmp_path, sample_mission):
+        """Test: Les fichiers des autres workers sont additionnés"""
+        api_client.get(reverse("missions:mission_list"))
+        route = 'namespace="missions",url_name="mission_list"'
+        other = {
+            "histograms": {},
+            "counters": {"http_requests_total": {f'{route},method="GET",status="200"': 5}},
+        }
+        (tmp_path / "worker-999999.json").write_text(json.dumps(other))
+
+        samples = _samples(api_client.get(self.url).content)
+
+        assert samples[f'http_requests_total{{{route},method="GET",status="200"}}'] == 6
+
+    def test_business_gauges_from_cached_snapshot(
+        self, api_client, registry, sample_mission, volunteer_user, django_assert_num_queries
+    ):
+        """Test: Les jauges viennent d'un instantané en cache"""
+        Application.objects.create(
+            mission=sample_mission, volunteer=volunteer_user.volunteer_profile
+        )
+
+        samples = _samples(api_client.get(self.url).content)
+        assert samples["dzvolunteer_pending_applications"] == 1
+        assert samples['dzvolunteer_missions{status="PUBLISHED"}'] == 1
+        assert samples['dzvolunteer_missions{status="DRAFT"}'] == 0
+        assert samples["dzvolunteer_open_reports"] == 0
+
+        with django_assert_num_queries(0):
+            api_client.get(self.url)
+
+    def test_access_control(self, api_client, registry, settings):
+        """Test: Jeton requis s'il est configuré, sinon adresses autorisées"""
+        assert api_client.get(self.url, REMOTE_ADDR="10.0.0.1").status_code == 404
+
+        settings.METRICS = {**settings.METRICS, "TOKEN": "secret"}
+        assert api_client.get(self.url).status_code == 404
+        assert api_client.get(self.url, HTTP_AUTHORIZATION="Bearer secret").status_code == 200
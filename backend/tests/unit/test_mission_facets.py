@@ -0,0 +1,90 @@
+"""
+Tests Unitaires - Comptages par facette du catalogue
+"""
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from missions.models import Mission, MissionSkillRequirement
+
+
+@pytest.fixture
+def catalogue(sample_mission, sample_skill):
+    """Missions à Alger (16) et Oran (31) avec des causes et compétences variées"""
+    cache.clear()
+    specs = [
+        ("16", ["SOCIAL", "HEALTH"], "RECURRING"),
+        ("16", ["ENVIRONMENT"], "ONE_TIME"),
+        ("31", ["ENVIRONMENT"], "ONE_TIME"),
+        ("31", ["EDUCATION"], "ONE_TIME"),
+    ]
+    missions = [sample_mission]
+    for wilaya, causes, mission_type in specs:
+        mission = Mission.objects.get(pk=sample_mission.pk)
+        mission.pk = None
+        mission._state.adding = True
+        mission.wilaya, mission.causes, mission.mission_type = wilaya, causes, mission_type
+        mission.save()
+        missions.append(mission)
+    MissionSkillRequirement.objects.create(mission=missions[1], skill=sample_skill)
+    MissionSkillRequirement.objects.create(mission=missions[3], skill=sample_skill)
+    return missions
+
+
+def _counts(facet):
+    return {item["value"]: item["count"] for item in facet}
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestMissionFacets:
+    """Tests de l'endpoint /api/missions/facets/"""
+
+    url = reverse("missions:mission_facets")
+
+    def test_counts_all_facets(self, api_client, catalogue, sample_odd, sample_skill):
+        """Test: Toutes les facettes sont comptées sur le catalogue"""
+        response = api_client.get(self.url)
+
+        assert response.status_code == 200
+        assert _counts(response.data["wilaya"]) == {"16": 3, "31": 2}
+        assert response.data["wilaya"][0]["label"] == "Alger"
+        assert _counts(response.data["odd"]) == {sample_odd.pk: 5}
+        assert response.data["odd"][0]["number"] == 1
+        assert _counts(response.data["mission_type"]) == {"ONE_TIME": 4, "RECURRING": 1}
+        assert _counts(response.data["cause"]) == {
+            "SOCIAL": 2,
+            "HEALTH": 1,
+            "ENVIRONMENT": 2,
+            "EDUCATION": 1,
+        }
+        assert _counts(response.data["skill"]) == {sample_skill.pk: 2}
+
+    def test_facet_ignores_its_own_filter(self, api_client, catalogue):
+        """Test: La facette filtrée garde ses autres valeurs, les autres sont restreintes"""
+        response = api_client.get(self.url, {"wilaya": "31"})
+
+        assert _counts(response.data["wilaya"]) == {"16": 3, "31": 2}
+        assert _counts(response.data["cause"]) == {"ENVIRONMENT": 1, "EDUCATION": 1}
+
+    def test_cause_filter_on_catalogue(self, api_client, catalogue):
+        """Test: Le catalogue se filtre par cause"""
+        response = api_client.get(reverse("missions:mission_list"), {"causes": "ENVIRONMENT"})
+
+        assert len(response.data["results"]) == 2
+
+    def test_results_are_cached_until_status_change(
+        self, api_client, catalogue, django_assert_num_queries
+    ):
+        """Test: Les comptages sont servis depuis le cache puis invalidés à la publication"""
+        api_client.get(self.url)
+        with django_assert_num_queries(0):
+            api_client.get(self.url)
+
+        draft = catalogue[4]
+        draft.status = "DRAFT"
+        draft.save()
+
+        response = api_client.get(self.url)
+        assert _counts(response.data["wilaya"]) == {"16": 3, "31": 1}
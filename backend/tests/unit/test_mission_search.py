@@ -0,0 +1,114 @@
+"""
+Tests Unitaires - Recherche plein texte du catalogue
+Tests de l'analyseur (accents, arabe, racinisation) et du classement
+"""
+
+import pytest
+from django.urls import reverse
+
+from missions.models import Mission, MissionSearchTerm
+from missions.search import analyze, fold, rebuild_index, search_missions
+
+
+@pytest.mark.unit
+class TestSearchAnalyzer:
+    """Tests de l'analyseur de texte"""
+
+    def test_fold_removes_french_accents(self):
+        """Test: Les accents et ligatures sont pliés"""
+        assert fold("Éducation Béjaïa Cœur") == "education bejaia coeur"
+
+    def test_fold_normalizes_arabic(self):
+        """Test: Harakat, tatweel et variantes d'alif/ta marbuta sont normalisés"""
+        assert fold("مَدْرَسَة") == fold("مدرسه")
+        assert fold("أطفال") == fold("اطفال")
+        assert fold("إسعـاف") == "اسعاف"
+
+    def test_french_stemming_groups_inflections(self):
+        """Test: Les formes fléchies d'un même mot partagent la même racine"""
+        assert analyze("nettoyage")[0] == analyze("nettoyer")[0]
+        assert analyze("plages")[0] == analyze("plage")[0]
+        assert analyze("environnemental")[0] == analyze("environnement")[0]
+        assert analyze("hôpitaux")[0] == analyze("hôpital")[0]
+
+    def test_arabic_stemming_strips_article(self):
+        """Test: L'article et les préfixes arabes sont retirés"""
+        assert analyze("الشاطئ") == analyze("شاطئ")
+        assert analyze("والمدرسة") == analyze("مدرسة")
+
+    def test_stopwords_are_ignored(self):
+        """Test: Les mots vides ne sont pas indexés"""
+        assert analyze("de la plage et du") == analyze("plage")
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestMissionSearchIndex:
+    """Tests de l'index inversé et du classement"""
+
+    def _mission(self, sample_mission, **fields):
+        """Copie de la mission de test avec des champs modifiés"""
+        mission = Mission.objects.get(pk=sample_mission.pk)
+        mission.pk = None
+        mission._state.adding = True
+        for name, value in fields.items():
+            setattr(mission, name, value)
+        mission.save()
+        return mission
+
+    def test_mission_is_indexed_on_save(self, sample_mission):
+        """Test: Une mission est indexée à l'enregistrement"""
+        terms = set(
+            MissionSearchTerm.objects.filter(mission=sample_mission).values_list("term", flat=True)
+        )
+        assert set(analyze("Mission Test")) <= terms
+        assert set(analyze("Test ONG")) <= terms
+
+    def test_view_count_update_does_not_reindex(self, sample_mission):
+        """Test: Une mise à jour du compteur de vues ne touche pas l'index"""
+        MissionSearchTerm.objects.filter(mission=sample_mission).delete()
+        sample_mission.view_count = 5
+        sample_mission.save(update_fields=["view_count"])
+        assert not MissionSearchTerm.objects.filter(mission=sample_mission).exists()
+
+    def test_title_match_ranks_above_description_match(self, sample_mission):
+        """Test: Un terme dans le titre pèse plus qu'un terme dans la description"""
+        in_title = self._mission(
+            sample_mission, title="Nettoyage de la plage", full_description="Venez nombreux"
+        )
+        in_description = self._mission(
+            sample_mission, title="Journée solidaire", full_description="Nettoyer les plages"
+        )
+
+        results = list(search_missions(Mission.objects.all(), "nettoyage plage"))
+
+        assert results == [in_title, in_description]
+        assert results[0].search_rank > results[1].search_rank
+
+    def test_all_terms_must_match(self, sample_mission):
+        """Test: Tous les termes de la requête doivent être présents"""
+        self._mission(sample_mission, title="Nettoyage de la plage")
+
+        assert not search_missions(Mission.objects.all(), "plage reboisement").exists()
+
+    def test_last_term_is_a_prefix(self, sample_mission):
+        """Test: Le dernier terme est recherché en préfixe (saisie en cours)"""
+        mission = self._mission(sample_mission, title="Distribution alimentaire")
+
+        assert list(search_missions(Mission.objects.all(), "distrib")) == [mission]
+
+    def test_rebuild_index(self, sample_mission):
+        """Test: La reconstruction complète restaure l'index"""
+        MissionSearchTerm.objects.all().delete()
+
+        assert rebuild_index() == 1
+        assert list(search_missions(Mission.objects.all(), "mission test")) == [sample_mission]
+
+    def test_catalogue_search_endpoint(self, api_client, sample_mission):
+        """Test: Le paramètre ?search= du catalogue utilise l'index"""
+        self._mission(sample_mission, title="Collecte de sang", commune="Béjaïa")
+
+        response = api_client.get(reverse("missions:mission_list"), {"search": "bejaia"})
+
+        assert response.status_code == 200
+        assert [m["title"] for m in response.data["results"]] == ["Collecte de sang"]
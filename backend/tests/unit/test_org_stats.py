@@ -0,0 +1,185 @@
+"""
+Tests Unitaires - Statistiques des organisations (missions/org_stats.py)
+"""
+
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+
+from accounts.models import Organization, User, Volunteer
+from missions import services
+from missions.models import Application, Mission, Review
+
+
+def _volunteer(email):
+    user = User.objects.create_user(email=email, password="testpass123", user_type="VOLUNTEER")
+    return Volunteer.objects.create(user=user, wilaya="16")
+
+
+def _mission(base, **fields):
+    mission = Mission.objects.get(pk=base.pk)
+    mission.pk = None
+    for name, value in fields.items():
+        setattr(mission, name, value)
+    mission.save()
+    return mission
+
+
+def _stats(organization):
+    organization.refresh_from_db()
+    return (organization.total_missions, organization.total_volunteers, organization.average_rating)
+
+
+def _accept(mission, volunteer):
+    application = Application.objects.create(mission=mission, volunteer=volunteer)
+    return services.accept_application(Application.objects.get(pk=application.pk))
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestOrganizationStats:
+    """Tests de la mise à jour incrémentale et de la reconstruction"""
+
+    def test_missions(self, sample_mission):
+        """Test: création, publication, annulation et suppression"""
+        organization = sample_mission.organization
+        assert _stats(organization)[0] == 1
+
+        draft = _mission(sample_mission, status="DRAFT")
+        assert _stats(organization)[0] == 1
+        draft.status = "PUBLISHED"
+        draft.save()
+        assert _stats(organization)[0] == 2
+        draft.status = "CANCELLED"
+        draft.save(update_fields=["status"])
+        assert _stats(organization)[0] == 1
+        sample_mission.delete()
+        assert _stats(organization)[0] == 0
+
+    def test_volunteers(self, sample_mission, volunteer_user):
+        """Test: bénévoles distincts ; refus après acceptation et absence validée"""
+        organization = sample_mission.organization
+        other_mission = _mission(sample_mission)
+        volunteer = volunteer_user.volunteer_profile
+        absent = _volunteer("absent@test.com")
+
+        _accept(sample_mission, volunteer)
+        _accept(other_mission, volunteer)
+        application = _accept(sample_mission, absent)
+        assert _stats(organization)[1] == 2
+
+        services.reject_application(application)
+        assert _stats(organization)[1] == 1
+
+        services.respond_to_applications(
+            other_mission,
+            [{"application_id": _accept(other_mission, absent).pk, "action": "reject"}],
+        )
+        assert _stats(organization)[1] == 1
+
+        participation = volunteer.participations.get(mission=sample_mission)
+        services.validate_hours(
+            sample_mission, [{"participation_id": participation.pk, "was_present": False}]
+        )
+        assert _stats(organization)[1] == 1  # encore engagé sur other_mission
+
+        participation = volunteer.participations.get(mission=other_mission)
+        services.validate_hours(
+            other_mission, [{"participation_id": participation.pk, "was_present": False}]
+        )
+        assert _stats(organization)[1] == 0
+
+    def test_participation_deletions(self, sample_mission, volunteer_user):
+        """Test: suppression depuis l'admin et en cascade d'une mission"""
+        organization = sample_mission.organization
+        other_mission = _mission(sample_mission)
+        volunteer = volunteer_user.volunteer_profile
+        other = _volunteer("other@test.com")
+        _accept(sample_mission, volunteer)
+        _accept(other_mission, volunteer)
+        _accept(other_mission, other)
+        assert _stats(organization)[1] == 2
+
+        volunteer.participations.get(mission=sample_mission).delete()
+        assert _stats(organization)[1] == 2  # encore engagé sur other_mission
+        other_mission.delete()
+        assert _stats(organization)[1] == 0
+
+    def test_dashboard_uses_maintained_total(self, api_client, sample_mission):
+        """Test: le tableau de bord ne compte pas les brouillons"""
+        _mission(sample_mission, status="DRAFT")
+        api_client.force_authenticate(User.objects.get(pk=sample_mission.organization.user_id))
+
+        response = api_client.get("/api/missions/organization/dashboard/")
+
+        assert response.data["stats"]["total_missions"] == 1
+
+    def test_profile_cannot_write_counters(self, api_client, sample_mission):
+        """Test: PATCH du profil de l'organisation -> compteurs du tableau de bord ignorés"""
+        api_client.force_authenticate(User.objects.get(pk=sample_mission.organization.user_id))
+        payload = {"total_missions": 500, "total_volunteers": 900}
+
+        response = api_client.patch("/api/auth/profile/organization/", payload, format="json")
+
+        assert response.status_code == 200
+        assert _stats(sample_mission.organization)[:2] == (1, 0)
+
+    def test_reviews(self, sample_mission, volunteer_user):
+        """Test: moyenne des avis à la création, modification et suppression"""
+        organization = sample_mission.organization
+        volunteer = volunteer_user.volunteer_profile
+
+        first = Review.objects.create(
+            volunteer=volunteer, organization=organization, rating=5, comment="Super"
+        )
+        second = Review.objects.create(
+            volunteer=volunteer, organization=organization, rating=2, comment="Bof"
+        )
+        assert _stats(organization)[2] == Decimal("3.50")
+
+        second = Review.objects.get(pk=second.pk)
+        second.rating = 4
+        second.save()
+        assert _stats(organization)[2] == Decimal("4.50")
+
+        first.delete()
+        assert _stats(organization)[2] == Decimal("4.00")
+        second.delete()
+        assert _stats(organization)[2] == Decimal("0")
+
+    def test_rebuild_matches_incremental(self, sample_mission, volunteer_user):
+        """Test: rebuild_org_stats retrouve les valeurs maintenues par les événements"""
+        organization = sample_mission.organization
+        volunteer = volunteer_user.volunteer_profile
+        _accept(_mission(sample_mission), volunteer)
+        _mission(sample_mission, status="DRAFT")
+        for rating in (5, 4, 4):
+            Review.objects.create(
+                volunteer=volunteer, organization=organization, rating=rating, comment="Bien"
+            )
+        expected = _stats(organization)
+
+        Organization.objects.update(total_missions=0, total_volunteers=0, average_rating=0)
+        call_command("rebuild_org_stats", stdout=None)
+
+        assert _stats(organization) == expected == (2, 1, Decimal("4.33"))
+
+    def test_public_profile_etag(self, api_client, sample_mission, volunteer_user):
+        """Test: le profil public change de version avec les statistiques"""
+        organization = sample_mission.organization
+        organization.is_verified = True
+        organization.save()
+        url = f"/api/missions/organization/{organization.pk}/"
+        etag = api_client.get(url)["ETag"]
+
+        Review.objects.create(
+            volunteer=volunteer_user.volunteer_profile,
+            organization=organization,
+            rating=5,
+            comment="Merci",
+        )
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response.data["average_rating"] == "5.00"
@@ -0,0 +1,196 @@
+"""
+Tests Unitaires - Agrégats courants des notes (missions/ratings.py)
+"""
+
+import random
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Avg
+from django.urls import reverse
+
+from accounts.models import Organization, User, Volunteer
+from missions import ratings, services
+from missions.models import Application, Mission, Participation, Review
+
+
+def _volunteer(email):
+    user = User.objects.create_user(email=email, password="testpass123", user_type="VOLUNTEER")
+    return Volunteer.objects.create(user=user, wilaya="16")
+
+
+def _missions(base, count):
+    missions = []
+    for _ in range(count):
+        mission = Mission.objects.get(pk=base.pk)
+        mission.pk = None
+        mission.save()
+        missions.append(mission)
+    return missions
+
+
+def _aggregate(instance):
+    instance.refresh_from_db()
+    return (instance.rating_sum, instance.rating_count, instance.average_rating)
+
+
+def _validate(participation, rating, was_present=True):
+    validation = {
+        "participation_id": participation.pk,
+        "was_present": was_present,
+        "hours": "2",
+        "rating": rating,
+    }
+    services.validate_hours(participation.mission, [validation])
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestVolunteerRatings:
+    """Tests de la note moyenne des bénévoles (Participation.organization_rating)"""
+
+    def test_validation_updates_aggregate(self, sample_mission, volunteer_user):
+        """Test: note posée, modifiée à la revalidation ; participation non validée ignorée"""
+        volunteer = volunteer_user.volunteer_profile
+        first, second, pending = (
+            Participation.objects.create(mission=mission, volunteer=volunteer)
+            for mission in _missions(sample_mission, 3)
+        )
+        Participation.objects.filter(pk=pending.pk).update(organization_rating=1)
+
+        _validate(first, 5)
+        _validate(second, 2)
+        assert _aggregate(volunteer) == (7, 2, Decimal("3.50"))
+
+        _validate(second, 4)
+        assert _aggregate(volunteer) == (9, 2, Decimal("4.50"))
+
+    def test_admin_save(self, sample_mission, volunteer_user):
+        """Test: modification unitaire (admin) d'une participation validée"""
+        volunteer = volunteer_user.volunteer_profile
+        participation = Participation.objects.create(mission=sample_mission, volunteer=volunteer)
+        _validate(participation, 3)
+
+        participation = Participation.objects.get(pk=participation.pk)
+        participation.organization_rating = None
+        participation.save()
+        assert _aggregate(volunteer) == (0, 0, Decimal("0"))
+
+        participation.organization_rating = 4
+        participation.save()
+        assert _aggregate(volunteer) == (4, 1, Decimal("4.00"))
+
+    def test_constant_cost(self, volunteer_user, django_assert_num_queries):
+        """Test: une note modifiée -> un seul UPDATE, quel que soit l'historique"""
+        volunteer = volunteer_user.volunteer_profile
+        Volunteer.objects.filter(pk=volunteer.pk).update(rating_sum=4000, rating_count=1000)
+
+        with django_assert_num_queries(1):
+            ratings.volunteers.changed(volunteer.pk, 4, 5)
+
+        assert _aggregate(volunteer) == (4001, 1000, Decimal("4.00"))
+
+    def test_profile_cannot_write_aggregate(self, api_client, volunteer_user):
+        """Test: PATCH du profil -> somme, nombre et moyenne ignorés"""
+        api_client.force_authenticate(volunteer_user)
+        payload = {"rating_sum": 50, "rating_count": 10, "average_rating": "5.00"}
+
+        response = api_client.patch(reverse("accounts:volunteer_profile"), payload, format="json")
+
+        assert response.status_code == 200
+        assert _aggregate(volunteer_user.volunteer_profile) == (0, 0, Decimal("0"))
+
+    def test_running_matches_rebuild(self, sample_mission):
+        """Test: l'agrégat tenu par les événements égale un recalcul complet"""
+        rng = random.Random(25)
+        volunteers = [_volunteer(f"note{n}@test.com") for n in range(4)]
+        participations = [
+            Participation.objects.create(mission=mission, volunteer=volunteer)
+            for mission in _missions(sample_mission, 5)
+            for volunteer in volunteers
+        ]
+        for _ in range(40):
+            participation = rng.choice(participations)
+            was_present = rng.random() > 0.2
+            _validate(participation, rng.choice([None, 1, 2, 3, 4, 5]), was_present)
+        running = [_aggregate(volunteer) for volunteer in volunteers]
+
+        Volunteer.objects.update(rating_sum=0, rating_count=0, average_rating=0)
+        call_command("rebuild_volunteer_ratings", stdout=None)
+
+        assert [_aggregate(volunteer) for volunteer in volunteers] == running
+        for volunteer, (_, _, average) in zip(volunteers, running, strict=True):
+            expected = Participation.objects.filter(
+                volunteer=volunteer, hours_validated=True
+            ).aggregate(average=Avg("organization_rating"))["average"]
+            assert average == Decimal(str(expected or 0)).quantize(Decimal("0.01"))
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestOrganizationRatings:
+    """Tests de la note moyenne des organisations (Review.rating)"""
+
+    def test_running_matches_rebuild(self, sample_mission):
+        """Test: avis créés, modifiés et supprimés au hasard -> même résultat qu'un recalcul"""
+        rng = random.Random(25)
+        organization = sample_mission.organization
+        volunteers = [_volunteer(f"avis{n}@test.com") for n in range(3)]
+        reviews = []
+        for _ in range(30):
+            action = rng.random()
+            if reviews and action < 0.25:
+                reviews.pop(rng.randrange(len(reviews))).delete()
+            elif reviews and action < 0.5:
+                review = Review.objects.get(pk=rng.choice(reviews).pk)
+                review.rating = rng.randint(1, 5)
+                review.save()
+            else:
+                review = Review.objects.create(
+                    volunteer=rng.choice(volunteers),
+                    organization=organization,
+                    rating=rng.randint(1, 5),
+                    comment="Avis",
+                )
+                reviews.append(review)
+        running = _aggregate(organization)
+
+        Organization.objects.update(rating_sum=0, rating_count=0, average_rating=0)
+        ratings.organizations.rebuild()
+
+        assert _aggregate(organization) == running
+        assert running[1] == len(reviews)
+
+    def test_profile_cannot_write_aggregate(self, api_client, organization_user):
+        """Test: PATCH du profil de l'organisation -> somme, nombre et moyenne ignorés"""
+        api_client.force_authenticate(organization_user)
+        payload = {"rating_sum": 50, "rating_count": 10, "average_rating": "5.00"}
+
+        response = api_client.patch(
+            reverse("accounts:organization_profile"), payload, format="json"
+        )
+
+        assert response.status_code == 200
+        assert _aggregate(organization_user.organization_profile) == (0, 0, Decimal("0"))
+
+    def test_deleted_participation(self, sample_mission, volunteer_user):
+        """Test: refus après validation, suppression admin et en cascade -> note retirée"""
+        volunteer = volunteer_user.volunteer_profile
+        first, second, third = _missions(sample_mission, 3)
+        accepted = []
+        for mission, rating in ((first, 4), (second, 2), (third, 5)):
+            application = Application.objects.create(mission=mission, volunteer=volunteer)
+            accepted.append(services.accept_application(application))
+            _validate(Participation.objects.get(application=application), rating)
+        assert _aggregate(volunteer) == (11, 3, Decimal("3.67"))
+
+        services.reject_application(accepted[0])
+        assert _aggregate(volunteer) == (7, 2, Decimal("3.50"))
+        Participation.objects.get(mission=second).delete()
+        assert _aggregate(volunteer) == (5, 1, Decimal("5.00"))
+        third.delete()
+        running = _aggregate(volunteer)
+
+        ratings.volunteers.rebuild()
+        assert _aggregate(volunteer) == running == (0, 0, Decimal("0"))
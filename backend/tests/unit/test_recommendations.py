@@ -0,0 +1,238 @@
+"""
+Tests Unitaires - Recommandations de missions (missions/matching.py)
+"""
+
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from missions import matching
+from missions.models import Application, Mission, MissionSkillRequirement
+from skills.models import Skill, VolunteerSkill
+
+
+@pytest.fixture
+def clean_cache(settings):
+    settings.MATCHING = {"CHECK_INTERVAL": 0}
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def volunteer(volunteer_user):
+    profile = volunteer_user.volunteer_profile
+    profile.interests = ["ENVIRONMENT"]
+    profile.availability = {"saturday": ["morning"]}
+    profile.latitude, profile.longitude = Decimal("36.753800"), Decimal("3.058800")
+    profile.preferred_radius = 50
+    profile.save()
+    return profile
+
+
+def _mission(base, **fields):
+    mission = Mission.objects.get(pk=base.pk)
+    mission.pk = None
+    for name, value in fields.items():
+        setattr(mission, name, value)
+    mission.save()
+    return mission
+
+
+def _next_weekday(weekday):
+    today = date.today()
+    return today + timedelta(days=(weekday - today.weekday()) % 7 or 7)
+
+
+def _ids(client):
+    response = client.get(reverse("missions:volunteer_recommendations"))
+    assert response.status_code == 200
+    return [mission["id"] for mission in response.data["results"]]
+
+
+@pytest.mark.unit
+class TestEncoding:
+    """Tests de l'encodage des caractéristiques"""
+
+    def test_availability_and_slots(self):
+        """Test: disponibilités et créneau d'une mission partagent le même encodage"""
+        saturday = _next_weekday(5)
+        volunteer = matching.availability_bits({"saturday": ["morning"], "lundi": ["soir"]})
+
+        assert volunteer == 1 << 15
+        assert matching.slot_bits(saturday, time(9), time(11)) == volunteer
+        assert matching.slot_bits(saturday, time(11), time(19)) == 0b111 << 15
+
+    def test_top_k(self):
+        """Test: sélection partielle, scores infinis exclus, départage par date"""
+        scores = np.array([0.2, -np.inf, 0.9, 0.5, 0.9])
+        dates = np.array([1, 1, 5, 1, 3])
+
+        assert list(matching.top_k(scores, 2, tiebreak=dates)) == [4, 2]
+        assert list(matching.top_k(scores, 10)) in ([2, 4, 3, 0], [4, 2, 3, 0])
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestRecommendations:
+    """Tests de GET /api/missions/volunteer/recommendations/"""
+
+    def test_ranking(self, clean_cache, authenticated_client, volunteer, sample_mission):
+        """Test: cause, créneau et distance font remonter une mission"""
+        saturday = _next_weekday(5)
+        match = _mission(
+            sample_mission,
+            causes=["ENVIRONMENT"],
+            date=saturday,
+            latitude=Decimal("36.760000"),
+            longitude=Decimal("3.060000"),
+        )
+        far = _mission(
+            sample_mission,
+            causes=["ENVIRONMENT"],
+            date=saturday,
+            latitude=Decimal("22.785000"),
+            longitude=Decimal("5.522800"),
+            wilaya="11",
+        )
+
+        response = authenticated_client.get(reverse("missions:volunteer_recommendations"))
+
+        results = response.data["results"]
+        assert [mission["id"] for mission in results] == [match.pk, far.pk, sample_mission.pk]
+        assert results[0]["match_score"] > results[1]["match_score"]
+        assert results[0]["distance_km"] < 1
+        assert results[2]["distance_km"] is None
+
+    def test_skills(self, clean_cache, authenticated_client, volunteer, sample_mission):
+        """Test: compétence déclarée favorisée, compétence à vérifier non validée exclue"""
+        first_aid = Skill.objects.create(name="Secourisme", requires_verification=True)
+        computing = Skill.objects.create(name="Informatique")
+        VolunteerSkill.objects.create(volunteer=volunteer, skill=computing)
+        VolunteerSkill.objects.create(volunteer=volunteer, skill=first_aid, status="PENDING")
+        wanted = _mission(sample_mission)
+        MissionSkillRequirement.objects.create(mission=wanted, skill=computing)
+        locked = _mission(sample_mission)
+        MissionSkillRequirement.objects.create(
+            mission=locked, skill=first_aid, verification_required=True
+        )
+
+        assert _ids(authenticated_client) == [wanted.pk, sample_mission.pk]
+
+        VolunteerSkill.objects.filter(skill=first_aid).update(status="VALIDATED")
+        assert locked.pk in _ids(authenticated_client)
+
+    def test_excluded_missions(self, clean_cache, authenticated_client, volunteer, sample_mission):
+        """Test: missions déjà demandées, complètes, passées ou non publiées écartées"""
+        applied = _mission(sample_mission)
+        Application.objects.create(mission=applied, volunteer=volunteer)
+        full = _mission(sample_mission, accepted_volunteers=10)
+        _mission(sample_mission, date=date.today() - timedelta(days=1))
+        _mission(sample_mission, status="DRAFT")
+
+        ids = _ids(authenticated_client)
+
+        assert ids == [sample_mission.pk]
+        assert full.pk not in ids
+
+    def test_limit(self, clean_cache, authenticated_client, volunteer, sample_mission):
+        """Test: ?limit= borné, valeur invalide refusée"""
+        for _ in range(3):
+            _mission(sample_mission)
+        url = reverse("missions:volunteer_recommendations")
+
+        assert authenticated_client.get(url, {"limit": 2}).data["count"] == 2
+        assert authenticated_client.get(url, {"limit": "deux"}).status_code == 400
+
+    def test_volunteers_only(self, api_client, organization_user):
+        """Test: réservé aux bénévoles"""
+        api_client.force_authenticate(organization_user)
+
+        response = api_client.get(reverse("missions:volunteer_recommendations"))
+
+        assert response.status_code == 403
+
+    def test_query_count(
+        self,
+        clean_cache,
+        authenticated_client,
+        volunteer,
+        sample_mission,
+        django_assert_num_queries,
+    ):
+        """Test: index chaud -> profil, compétences, candidatures, missions retenues"""
+        _ids(authenticated_client)
+
+        with django_assert_num_queries(5):
+            _ids(authenticated_client)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestMissionIndex:
+    """Tests de la mise à jour incrémentale de l'index"""
+
+    def test_changes_applied_locally(self, clean_cache, sample_mission, sample_skill):
+        """Test: publication, dépublication et compétences requises prises en compte"""
+        assert list(matching.missions.features.ids) == [sample_mission.pk]
+        draft = _mission(sample_mission, status="DRAFT")
+        assert draft.pk not in matching.missions.features.ids
+
+        draft.status = "PUBLISHED"
+        draft.save()
+        sample_mission.status = "CANCELLED"
+        sample_mission.save()
+        draft.required_skills.add(sample_skill)
+
+        features = matching.missions.features
+        assert list(features.ids) == [draft.pk]
+        assert list(features.required_count) == [1]
+
+    def test_other_worker_reads_change_log(
+        self, clean_cache, sample_mission, django_capture_on_commit_callbacks, monkeypatch
+    ):
+        """Test: un autre worker ne relit que les missions du journal"""
+        other_worker = matching.MissionIndex()
+        assert len(other_worker.features) == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            created = _mission(sample_mission)
+        loaded = []
+        load_features = matching.load_features
+
+        def spy(today, mission_ids=None, **kwargs):
+            loaded.append(mission_ids)
+            return load_features(today, mission_ids, **kwargs)
+
+        monkeypatch.setattr(matching, "load_features", spy)
+
+        assert sorted(other_worker.features.ids) == [sample_mission.pk, created.pk]
+        assert loaded == [{created.pk}]
+
+    def test_missing_change_log_rebuilds(
+        self, clean_cache, sample_mission, django_capture_on_commit_callbacks
+    ):
+        """Test: entrée du journal expirée -> reconstruction complète"""
+        other_worker = matching.MissionIndex()
+        assert len(other_worker.features) == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            created = _mission(sample_mission)
+        cache.delete(matching.MissionIndex.change_key(cache.get(matching.MissionIndex.seq_key)))
+
+        assert sorted(other_worker.features.ids) == [sample_mission.pk, created.pk]
+
+    def test_rebuilds_after_max_age(self, clean_cache, settings, sample_mission):
+        """Test: modification absente du journal (autre worker sans cache partagé) -> MAX_AGE"""
+        other_worker = matching.MissionIndex()
+        assert len(other_worker.features) == 1
+
+        Mission.objects.filter(pk=sample_mission.pk).update(status="CANCELLED")
+        assert len(other_worker.features) == 1
+
+        settings.MATCHING = {"CHECK_INTERVAL": 0, "MAX_AGE": 0}
+        assert len(other_worker.features) == 0
@@ -0,0 +1,171 @@
+"""
+Tests Unitaires - Données de référence en mémoire (ODD et compétences)
+"""
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.serializers import ODDSerializer
+from missions import reference
+from odd.models import ODD
+from skills.models import Skill
+
+
+@pytest.fixture
+def clean_cache(settings):
+    settings.REFERENCE_DATA = {"CHECK_INTERVAL": 0, "MAX_AGE": 300}
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _reference_queries(context):
+    return [q["sql"] for q in context.captured_queries if '"odd_odd"' in q["sql"]]
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestCatalogue:
+    """Tests du chargement et de l'invalidation des catalogues"""
+
+    def test_loaded_once_per_version(self, clean_cache, api_client, sample_mission):
+        """Test: les listes de missions ne lisent plus la table des ODD"""
+        url = reverse("missions:mission_list")
+        api_client.get(url)
+
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(url, {"expand": "odd"})
+
+        assert response.status_code == 200
+        assert response.data["results"][0]["odd"]["description_fr"]
+        assert _reference_queries(context) == []
+
+    def test_save_and_delete_invalidate(self, clean_cache, sample_odd):
+        """Test: post_save/post_delete rechargent le catalogue local"""
+        assert reference.odds.representation(sample_odd.pk, ODDSerializer)["color"] == "#E5243B"
+
+        sample_odd.color = "#000000"
+        sample_odd.save()
+        assert reference.odds.representation(sample_odd.pk, ODDSerializer)["color"] == "#000000"
+
+        sample_odd.delete()
+        assert reference.odds.get(sample_odd.pk) is None
+
+    def test_version_published_to_other_workers(
+        self, clean_cache, sample_skill, django_capture_on_commit_callbacks
+    ):
+        """Test: un autre worker recharge quand le jeton partagé change au commit"""
+        other_worker = reference.Catalogue("skill", Skill)
+        assert other_worker.get(sample_skill.pk).name == sample_skill.name
+        version = other_worker.version
+
+        with django_capture_on_commit_callbacks(execute=True):
+            sample_skill.name = "Secourisme avancé"
+            sample_skill.save()
+
+        assert other_worker.version != version
+        assert other_worker.get(sample_skill.pk).name == "Secourisme avancé"
+
+    def test_unknown_id_does_not_reload(
+        self, clean_cache, api_client, sample_odd, django_assert_num_queries
+    ):
+        """Test: un id absent du catalogue renvoie None / 404 sans relire la table"""
+        reference.warm()
+
+        with django_assert_num_queries(0):
+            assert reference.odds.get(999999) is None
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(reverse("odd:odd_detail", args=[999999]))
+
+        assert response.status_code == 404
+        assert _reference_queries(context) == []
+
+    def test_row_created_elsewhere_arrives_with_version(self, clean_cache, sample_odd):
+        """Test: une ligne créée par un autre worker est vue au jeton suivant"""
+        reference.warm()
+        # bulk_create : aucun signal, comme une écriture d'un autre worker
+        ODD.objects.bulk_create(
+            [ODD(number=2, title_fr="Faim zéro", description_fr="...", color="#DDA63A")]
+        )
+        created = ODD.objects.get(number=2)
+        assert reference.odds.get(created.pk) is None
+
+        reference.odds.publish()  # jeton publié au commit de l'autre worker
+
+        assert reference.odds.get(created.pk).title_fr == "Faim zéro"
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestReferenceEndpoints:
+    """Tests des ETag et du Cache-Control de /api/odd/ et /api/skills/"""
+
+    @pytest.mark.parametrize("name", ["odd:odd_list", "skills:skill_list"])
+    def test_strong_etag_and_not_modified(
+        self, clean_cache, api_client, sample_odd, sample_skill, name, django_assert_num_queries
+    ):
+        """Test: ETag fort, Cache-Control public, 304 sans requête SQL"""
+        url = reverse(name)
+        response = api_client.get(url)
+        etag = response["ETag"]
+
+        assert response.status_code == 200
+        assert response.data["count"] == 1
+        assert not etag.startswith("W/")
+        assert "public" in response["Cache-Control"] and "max-age=300" in response["Cache-Control"]
+
+        with django_assert_num_queries(0):
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+
+    def test_etag_changes_with_version(self, clean_cache, api_client, sample_odd):
+        """Test: nouvelle version du catalogue -> nouvel ETag et contenu à jour"""
+        url = reverse("odd:odd_detail", args=[sample_odd.pk])
+        etag = api_client.get(url)["ETag"]
+
+        reference.odds.publish()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+        assert api_client.get(url, {"format": "json"})["ETag"] != response["ETag"]
+
+    def test_reload_after_interval(self, clean_cache, settings, api_client, sample_odd):
+        """Test: modification sans nouveau jeton (autre worker) -> RELOAD_INTERVAL, nouvel ETag"""
+        url = reverse("odd:odd_detail", args=[sample_odd.pk])
+        etag = api_client.get(url)["ETag"]
+        # update() : aucun signal, aucun jeton publié
+        ODD.objects.filter(pk=sample_odd.pk).update(title_fr="Éradication de la pauvreté")
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        settings.REFERENCE_DATA = {**settings.REFERENCE_DATA, "RELOAD_INTERVAL": 0}
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response.data["title_fr"] == "Éradication de la pauvreté"
+        assert response["ETag"] != etag
+
+    def test_inactive_odd_not_found(self, clean_cache, api_client, sample_odd):
+        """Test: un ODD inactif reste résolu pour les missions mais n'est plus listé"""
+        sample_odd.is_active = False
+        sample_odd.save()
+
+        assert api_client.get(reverse("odd:odd_list")).data["count"] == 0
+        response = api_client.get(reverse("odd:odd_detail", args=[sample_odd.pk]))
+        assert response.status_code == 404
+        assert "ETag" not in response
+        assert reference.odds.get(sample_odd.pk) is not None
+
+    def test_sparse_fields_on_reference(self, clean_cache, api_client, sample_mission):
+        """Test: ?fields=odd.number s'applique à la représentation en cache"""
+        response = api_client.get(
+            reverse("missions:mission_list"), {"fields": "id,odd.number,odd.color"}
+        )
+        full = api_client.get(reverse("missions:mission_list"))
+
+        assert response.data["results"][0]["odd"] == {"number": 1, "color": "#E5243B"}
+        assert set(full.data["results"][0]["odd"]) == {"id", "number", "title_fr", "color", "icon"}
@@ -0,0 +1,145 @@
+"""
+Tests Unitaires - Compteur de vues en écriture différée
+"""
+
+import time
+
+import pytest
+from django.core.cache import cache
+from django.test import RequestFactory
+from django.urls import reverse
+
+from missions.models import Mission
+from missions.view_counter import CacheViewBuffer, LocalViewBuffer, ViewCounter, get_view_counter
+
+BROWSER_UA = "Mozilla/5.0 (X11; Linux x86_64) Firefox/120.0"
+
+
+@pytest.fixture
+def counter():
+    cache.clear()
+    return ViewCounter(LocalViewBuffer(), cache, flush_interval=3600, dedup_ttl=60)
+
+
+def _request(ip="10.0.0.1", user_agent=BROWSER_UA):
+    return RequestFactory().get("/", REMOTE_ADDR=ip, HTTP_USER_AGENT=user_agent)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestViewCounter:
+    """Tests du tampon, de la déduplication et du vidage"""
+
+    def test_views_are_buffered_not_written(
+        self, counter, sample_mission, django_assert_num_queries
+    ):
+        """Test: Une vue ne déclenche aucune requête SQL"""
+        with django_assert_num_queries(0):
+            assert counter.record(_request(), sample_mission) is True
+
+        sample_mission.refresh_from_db()
+        assert sample_mission.view_count == 0
+        assert counter.current_count(sample_mission) == 1
+
+    def test_repeat_viewer_counted_once(self, counter, sample_mission):
+        """Test: Un même visiteur n'est compté qu'une fois"""
+        assert counter.record(_request(), sample_mission) is True
+        assert counter.record(_request(), sample_mission) is False
+        assert counter.record(_request(ip="10.0.0.2"), sample_mission) is True
+        assert counter.current_count(sample_mission) == 2
+
+    def test_bots_are_ignored(self, counter, sample_mission):
+        """Test: Les robots et clients sans User-Agent ne sont pas comptés"""
+        assert counter.record(_request(user_agent="Googlebot/2.1"), sample_mission) is False
+        assert counter.record(_request(user_agent="curl/8.0"), sample_mission) is False
+        assert counter.record(_request(user_agent=""), sample_mission) is False
+        assert counter.current_count(sample_mission) == 0
+
+    def test_flush_applies_atomic_increments(self, counter, sample_mission):
+        """Test: Le vidage ajoute les vues au compteur existant"""
+        Mission.objects.filter(pk=sample_mission.pk).update(view_count=10)
+        for i in range(3):
+            counter.record(_request(ip=f"10.0.1.{i}"), sample_mission)
+
+        assert counter.flush() == 3
+        assert counter.flush() == 0
+
+        sample_mission.refresh_from_db()
+        assert sample_mission.view_count == 13
+
+    def test_cache_buffer_flush(self, sample_mission):
+        """Test: Le tampon partagé dans le cache est vidé correctement"""
+        cache.clear()
+        counter = ViewCounter(CacheViewBuffer(cache), cache, flush_interval=3600, dedup_ttl=60)
+        for i in range(4):
+            counter.record(_request(ip=f"10.0.2.{i}"), sample_mission)
+
+        assert counter.current_count(sample_mission) == 4
+        assert counter.flush() == 4
+
+        sample_mission.refresh_from_db()
+        assert sample_mission.view_count == 4
+        assert counter.current_count(sample_mission) == 4
+
+    def test_detail_endpoint_reports_pending_views(self, api_client, sample_mission):
+        """Test: Le détail d'une mission affiche les vues en attente"""
+        cache.clear()
+        counter = get_view_counter()
+        counter.buffer.drain()
+        # Pas de vidage pendant la requête, quel que soit l'ordre des tests
+        counter._last_flush = time.monotonic()
+
+        url = reverse("missions:mission_detail", args=[sample_mission.pk])
+        response = api_client.get(url, HTTP_USER_AGENT=BROWSER_UA)
+
+        assert response.status_code == 200
+        assert response.data["view_count"] == 1
+        assert counter.flush() == 1
+
+    def test_flush_during_record_keeps_instance_fresh(self, sample_mission):
+        """Test: Les vues écrites par le vidage déclenché par la vue restent comptées"""
+        cache.clear()
+        counter = ViewCounter(LocalViewBuffer(), cache, flush_interval=0, dedup_ttl=60)
+
+        assert counter.record(_request(), sample_mission) is True
+
+        assert counter.current_count(sample_mission) == 1
+        sample_mission.refresh_from_db()
+        assert sample_mission.view_count == 1
+
+    def test_cache_buffer_drains_unpublished_missions(self, sample_mission):
+        """Test: Les vues d'une mission dépubliée avant le vidage sont écrites"""
+        cache.clear()
+        counter = ViewCounter(CacheViewBuffer(cache), cache, flush_interval=3600, dedup_ttl=60)
+        counter.record(_request(), sample_mission)
+        Mission.objects.filter(pk=sample_mission.pk).update(status="COMPLETED")
+
+        assert counter.flush() == 1
+        counter.record(_request(ip="10.0.3.1"), sample_mission)
+        assert counter.flush() == 1
+        assert counter.flush() == 0
+
+        sample_mission.refresh_from_db()
+        assert sample_mission.view_count == 2
+
+    def test_forwarded_header_does_not_bypass_dedup(self, counter, sample_mission):
+        """Test: Changer X-Forwarded-For ne fait pas recompter un même visiteur"""
+        for i in range(3):
+            request = _request()
+            request.META["HTTP_X_FORWARDED_FOR"] = f"203.0.113.{i}"
+            counter.record(request, sample_mission)
+
+        assert counter.current_count(sample_mission) == 1
+
+    def test_flush_tick_without_new_view(self, sample_mission):
+        """Test: Le thread de vidage écrit le tampon sans attendre une nouvelle vue"""
+        cache.clear()
+        counter = ViewCounter(LocalViewBuffer(), cache, flush_interval=3600, dedup_ttl=60)
+        counter.record(_request(), sample_mission)
+
+        assert counter.flush_tick() == {}
+        counter._last_flush -= 3600
+        assert counter.flush_tick() == {sample_mission.pk: 1}
+
+        sample_mission.refresh_from_db()
+        assert sample_mission.view_count == 1